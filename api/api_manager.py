@@ -1,5 +1,7 @@
 from api.movies_api import MoviesAPI
 from api.auth_api import AuthAPI
+from constants import RESPONSE_CACHE_ENABLED
+from utils.cleanup_registry import CleanupRegistry, MOVIE, USER
 
 
 class ApiManager:
@@ -7,11 +9,43 @@ class ApiManager:
     Class for managing API classes using a shared HTTP session.
     """
 
-    def __init__(self, session):
+    def __init__(self, session, auth_base_url=None, movies_base_url=None, circuit_breaker=True,
+                 track_resources=True):
         """
         Initialize ApiManager.
         :param session: HTTP session used by all API classes.
+        :param auth_base_url: Base URL of the auth service (default - AUTH_API_BASE_URL).
+        :param movies_base_url: Base URL of the movies service (default - MOVIES_API_BASE_URL).
+        :param circuit_breaker: Use the per-service circuit breaker (CIRCUIT_BREAKER_ENABLED).
+        :param track_resources: Register created movies and users in cleanup_registry
+            (False - e.g. for load generators, whose resources are never torn down).
         """
         self.session = session
-        self.movies_api = MoviesAPI(session)
-        self.auth_api = AuthAPI(session)
+        self.movies_api = MoviesAPI(session, base_url=movies_base_url)
+        self.auth_api = AuthAPI(session, base_url=auth_base_url)
+        self.movies_api.circuit_breaker_enabled = self.auth_api.circuit_breaker_enabled = circuit_breaker
+
+        # Реестр созданных ресурсов для отложенной очистки
+        self.cleanup_registry = None
+        if track_resources:
+            self.cleanup_registry = CleanupRegistry()
+            self.cleanup_registry.deleters = {
+                MOVIE: lambda movie_id, token: self.movies_api.delete_movie(movie_id, token,
+                                                                            expected_status=(200, 201, 404)),
+                USER: self.auth_api.delete_user,
+            }
+            self.movies_api.cleanup_registry = self.cleanup_registry
+            self.auth_api.cleanup_registry = self.cleanup_registry
+
+        # Кэш GET-ответов для чтения фильмов (по флагу RESPONSE_CACHE_ENABLED)
+        if RESPONSE_CACHE_ENABLED:
+            self.movies_api.enable_response_cache()
+
+    def create_async(self):
+        """
+        Creates an AsyncApiManager pointing to the same services.
+        :return: AsyncApiManager object owning its own client.
+        """
+        from api.async_api_manager import AsyncApiManager
+
+        return AsyncApiManager(auth_base_url=self.auth_api.base_url, movies_base_url=self.movies_api.base_url)
@@ -0,0 +1,37 @@
+from api.async_auth_api import AsyncAuthAPI
+from api.async_movies_api import AsyncMoviesAPI
+from requester.transport import create_async_client
+
+
+class AsyncApiManager:
+    """
+    Class for managing async API classes using a shared httpx.AsyncClient.
+    Can be used as an async context manager; a client created by the manager
+    itself is closed on exit.
+    """
+
+    def __init__(self, session=None, auth_base_url=None, movies_base_url=None):
+        """
+        Initialize AsyncApiManager.
+        :param session: httpx.AsyncClient used by all API classes.
+                        If not passed, the manager creates and owns its own client.
+        :param auth_base_url: Base URL of the auth service (default - AUTH_API_BASE_URL).
+        :param movies_base_url: Base URL of the movies service (default - MOVIES_API_BASE_URL).
+        """
+        self._owns_session = session is None
+        self.session = session if session is not None else create_async_client()
+        self.movies_api = AsyncMoviesAPI(self.session, base_url=movies_base_url)
+        self.auth_api = AsyncAuthAPI(self.session, base_url=auth_base_url)
+
+    async def close(self):
+        """
+        Closes the client if it was created by the manager.
+        """
+        if self._owns_session:
+            await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,83 @@
+from typing import TYPE_CHECKING
+
+from constants import LOGIN_ENDPOINT, REGISTER_ENDPOINT, AUTH_API_BASE_URL
+from requester.async_custom_requester import AsyncCustomRequester
+from requester.typed_response import TypedResponse
+
+if TYPE_CHECKING:
+    from models.base_models import LoginData
+
+
+class AsyncAuthAPI(AsyncCustomRequester):
+    """
+    Async API class for handling authentication.
+    """
+
+    def __init__(self, session, base_url=None):
+        super().__init__(session=session, base_url=base_url or AUTH_API_BASE_URL)
+        self.service = "auth"
+
+    async def register_user(self, user_data, expected_status=(200, 201)):
+        """
+        Registers a new user.
+        :param user_data: User data.
+        :param expected_status: Expected HTTP status code.
+        :return: Response object.
+        """
+        return await self.send_request(
+            method="POST",
+            endpoint=REGISTER_ENDPOINT,
+            data=user_data,
+            expected_status=expected_status
+        )
+
+    async def login_user(self, login_data: "LoginData", expected_status=(200, 201), typed=False):
+        """
+        Logs in a user.
+        :param login_data: Экземпляр LoginData или словарь с данными для входа.
+        :param expected_status: Ожидаемый HTTP статус.
+        :param typed: Вернуть TypedResponse с моделью LoginResponse.
+        :return: Response object.
+        """
+        from models.base_models import LoginData
+
+        if isinstance(login_data, dict):
+            login_data = LoginData(**login_data)
+
+        data_dict = login_data.model_dump(exclude_unset=True)
+        response = await self.send_request(
+            method="POST",
+            endpoint=LOGIN_ENDPOINT,
+            data=data_dict,
+            expected_status=expected_status
+        )
+        if typed:
+            from models.response_models import LoginResponse
+
+            return TypedResponse(response, LoginResponse)
+        return response
+
+    async def change_user_role(self, user_id, new_roles, admin_token):
+        """Изменяет роль пользователя"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        data = {"roles": new_roles}
+        return await self.send_request("PATCH", f"/user/{user_id}", data=data, headers=headers)
+
+    async def delete_user(self, user_id, admin_token):
+        """Удаляет пользователя (только для ADMIN и SUPER_ADMIN)"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        return await self.send_request("DELETE", f"/user/{user_id}", headers=headers,
+                                       expected_status=[200, 204, 404])
+
+    async def get_user(self, user_id, admin_token, typed=False):
+        """
+        Получение информации о пользователе.
+        При typed=True возвращается TypedResponse с моделью User, иначе словарь.
+        """
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await self.send_request("GET", f"/user/{user_id}", headers=headers, expected_status=[200])
+        if typed:
+            from models.response_models import User
+
+            return TypedResponse(response, User)
+        return response.json()
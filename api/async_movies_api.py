@@ -0,0 +1,68 @@
+from constants import MOVIES_API_BASE_URL
+from requester.async_custom_requester import AsyncCustomRequester
+from requester.typed_response import TypedResponse
+
+
+class AsyncMoviesAPI(AsyncCustomRequester):
+    """
+    Async API class for handling movie-related operations.
+    """
+
+    def __init__(self, session, base_url=None):
+        super().__init__(session=session, base_url=base_url or MOVIES_API_BASE_URL)
+        self.service = "movies"
+
+    async def get_movies(self, params=None, typed=False):
+        """
+        Retrieves the list of movies with optional filtering.
+        :param params: Dictionary of query parameters.
+        :param typed: Return TypedResponse with the MovieList model.
+        :return: Response object.
+        """
+        response = await self.send_request(method='GET', endpoint='/movies', params=params)
+        if typed:
+            from models.response_models import MovieList
+
+            return TypedResponse(response, MovieList)
+        return response
+
+    async def get_movie(self, movie_id, typed=False):
+        """
+        Retrieves movie details by ID.
+        :param movie_id: Movie identifier.
+        :param typed: Return TypedResponse with the Movie model.
+        :return: Response object.
+        """
+        response = await self.send_request(method='GET', endpoint=f'/movies/{movie_id}')
+        if typed:
+            from models.response_models import Movie
+
+            return TypedResponse(response, Movie)
+        return response
+
+    async def create_movie(self, data, token):
+        """
+        Creates a new movie.
+        :param data: Dictionary with movie data.
+        :param token: Authorization token for SUPER_ADMIN.
+        :return: Response object.
+        """
+        headers = {"Authorization": f"Bearer {token}"}
+        return await self.send_request(
+            method='POST',
+            endpoint='/movies',
+            data=data,
+            headers=headers,
+            expected_status=[200, 201]
+        )
+
+    async def delete_movie(self, movie_id, token, expected_status=(200, 201)):
+        """
+        Deletes a movie by its ID.
+        :param movie_id: Movie identifier.
+        :param token: Authorization token for SUPER_ADMIN.
+        :return: Response object.
+        """
+        headers = {"Authorization": f"Bearer {token}"}
+        return await self.send_request(method='DELETE', endpoint=f'/movies/{movie_id}', headers=headers,
+                                       expected_status=expected_status)
@@ -1,48 +1,73 @@
+from typing import TYPE_CHECKING
+
 from constants import LOGIN_ENDPOINT, REGISTER_ENDPOINT, AUTH_API_BASE_URL
-from models.base_models import LoginData
 from requester.custom_requester import CustomRequester
+from requester.typed_response import TypedResponse
+from utils.cleanup_registry import USER
 from http import HTTPStatus
 
+if TYPE_CHECKING:
+    from models.base_models import LoginData
+
 
 class AuthAPI(CustomRequester):
     """
     API class for handling authentication.
     """
 
-    def __init__(self, session):
-        super().__init__(session=session, base_url=AUTH_API_BASE_URL)
+    def __init__(self, session, base_url=None):
+        super().__init__(session=session, base_url=base_url or AUTH_API_BASE_URL)
+        self.service = "auth"
 
-    def register_user(self, user_data, expected_status=(200, 201)):
+    def register_user(self, user_data, expected_status=(200, 201), typed=False):
         """
         Registers a new user.
         :param user_data: User data.
         :param expected_status: Expected HTTP status code.
+        :param typed: Return TypedResponse with the User model.
         :return: Response object.
         """
-        return self.send_request(
+        response = self.send_request(
             method="POST",
             endpoint=REGISTER_ENDPOINT,
             data=user_data,
             expected_status=expected_status
         )
+        if typed:
+            from models.response_models import User
 
-    def login_user(self, login_data: LoginData, expected_status=(200, 201)):
+            response = TypedResponse(response, User)
+        if self.cleanup_registry is not None and response.status_code in (200, 201):
+            # У типизированного ответа id берётся из модели, чтобы тело не разбиралось второй раз
+            self.cleanup_registry.register(USER, response.data.id if typed else response.json()["id"])
+        return response
+
+    def login_user(self, login_data: "LoginData", expected_status=(200, 201), typed=False):
         """
         Logs in a user.
         :param login_data: Экземпляр LoginData или словарь с данными для входа.
         :param expected_status: Ожидаемый HTTP статус.
+        :param typed: Вернуть TypedResponse с моделью LoginResponse.
         :return: Response object.
         """
+        # pydantic-модели импортируются при первом входе, а не при импорте клиента
+        from models.base_models import LoginData
+
         if isinstance(login_data, dict):
             login_data = LoginData(**login_data)
 
         data_dict = login_data.model_dump(exclude_unset=True)
-        return self.send_request(
+        response = self.send_request(
             method="POST",
             endpoint=LOGIN_ENDPOINT,
             data=data_dict,
             expected_status=expected_status
         )
+        if typed:
+            from models.response_models import LoginResponse
+
+            return TypedResponse(response, LoginResponse)
+        return response
 
     def change_user_role(self, user_id, new_roles, admin_token):
         """Изменяет роль пользователя"""
@@ -53,11 +78,21 @@ class AuthAPI(CustomRequester):
     def delete_user(self, user_id, admin_token):
         """Удаляет пользователя (только для ADMIN и SUPER_ADMIN)"""
         headers = {"Authorization": f"Bearer {admin_token}"}
-        return self.send_request("DELETE", f"/user/{user_id}", headers=headers,
-                                 expected_status=[200, 204, 404])
+        response = self.send_request("DELETE", f"/user/{user_id}", headers=headers,
+                                     expected_status=[200, 204, 404])
+        if self.cleanup_registry is not None:
+            self.cleanup_registry.discard(USER, user_id)
+        return response
 
-    def get_user(self, user_id, admin_token):
-        """Получение информации о пользователе."""
+    def get_user(self, user_id, admin_token, typed=False):
+        """
+        Получение информации о пользователе.
+        При typed=True возвращается TypedResponse с моделью User (сам ответ не теряется), иначе словарь.
+        """
         headers = {"Authorization": f"Bearer {admin_token}"}
         response = self.send_request("GET", f"/user/{user_id}", headers=headers, expected_status=[200])
+        if typed:
+            from models.response_models import User
+
+            return TypedResponse(response, User)
         return response.json()
@@ -1,7 +1,11 @@
+from contextlib import closing
 from http import HTTPStatus
 
-from constants import MOVIES_API_BASE_URL
+from constants import MOVIES_API_BASE_URL, MOVIES_PAGE_SIZE, MOVIES_PREFETCH_PAGES
 from requester.custom_requester import CustomRequester
+from requester.deadline import ContextThreadPoolExecutor
+from requester.typed_response import TypedResponse
+from utils.cleanup_registry import MOVIE
 
 
 class MoviesAPI(CustomRequester):
@@ -9,40 +13,134 @@ class MoviesAPI(CustomRequester):
     API class for handling movie-related operations.
     """
 
-    def __init__(self, session):
-        super().__init__(session=session, base_url=MOVIES_API_BASE_URL)
+    def __init__(self, session, base_url=None):
+        super().__init__(session=session, base_url=base_url or MOVIES_API_BASE_URL)
+        self.service = "movies"
 
-    def get_movies(self, params=None):
+    def get_movies(self, params=None, typed=False):
         """
         Retrieves the list of movies with optional filtering.
         :param params: Dictionary of query parameters.
+        :param typed: Return TypedResponse with the MovieList model.
         :return: Response object.
         """
-        return self.send_request(method='GET', endpoint='/movies', params=params)
+        response = self.send_request(method='GET', endpoint='/movies', params=params)
+        if typed:
+            from models.response_models import MovieList
 
-    def get_movie(self, movie_id):
+            return TypedResponse(response, MovieList)
+        return response
+
+    def stream_movies(self, params=None, callback=None):
+        """
+        Streams the movies list: movies are parsed one by one while the body is being read,
+        so large filter results are never held in memory as a whole.
+        :param params: Dictionary of query parameters (filters).
+        :param callback: Callable(movie) called for every movie; returning False stops reading.
+                         If not passed, a generator of movie dictionaries is returned.
+        :return: Generator of movie dictionaries or, with callback, the number of processed movies.
+        """
+        movies = self.stream_request(method='GET', endpoint='/movies', key="movies", params=params)
+        if callback is None:
+            return movies
+        processed = 0
+        with closing(movies):
+            for movie in movies:
+                processed += 1
+                if callback(movie) is False:
+                    break
+        return processed
+
+    def iter_movies(self, params=None, page_size=MOVIES_PAGE_SIZE, prefetch=MOVIES_PREFETCH_PAGES):
+        """
+        Lazily walks all pages of the movies list.
+        The next pages are loaded in the background (no more than `prefetch` pages ahead),
+        pending requests are cancelled when the caller stops iterating.
+        :param params: Dictionary of query parameters (filters).
+        :param page_size: Number of movies per page.
+        :param prefetch: Number of pages loaded ahead of the current one.
+        :return: Generator of movie dictionaries.
+        """
+        base_params = {**(params or {}), "pageSize": page_size}
+
+        def fetch(page):
+            return self.get_movies(params={**base_params, "page": page}, typed=True).json()
+
+        first_page = fetch(1)
+        page_count = first_page.get("pageCount")
+        yield from first_page.get("movies", [])
+        if (page_count is not None and page_count <= 1) or len(first_page.get("movies", [])) < page_size:
+            return
+
+        executor = ContextThreadPoolExecutor(max_workers=max(prefetch, 1))
+        try:
+            pending = {}
+            next_page = 2
+            current = 2
+            while True:
+                # Держим в работе не больше prefetch страниц вперёд
+                while len(pending) < max(prefetch, 1) and (page_count is None or next_page <= page_count):
+                    pending[next_page] = executor.submit(fetch, next_page)
+                    next_page += 1
+                if current not in pending:
+                    return
+                movies = pending.pop(current).result().get("movies", [])
+                yield from movies
+                if page_count is None and len(movies) < page_size:
+                    return
+                current += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def find_movie(self, movie_id, params=None):
+        """
+        Searches the movie by ID through all pages, stopping at the first hit.
+        :param movie_id: Movie identifier.
+        :param params: Dictionary of query parameters (filters).
+        :return: Movie dictionary or None if it is not in the list.
+        """
+        with closing(self.iter_movies(params=params)) as movies:
+            return next((movie for movie in movies if movie["id"] == movie_id), None)
+
+    def get_movie(self, movie_id, typed=False):
         """
         Retrieves movie details by ID.
         :param movie_id: Movie identifier.
+        :param typed: Return TypedResponse with the Movie model.
         :return: Response object.
         """
-        return self.send_request(method='GET', endpoint=f'/movies/{movie_id}')
+        response = self.send_request(method='GET', endpoint=f'/movies/{movie_id}')
+        if typed:
+            from models.response_models import Movie
 
-    def create_movie(self, data, token):
+            return TypedResponse(response, Movie)
+        return response
+
+    def create_movie(self, data, token, typed=False, expected_status=(200, 201)):
         """
         Creates a new movie.
         :param data: Dictionary with movie data.
         :param token: Authorization token for SUPER_ADMIN.
+        :param typed: Return TypedResponse with the Movie model.
+        :param expected_status: Expected HTTP status code.
         :return: Response object.
         """
         headers = {"Authorization": f"Bearer {token}"}
-        return self.send_request(
+        response = self.send_request(
             method='POST',
             endpoint='/movies',
             data=data,
             headers=headers,
-            expected_status=[200, 201]
+            expected_status=expected_status
         )
+        if typed:
+            from models.response_models import Movie
+
+            response = TypedResponse(response, Movie)
+        if self.cleanup_registry is not None and response.status_code in (200, 201):
+            # У типизированного ответа id берётся из модели, чтобы тело не разбиралось второй раз
+            self.cleanup_registry.register(MOVIE, response.data.id if typed else response.json()["id"])
+        return response
 
     def delete_movie(self, movie_id, token, expected_status=(200, 201)):
         """
@@ -52,4 +150,9 @@ class MoviesAPI(CustomRequester):
         :return: Response object.
         """
         headers = {"Authorization": f"Bearer {token}"}
-        return self.send_request(method='DELETE', endpoint=f'/movies/{movie_id}', headers=headers, expected_status=expected_status)
+        response = self.send_request(method='DELETE', endpoint=f'/movies/{movie_id}', headers=headers,
+                                     expected_status=expected_status)
+        # Удалённый (или уже отсутствующий) фильм больше не нужно чистить
+        if self.cleanup_registry is not None and (response.status_code < 300 or response.status_code == 404):
+            self.cleanup_registry.discard(MOVIE, movie_id)
+        return response
@@ -0,0 +1,65 @@
+"""
+Бенчмарки накладных расходов самого фреймворка против локальной заглушки сервисов.
+Заглушка работает в отдельном процессе, поэтому для измерения CPU клиента запускайте:
+
+    pytest benchmarks --benchmark-timer=time.process_time
+"""
+import pytest
+
+from api.api_manager import ApiManager
+from data_generator import DataGenerator
+from fake_services.server import FakeServicesProcess
+from models.base_models import LoginData
+from requester.request_log import RequestLog
+from requester.transport import create_session
+
+ADMIN_EMAIL = "bench-admin@example.com"
+ADMIN_PASSWORD = "BenchPassword1"
+
+
+@pytest.fixture(scope="module")
+def fake_api_manager():
+    """
+    Фикстура ApiManager, направленного в заглушку без искусственной задержки.
+    """
+    with FakeServicesProcess(super_admin=(ADMIN_EMAIL, ADMIN_PASSWORD)) as services:
+        session = create_session()
+        yield ApiManager(session, auth_base_url=services.base_url, movies_base_url=services.base_url)
+        session.close()
+
+
+@pytest.fixture(scope="module")
+def bench_movie(fake_api_manager):
+    token = fake_api_manager.auth_api.login_user(
+        {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}).json()["accessToken"]
+    return fake_api_manager.movies_api.create_movie(DataGenerator.generate_movie_data(), token).json()
+
+
+class TestFrameworkOverhead:
+    """
+    Per-call cost of the request, logging, data generation and validation layers.
+    """
+
+    def test_send_request_with_logging(self, benchmark, fake_api_manager, bench_movie):
+        benchmark(fake_api_manager.movies_api.get_movie, bench_movie["id"])
+
+    def test_send_request_without_logging(self, benchmark, fake_api_manager, bench_movie):
+        benchmark(fake_api_manager.movies_api.send_request, "GET", f"/movies/{bench_movie['id']}",
+                  need_logging=False)
+
+    def test_eager_logging(self, benchmark, fake_api_manager, bench_movie):
+        response = fake_api_manager.movies_api.get_movie(bench_movie["id"])
+        benchmark(fake_api_manager.movies_api.log_request_and_response, response)
+
+    def test_deferred_logging_capture(self, benchmark, fake_api_manager, bench_movie):
+        response = fake_api_manager.movies_api.get_movie(bench_movie["id"])
+        benchmark(RequestLog().capture, response)
+
+    def test_movie_payload_generation(self, benchmark):
+        benchmark(DataGenerator.generate_movie_data)
+
+    def test_user_payload_generation(self, benchmark):
+        benchmark(DataGenerator.generate_user_data)
+
+    def test_login_data_validation(self, benchmark):
+        benchmark(LoginData, email=ADMIN_EMAIL, password=ADMIN_PASSWORD)
@@ -1,71 +1,243 @@
 import os
 from http import HTTPStatus
 import pytest
-import requests
-from faker import Faker
 from api.api_manager import ApiManager
-from constants import AUTH_DATA, HOST, PORT, DATABASE_NAME, USERNAME_SQL, PASSWORD
-from sqlalchemy import create_engine, Column, String, Boolean, DateTime, text
-from sqlalchemy.orm import declarative_base, sessionmaker
+from data_generator import get_bulk_generator
+from entities.user import User
+from enums.roles import Roles
+from requester.transport import create_session
+from utils.db import create_db_engine, dispose_db_engine
+from utils.db_assertions import DbExpectations
+from utils.rbac_matrix import RbacMatrix
+from utils.parallel import get_shared_tmp_dir, run_once, unique_name
+from utils.token_cache import TokenCache
+from utils.movie_pool import MoviePool
+from utils.user_pool import UserPool
+from constants import (AUTH_DATA, TOKEN_CACHE_PATH, USER_POOL_SIZE, MOVIE_POOL_SHARED_SIZE, MOVIE_POOL_EXCLUSIVE_SIZE,
+                       MOVIE_POOL_COMBINATIONS, CLEANUP_MODE, USE_FAKE_SERVICES,
+                       FAKE_SERVICES_LATENCY, FAKE_SERVICES_JITTER, DB_BACKEND)
+
+pytest_plugins = ["pytester", "plugins.latency_metrics", "plugins.deadlines", "plugins.impact", "plugins.request_log"]
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    В режиме DB_BACKEND=sqlite пропускает тесты, проверяющие записи сервисов в их базе.
+    """
+    if DB_BACKEND != "sqlite":
+        return
+    skip = pytest.mark.skip(reason="DB_BACKEND=sqlite: the services write to their own database")
+    for item in items:
+        if "service_db" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def global_setup(tmp_path_factory):
+    """
+    Фикстура для шагов, которые должны выполниться один раз на весь прогон (на все воркеры xdist).
+    Использование: global_setup("seed_genres", lambda: {...}) - результат должен сериализоваться в JSON.
+    """
+    shared_dir = get_shared_tmp_dir(tmp_path_factory)
+
+    def _run_once(name, func):
+        return run_once(shared_dir, name, func)
+
+    return _run_once
+
+
+@pytest.fixture(scope="function")
+def unique_resource_name():
+    """
+    Фикстура, возвращающая функцию для генерации имён, не пересекающихся между воркерами.
+    """
+    return unique_name
 
 
 @pytest.fixture(scope="session")
 def session():
     """
-    Фикстура для создания HTTP-сессии.
+    Фикстура для создания HTTP-сессии с настроенным пулом соединений, таймаутами и ретраями.
+    """
+    http_session = create_session()
+    yield http_session
+    http_session.close()
+
+
+@pytest.fixture(scope="session")
+def fake_services():
+    """
+    Фикстура локальной заглушки сервисов auth и movies (с настраиваемой задержкой ответа).
     """
-    return requests.Session()
+    from fake_services.server import FakeServices
+
+    with FakeServices(latency=FAKE_SERVICES_LATENCY, jitter=FAKE_SERVICES_JITTER,
+                      super_admin=(AUTH_DATA["email"], AUTH_DATA["password"])) as services:
+        yield services
 
 
 @pytest.fixture(scope="session")
-def api_manager(session):
+def api_manager(request, session):
     """
     Фикстура для создания экземпляра ApiManager.
+    При USE_FAKE_SERVICES=true клиенты направляются в локальную заглушку сервисов.
+    Если включён кэш GET-ответов, в конце сессии логируются его счётчики.
     """
-    return ApiManager(session)
+    base_urls = {}
+    if USE_FAKE_SERVICES:
+        services = request.getfixturevalue("fake_services")
+        base_urls = {"auth_base_url": services.base_url, "movies_base_url": services.base_url}
+    manager = ApiManager(session, **base_urls)
+    yield manager
+    if manager.movies_api.response_cache is not None:
+        manager.movies_api.logger.info(f"Movies response cache: {manager.movies_api.response_cache.stats()}")
 
 
 @pytest.fixture(scope="session")
-def super_admin_token(api_manager):
+def token_cache(tmp_path_factory):
     """
-    Фикстура для получения токена SUPER_ADMIN.
+    Фикстура кэша токенов, общего для всех воркеров pytest-xdist.
+    Файл кэша лежит в общей для воркеров временной папке, либо по пути TOKEN_CACHE_PATH.
     """
-    response = api_manager.auth_api.login_user(AUTH_DATA, expected_status=(200, 201))
+    store_path = TOKEN_CACHE_PATH or get_shared_tmp_dir(tmp_path_factory) / "token_cache.json"
+    return TokenCache(store_path)
+
+
+def _login_token(api_manager, login_data):
+    response = api_manager.auth_api.login_user(login_data, expected_status=(200, 201), typed=True)
     assert response.status_code in [200, 201], f"Failed to login: {response.text}"
-    return response.json()["accessToken"]
+    return response.data.accessToken
+
+
+def _uses_api(items):
+    """
+    Проверяет, нужен ли тестам ApiManager (напрямую или через другие фикстуры).
+    """
+    return any("api_manager" in item.fixturenames for item in items)
+
+
+@pytest.fixture(scope="session")
+def cleanup_registry(request, api_manager, token_cache):
+    """
+    Фикстура реестра ресурсов, созданных через AuthAPI/MoviesAPI.
+    В конце сессии удаляет ресурсы со scope "session" и сообщает о неудалённых (утёкших) ресурсах.
+    При CLEANUP_MODE=db движок БД запрашивается заранее, чтобы он закрывался после очистки.
+    """
+    registry = api_manager.cleanup_registry
+    registry.token_provider = lambda: token_cache.get_token(
+        AUTH_DATA["email"], AUTH_DATA["password"],
+        login=lambda: _login_token(api_manager, AUTH_DATA),
+        role=Roles.SUPER_ADMIN.value
+    )
+    db_engine = request.getfixturevalue("db_engine") if CLEANUP_MODE == "db" else None
+    yield registry
+    if registry.pending("session"):
+        if db_engine is not None:
+            from sqlalchemy.orm import sessionmaker
+
+            db_session = sessionmaker(bind=db_engine)()
+            try:
+                registry.teardown("session", db_session=db_session)
+            finally:
+                db_session.close()
+        else:
+            registry.teardown("session")
+    leaked = registry.pending()
+    if leaked:
+        registry.logger.warning(f"Cleanup: {len(leaked)} resource(s) leaked: {leaked}")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def module_cleanup(request):
+    """
+    Удаляет ресурсы со scope "module" после завершения модуля.
+    Модули без API-тестов (юнит-тесты) не создают ApiManager и не поднимают заглушку сервисов.
+    """
+    module_items = [item for item in request.session.items if getattr(item, "module", None) is request.module]
+    if not _uses_api(module_items):
+        yield
+        return
+    cleanup_registry = request.getfixturevalue("cleanup_registry")
+    db_session = request.getfixturevalue("db_session") if CLEANUP_MODE == "db" else None
+    yield
+    if cleanup_registry.pending("module"):
+        cleanup_registry.teardown("module", db_session=db_session)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def function_cleanup(request):
+    """
+    Удаляет ресурсы, созданные тестом (scope "function"), параллельно после его завершения.
+    Для тестов без api_manager ничего не делает.
+    """
+    if not _uses_api([request.node]):
+        yield
+        return
+    cleanup_registry = request.getfixturevalue("cleanup_registry")
+    db_session = request.getfixturevalue("db_session") if CLEANUP_MODE == "db" else None
+    yield
+    if cleanup_registry.pending("function"):
+        cleanup_registry.teardown("function", db_session=db_session)
+
+
+@pytest.fixture(scope="session")
+def super_admin_token(api_manager, token_cache):
+    """
+    Фикстура для получения токена SUPER_ADMIN (из кэша токенов).
+    """
+    return token_cache.get_token(
+        AUTH_DATA["email"], AUTH_DATA["password"],
+        login=lambda: _login_token(api_manager, AUTH_DATA),
+        role="SUPER_ADMIN"
+    )
+
+
+@pytest.fixture(scope="session")
+def data_generator():
+    """
+    Фикстура генератора тестовых данных (один на процесс, зерно из DATA_SEED).
+    Данные генерируются пачками; имена и email уникальны между воркерами.
+    """
+    return get_bulk_generator()
 
 
 @pytest.fixture(scope="function")
-def movie_data():
+def movie_data(data_generator):
     """
     Фикстура для генерации динамических данных фильма.
     """
-    faker = Faker()
-    return {
-        "name": faker.catch_phrase(),
-        "imageUrl": f"https://example.com/{faker.uuid4()}.jpg",
-        "price": faker.random_int(min=100, max=5000),
-        "description": faker.text(max_nb_chars=200),
-        "location": faker.random_element(elements=("MSK", "SPB")),
-        "published": faker.boolean(chance_of_getting_true=50),
-        "genreId": faker.random_int(min=1, max=10)
-    }
+    return data_generator.movie()
 
 
 @pytest.fixture(scope="function")
-def register_user_data():
+def register_user_data(data_generator):
     """
     Фикстура для генерации динамических данных пользователя.
     """
-    faker = Faker()
-    user_data = {
-        "email": faker.email(),
-        "fullName": faker.name(),
-        "password": faker.password(length=12, special_chars=False, digits=True, upper_case=True, lower_case=True),
-        "passwordRepeat": None
-    }
-    user_data["passwordRepeat"] = user_data["password"]
-    return user_data
+    return data_generator.user()
+
+
+@pytest.fixture(scope="session")
+def user_pool(api_manager, super_admin_token, token_cache):
+    """
+    Фикстура пула заранее зарегистрированных пользователей.
+    USER-ы регистрируются пачкой параллельно при первом обращении, в конце сессии все удаляются.
+    Токены пользователей берутся из кэша токенов и обновляются перед истечением.
+    """
+    pool = UserPool(api_manager, super_admin_token, token_cache=token_cache)
+    pool.provision(Roles.USER.value, USER_POOL_SIZE)
+    yield pool
+    pool.delete_all()
+
+
+@pytest.fixture(scope="function")
+def pooled_user(user_pool):
+    """
+    Фикстура, выдающая авторизованного USER-а из пула и возвращающая его в пул после теста.
+    """
+    user = user_pool.checkout(Roles.USER.value)
+    yield user
+    user_pool.checkin(user)
 
 
 @pytest.fixture(scope="function")
@@ -85,55 +257,157 @@ def create_movie(api_manager, super_admin_token, movie_data):
     return _create_movie
 
 
+@pytest.fixture(scope="session")
+def movie_pool(api_manager, super_admin_token):
+    """
+    Фикстура пула фильмов: общие фильмы только для чтения и запас фильмов для разрушающих тестов.
+    Фильмы создаются пачкой параллельно при первом обращении, в конце сессии все удаляются.
+    """
+    pool = MoviePool(api_manager, super_admin_token)
+    pool.provision(MOVIE_POOL_COMBINATIONS, count=MOVIE_POOL_SHARED_SIZE)
+    pool.provision([{}], count=MOVIE_POOL_EXCLUSIVE_SIZE, exclusive=True)
+    yield pool
+    pool.delete_all()
+
+
 @pytest.fixture(scope="function")
-def user_create(api_manager, register_user_data, super_admin_token):
+def shared_movie(movie_pool):
     """
-    Фикстура для создания пользователя с заданной ролью.
+    Фикстура, возвращающая существующий фильм только для чтения (его нельзя менять и удалять).
+    """
+    return movie_pool.lease()
+
+
+@pytest.fixture(scope="function")
+def exclusive_movie(api_manager, movie_pool, super_admin_token):
+    """
+    Фикстура, возвращающая функцию для получения фильма в монопольное пользование.
+    Тест может менять и удалять фильм; если он остался, то удаляется после теста.
+    """
+    acquired = []
+
+    def _acquire(genre_id=None, location=None, published=None):
+        movie = movie_pool.acquire(genre_id=genre_id, location=location, published=published)
+        acquired.append(movie)
+        return movie
+
+    yield _acquire
+
+    for movie in acquired:
+        api_manager.movies_api.delete_movie(movie["id"], super_admin_token, expected_status=(200, 201, 404))
+
+
+@pytest.fixture(scope="function")
+def user_create(api_manager, user_pool, token_cache):
+    """
+    Фикстура для получения пользователя с заданной ролью.
     Поддерживаются роли:
-      - "USER": регистрируется новый пользователь;
-      - "SUPER_ADMIN": производится вход с данными из AUTH_DATA.
+      - "USER" и "ADMIN": пользователь берётся из пула (и возвращается в него после теста);
+      - "SUPER_ADMIN": используется токен из кэша для данных из AUTH_DATA.
     """
+    checked_out = []
 
     def _create_user(role: str):
-        if role == "USER":
-            # Регистрация нового пользователя
-            user_data = register_user_data  # получаем динамические данные
-            reg_response = api_manager.auth_api.register_user(user_data)
-            assert reg_response.status_code in [200, 201], f"User registration failed: {reg_response.text}"
-
-            login_payload = {"email": user_data["email"], "password": user_data["password"]}
-            login_response = api_manager.auth_api.login_user(login_payload)
-            assert login_response.status_code in [200, 201], f"User login failed: {login_response.text}"
-            token = login_response.json()["accessToken"]
-
-        elif role == "SUPER_ADMIN":
-            # Вход с данными супер-админа
-            login_response = api_manager.auth_api.login_user(AUTH_DATA)
-            assert login_response.status_code in [200, 201], f"Super admin login failed: {login_response.text}"
-            token = login_response.json()["accessToken"]
-        else:
-            raise ValueError(f"Unsupported role: {role}")
+        if role in (Roles.USER.value, Roles.ADMIN.value):
+            user = user_pool.checkout(role)
+            checked_out.append(user)
+            return user
 
-        class User:
-            def __init__(self, role, token):
-                self.role = role
-                self.token = token
+        if role == Roles.SUPER_ADMIN.value:
+            # Вход с данными супер-админа (токен берётся из кэша)
+            token = token_cache.get_token(
+                AUTH_DATA["email"], AUTH_DATA["password"],
+                login=lambda: _login_token(api_manager, AUTH_DATA),
+                role=role
+            )
+            return User(AUTH_DATA["email"], AUTH_DATA["password"], [role], api_manager, token=token)
 
-        return User(role, token)
+        raise ValueError(f"Unsupported role: {role}")
+
+    yield _create_user
+
+    for pooled in checked_out:
+        user_pool.checkin(pooled)
 
-    return _create_user
 
-engine = create_engine(f"postgresql+psycopg2://{USERNAME_SQL}:{PASSWORD}@{HOST}:{PORT}/{DATABASE_NAME}") # Создаем движок (engine) для подключения к базе данных
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) # Создаем фабрику сессий
 @pytest.fixture(scope="module")
-def db_session():
+def role_tokens(user_pool, super_admin_token):
+    """
+    Фикстура токенов для всех ролей: USER и ADMIN берутся из пула один раз на модуль, SUPER_ADMIN - из кэша.
+    """
+    users = [user_pool.checkout(Roles.USER.value), user_pool.checkout(Roles.ADMIN.value)]
+    tokens = {user.role: user.token for user in users}
+    tokens[Roles.SUPER_ADMIN.value] = super_admin_token
+    yield tokens
+    for user in users:
+        user_pool.checkin(user)
+
+
+@pytest.fixture(scope="module")
+def rbac_matrix(api_manager, role_tokens):
+    """
+    Фикстура матрицы прав (роль x эндпоинт): ячейки выполняются параллельно при первом обращении,
+    в конце модуля в лог выводится сводная таблица результатов.
+    """
+    matrix = RbacMatrix(api_manager, role_tokens)
+    yield matrix
+    if matrix.results:
+        matrix.logger.info(f"RBAC matrix:\n{matrix.format_grid()}")
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """
+    Фикстура движка базы данных. Создаётся лениво и отдельно в каждом воркере xdist,
+    поэтому пул соединений не разделяется между процессами.
+    При DB_BACKEND=sqlite это локальная SQLite со схемой моделей и засеянными данными.
+    SQLAlchemy и драйвер БД импортируются только здесь: тесты без БД их не загружают.
+    """
+    engine = create_db_engine()
+    yield engine
+    dispose_db_engine(engine)
+
+
+@pytest.fixture(scope="module")
+def db_session(db_engine):
     """
     Фикстура, которая создает и возвращает сессию для работы с базой данных.
     После завершения теста сессия автоматически закрывается.
     """
-    # Создаем новую сессию
-    session = SessionLocal()
+    from sqlalchemy.orm import sessionmaker
+
+    # Создаем фабрику сессий и новую сессию
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+    session = session_factory()
     # Возвращаем сессию в тест
     yield session
     # Закрываем сессию после завершения теста
     session.close()
+
+
+@pytest.fixture(scope="function")
+def db_expect(db_session):
+    """
+    Фикстура пакетных проверок строк в базе: ожидания копятся через expect_present/expect_absent
+    и проверяются одним запросом IN (...) на таблицу в verify(), с повтором до DB_POLL_TIMEOUT.
+    """
+    return DbExpectations(db_session)
+
+
+@pytest.fixture(scope="function")
+def db_transaction(db_engine):
+    """
+    Фикстура сессии, изолированной транзакцией: весь тест выполняется во внешней транзакции,
+    а commit() в коде теста лишь фиксирует вложенный SAVEPOINT. После теста внешняя транзакция
+    откатывается, поэтому данные не попадают в базу и не нужно удалять их вручную.
+    Подходит для тестов, которые сами пишут в базу (данные сервиса, записанные через API, не откатываются).
+    """
+    from sqlalchemy.orm import Session
+
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
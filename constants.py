@@ -1,8 +1,23 @@
 import os
-from dotenv import load_dotenv
+from pathlib import Path
 
-# Load environment variables from .env file
-load_dotenv()
+
+def _find_env_file():
+    """
+    Ищет .env так же, как load_dotenv(): от папки проекта вверх по дереву.
+    """
+    for directory in Path(__file__).resolve().parents:
+        if (directory / ".env").is_file():
+            return directory / ".env"
+    return None
+
+
+# Load environment variables from .env file (python-dotenv импортируется, только если файл есть)
+_env_file = _find_env_file()
+if _env_file is not None:
+    from dotenv import load_dotenv
+
+    load_dotenv(_env_file)
 
 AUTH_DATA = {
     "email": os.getenv("SUPER_ADMIN_EMAIL"),
@@ -20,3 +35,117 @@ DATABASE_NAME = os.getenv("DATABASE_NAME")
 USERNAME_SQL = os.getenv("USERNAME_SQL")
 PASSWORD = os.getenv("PASSWORD")
 
+# HTTP transport settings
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Количество пулов (хостов) в адаптере
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))  # Максимум соединений в пуле одного хоста
+HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_RETRY_TOTAL = int(os.getenv("HTTP_RETRY_TOTAL", "3"))
+HTTP_RETRY_BACKOFF_FACTOR = float(os.getenv("HTTP_RETRY_BACKOFF_FACTOR", "0.5"))
+HTTP_RETRY_BACKOFF_JITTER = float(os.getenv("HTTP_RETRY_BACKOFF_JITTER", "0.3"))
+HTTP_RETRY_STATUSES = (502, 503)
+
+# (connect, read) таймауты для отдельных эндпоинтов, ищутся по самому длинному префиксу
+ENDPOINT_TIMEOUTS = {
+    LOGIN_ENDPOINT: (HTTP_CONNECT_TIMEOUT, 10),
+    REGISTER_ENDPOINT: (HTTP_CONNECT_TIMEOUT, 10),
+}
+
+# Request logging: "eager" - каждый запрос логируется сразу,
+# "deferred" - запросы копятся в кольцевом буфере теста и выводятся только при падении
+REQUEST_LOG_MODE = os.getenv("REQUEST_LOG_MODE", "eager").lower()
+REQUEST_LOG_BUFFER_SIZE = int(os.getenv("REQUEST_LOG_BUFFER_SIZE", "50"))
+
+# Token cache
+TOKEN_CACHE_PATH = os.getenv("TOKEN_CACHE_PATH")  # Постоянный файл кэша токенов (по умолчанию - во временной папке прогона)
+TOKEN_REFRESH_MARGIN = int(os.getenv("TOKEN_REFRESH_MARGIN", "60"))  # За сколько секунд до истечения обновлять токен
+TOKEN_DEFAULT_TTL = int(os.getenv("TOKEN_DEFAULT_TTL", "600"))  # Время жизни токена без поля exp
+
+# User pool
+USER_POOL_SIZE = int(os.getenv("USER_POOL_SIZE", "5"))  # Сколько USER регистрировать заранее
+USER_POOL_BATCH_SIZE = int(os.getenv("USER_POOL_BATCH_SIZE", "5"))  # Размер пачки при ленивом пополнении
+USER_POOL_CONCURRENCY = int(os.getenv("USER_POOL_CONCURRENCY", "10"))  # Одновременных запросов при регистрации
+
+# Movie pool
+MOVIE_POOL_SHARED_SIZE = int(os.getenv("MOVIE_POOL_SHARED_SIZE", "1"))  # Фильмов только для чтения на каждую комбинацию
+MOVIE_POOL_EXCLUSIVE_SIZE = int(os.getenv("MOVIE_POOL_EXCLUSIVE_SIZE", "5"))  # Запас фильмов для разрушающих тестов
+MOVIE_POOL_CONCURRENCY = int(os.getenv("MOVIE_POOL_CONCURRENCY", "10"))
+# Комбинации (location, published), для которых фильмы создаются заранее
+MOVIE_POOL_COMBINATIONS = [
+    {"location": location, "published": published}
+    for location in ("MSK", "SPB")
+    for published in (True, False)
+]
+
+# Cleanup registry
+CLEANUP_MODE = os.getenv("CLEANUP_MODE", "api").lower()  # "api" - удаление через API, "db" - пачкой через SQL
+CLEANUP_MAX_WORKERS = int(os.getenv("CLEANUP_MAX_WORKERS", "8"))
+
+# Pagination of /movies
+MOVIES_PAGE_SIZE = int(os.getenv("MOVIES_PAGE_SIZE", "20"))
+MOVIES_PREFETCH_PAGES = int(os.getenv("MOVIES_PREFETCH_PAGES", "2"))  # Сколько следующих страниц грузить заранее
+
+# Client-side cache of GET responses
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))  # Максимум ответов в кэше (LRU)
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))  # Сколько секунд ответ считается свежим
+
+# Latency metrics of send_request
+LATENCY_REPORT_PATH = os.getenv("LATENCY_REPORT_PATH", "")  # JSON-артефакт с метриками прогона (пусто - не писать)
+LATENCY_REGRESSION_THRESHOLD = float(os.getenv("LATENCY_REGRESSION_THRESHOLD", "20"))  # Допустимый рост p95, %
+
+# Local fake of the auth and movies services
+USE_FAKE_SERVICES = os.getenv("USE_FAKE_SERVICES", "false").lower() == "true"  # Гонять тесты против заглушки
+FAKE_SERVICES_LATENCY = float(os.getenv("FAKE_SERVICES_LATENCY", "0"))  # Задержка каждого ответа заглушки, с
+FAKE_SERVICES_JITTER = float(os.getenv("FAKE_SERVICES_JITTER", "0"))
+
+# Record/replay of HTTP interactions
+HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "").lower()  # "" - сеть, "record" - запись, "replay" - воспроизведение
+HTTP_CASSETTE_PATH = os.getenv("HTTP_CASSETTE_PATH", "cassettes/requests.jsonl")
+# Поля тела запроса, генерируемые Faker: при поиске записи их значения не учитываются
+CASSETTE_DYNAMIC_FIELDS = frozenset(os.getenv(
+    "CASSETTE_DYNAMIC_FIELDS",
+    "name,email,fullName,password,passwordRepeat,description,imageUrl,price,location,published,genreId"
+).split(","))
+
+# Bulk test data generator
+DATA_SEED = os.getenv("DATA_SEED")  # Зерно генератора данных для воспроизводимых прогонов (по умолчанию случайное)
+DATA_BATCH_SIZE = int(os.getenv("DATA_BATCH_SIZE", "500"))  # Сколько записей генерировать за раз в пул
+
+# Startup time budget (python -m utils.import_budget)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "500"))  # Допустимое время импорта conftest, мс
+
+# Database engine pool (отдельный пул в каждом воркере xdist)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))  # Сколько соединений можно открыть сверх DB_POOL_SIZE
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Проверять соединение перед выдачей
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Переоткрывать соединения старше N секунд
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Ожидание свободного соединения, с
+
+# Polling of DB state written by the services
+DB_POLL_TIMEOUT = float(os.getenv("DB_POLL_TIMEOUT", "10"))  # Сколько ждать нужного состояния базы, с
+DB_POLL_INITIAL_DELAY = float(os.getenv("DB_POLL_INITIAL_DELAY", "0.05"))
+DB_POLL_MAX_DELAY = float(os.getenv("DB_POLL_MAX_DELAY", "1"))
+
+# Database backend: "postgres" - база сервисов, "sqlite" - локальная встроенная база для ORM-тестов
+DB_BACKEND = os.getenv("DB_BACKEND", "postgres").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "")  # Файл базы SQLite; "" - временный файл на процесс, ":memory:" - в памяти
+DB_SEED_ROWS = int(os.getenv("DB_SEED_ROWS", "100"))  # Сколько фильмов и пользователей засеять в SQLite
+
+# Role-permission matrix
+RBAC_MAX_WORKERS = int(os.getenv("RBAC_MAX_WORKERS", "16"))  # Сколько ячеек матрицы выполнять одновременно
+
+# Fail-fast: deadlines and circuit breaker per service
+TEST_DEADLINE = float(os.getenv("TEST_DEADLINE", "0"))  # Время на запросы одного теста, с (0 - без ограничения)
+SESSION_DEADLINE = float(os.getenv("SESSION_DEADLINE", "0"))  # Время на запросы всего прогона, с (0 - без ограничения)
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))  # Ошибок подряд до размыкания
+CIRCUIT_BREAKER_RESET_TIMEOUT = float(os.getenv("CIRCUIT_BREAKER_RESET_TIMEOUT", "30"))  # Пауза до пробного запроса, с
+
+# Streaming of large list responses
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", str(64 * 1024)))  # Размер чанка при чтении тела ответа, байт
+
+# Test durations and touched endpoints (scheduling and impact-based selection)
+TEST_IMPACT_PATH = os.getenv("TEST_IMPACT_PATH", "")  # Хранилище между прогонами, например .test_impact.json ("" - не вести)
+TEST_IMPACT_SMOOTHING = float(os.getenv("TEST_IMPACT_SMOOTHING", "0.5"))  # Вес последнего прогона в длительности теста
@@ -1,5 +1,12 @@
 import random
 import string
+import threading
+import uuid
+from collections import deque
+import itertools
+
+from constants import DATA_SEED, DATA_BATCH_SIZE
+from utils.parallel import get_worker_id
 
 
 class DataGenerator:
@@ -15,3 +22,163 @@ class DataGenerator:
         """Генерирует случайный email"""
         random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
         return f"kekk{random_string}@gmail.com"
+
+    @staticmethod
+    def generate_user_data():
+        """Генерирует данные для регистрации пользователя (из пула общего генератора)"""
+        return get_bulk_generator().user()
+
+    @staticmethod
+    def generate_movie_data(**overrides):
+        """Генерирует данные фильма; переданные поля (genreId, location, published...) подставляются как есть"""
+        return get_bulk_generator().movie(**overrides)
+
+
+class BulkDataGenerator:
+    """
+    Batch generator of movie and user payloads.
+    Faker is created once and only fills a vocabulary (titles, names, sentences),
+    payloads are assembled from it by a seeded random.Random, so thousands of them cost
+    about as much as a few Faker calls. Names and emails get a "<namespace>-<n>" suffix,
+    the namespace includes the xdist worker id, so they are unique across workers and runs.
+    """
+
+    LOCATIONS = ("MSK", "SPB")
+    EMAIL_DOMAINS = ("gmail.com", "example.com", "mail.ru")
+
+    def __init__(self, seed=None, namespace=None, batch_size=DATA_BATCH_SIZE, vocabulary_size=200):
+        """
+        :param seed: Seed of the RNG and Faker; the same seed gives the same payloads (except the namespace).
+        :param namespace: Uniqueness suffix; by default worker id plus a random part of this process.
+        :param batch_size: Number of payloads generated at once for the pools (movie()/user()).
+        :param vocabulary_size: Number of Faker values of each kind to assemble payloads from.
+        """
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.namespace = namespace or f"{get_worker_id()}{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size
+        self.vocabulary_size = vocabulary_size
+        self._vocabulary = None
+        self._counter = itertools.count(1)
+        self._movies = deque()
+        self._users = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def vocabulary(self):
+        if self._vocabulary is None:
+            from faker import Faker
+
+            faker = Faker()
+            if self.seed is not None:
+                faker.seed_instance(self.seed)
+            size = self.vocabulary_size
+            self._vocabulary = {
+                "titles": [faker.catch_phrase() for _ in range(size)],
+                "names": [faker.name() for _ in range(size)],
+                "sentences": [faker.sentence() for _ in range(size)],
+            }
+        return self._vocabulary
+
+    def _suffix(self):
+        return f"{self.namespace}-{next(self._counter)}"
+
+    def _password(self):
+        rng = self.random
+        # Пароль обязан содержать строчную, заглавную букву и цифру
+        chars = [rng.choice(string.ascii_lowercase), rng.choice(string.ascii_uppercase), rng.choice(string.digits)]
+        chars += rng.choices(string.ascii_letters + string.digits, k=9)
+        rng.shuffle(chars)
+        return "".join(chars)
+
+    def movies(self, count, **overrides):
+        """
+        Generates movie payloads in one call.
+        :param count: Number of payloads.
+        :param overrides: Fields set as is in every payload (genreId, location, published...).
+        :return: List of dictionaries.
+        """
+        vocabulary, rng = self.vocabulary, self.random
+        result = []
+        for _ in range(count):
+            movie_data = {
+                "name": f"{rng.choice(vocabulary['titles'])} {self._suffix()}",
+                "imageUrl": f"https://example.com/{rng.getrandbits(64):016x}.jpg",
+                "price": rng.randint(100, 5000),
+                "description": " ".join(rng.choices(vocabulary["sentences"], k=3)),
+                "location": rng.choice(self.LOCATIONS),
+                "published": rng.random() < 0.5,
+                "genreId": rng.randint(1, 10)
+            }
+            movie_data.update(overrides)
+            result.append(movie_data)
+        return result
+
+    def users(self, count):
+        """
+        Generates user registration payloads in one call.
+        :param count: Number of payloads.
+        :return: List of dictionaries.
+        """
+        vocabulary, rng = self.vocabulary, self.random
+        result = []
+        for _ in range(count):
+            full_name = rng.choice(vocabulary["names"])
+            local_part = "".join(ch for ch in full_name.lower() if ch in string.ascii_lowercase)[:20] or "user"
+            password = self._password()
+            result.append({
+                "email": f"{local_part}.{self._suffix()}@{rng.choice(self.EMAIL_DOMAINS)}",
+                "fullName": full_name,
+                "password": password,
+                "passwordRepeat": password
+            })
+        return result
+
+    def stream_movies(self, batch_size=None, **overrides):
+        """
+        Endless generator of movie payloads produced batch by batch.
+        """
+        while True:
+            yield from self.movies(batch_size or self.batch_size, **overrides)
+
+    def stream_users(self, batch_size=None):
+        """
+        Endless generator of user payloads produced batch by batch.
+        """
+        while True:
+            yield from self.users(batch_size or self.batch_size)
+
+    def movie(self, **overrides):
+        """
+        Takes one movie payload from the pre-generated pool (refilled by batch_size).
+        """
+        with self._lock:
+            if not self._movies:
+                self._movies.extend(self.movies(self.batch_size))
+            movie_data = self._movies.popleft()
+        movie_data.update(overrides)
+        return movie_data
+
+    def user(self):
+        """
+        Takes one user payload from the pre-generated pool (refilled by batch_size).
+        """
+        with self._lock:
+            if not self._users:
+                self._users.extend(self.users(self.batch_size))
+            return self._users.popleft()
+
+
+_bulk_generator = None
+_bulk_generator_lock = threading.Lock()
+
+
+def get_bulk_generator():
+    """
+    Returns the process-wide BulkDataGenerator seeded from DATA_SEED.
+    """
+    global _bulk_generator
+    with _bulk_generator_lock:
+        if _bulk_generator is None:
+            _bulk_generator = BulkDataGenerator(seed=DATA_SEED)
+        return _bulk_generator
@@ -1,11 +1,18 @@
 class User:
-    def __init__(self, email: str, password: str, roles: list, api_manager):
+    def __init__(self, email: str, password: str, roles: list, api_manager, user_id=None, token=None):
         self.email = email
         self.password = password
         self.roles = roles
         self.api_manager = api_manager  # Экземпляр API Manager для запросов
+        self.id = user_id
+        self.token = token
 
     @property
     def creds(self):
         """Возвращает кортеж (email, password)"""
-        return self.email, self.password
\ No newline at end of file
+        return self.email, self.password
+
+    @property
+    def role(self):
+        """Возвращает основную роль пользователя"""
+        return self.roles[0] if self.roles else None
@@ -0,0 +1,30 @@
+"""
+Запуск локальной заглушки сервисов auth и movies:
+
+    python -m fake_services --port 8080 --latency 0.08
+"""
+import argparse
+
+from constants import AUTH_DATA
+from fake_services.server import FakeServices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake of the auth and movies services")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay added to every response, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra delay, seconds")
+    args = parser.parse_args()
+
+    services = FakeServices(args.host, args.port, args.latency, args.jitter,
+                            super_admin=(AUTH_DATA["email"], AUTH_DATA["password"]))
+    print(f"Fake services are listening on {services.base_url}")
+    try:
+        services.server.serve_forever()
+    except KeyboardInterrupt:
+        services.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+TOKEN_TTL = 3600
+MAX_PAGE_SIZE = 20
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _make_token(user_id, roles):
+    """Неподписанный JWT с exp, чтобы TokenCache мог прочитать срок действия."""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode("utf-8")).rstrip(b"=").decode("ascii")
+
+    payload = {"id": user_id, "roles": roles, "exp": int(time.time()) + TOKEN_TTL, "jti": uuid.uuid4().hex}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(payload)}.fake"
+
+
+class FakeState:
+    """
+    In-memory data of the fake auth and movies services.
+    """
+
+    def __init__(self, super_admin=None):
+        """
+        :param super_admin: Tuple (email, password) of the seeded SUPER_ADMIN.
+        """
+        self.lock = threading.Lock()
+        self.users = {}
+        self.tokens = {}
+        self.movies = {}
+        self._movie_ids = iter(range(1, 10 ** 9))
+        if super_admin and all(super_admin):
+            self.add_user(super_admin[0], "Super Admin", super_admin[1], ["SUPER_ADMIN"])
+
+    def add_user(self, email, full_name, password, roles):
+        user_id = str(uuid.uuid4())
+        self.users[user_id] = {
+            "id": user_id, "email": email, "fullName": full_name, "password": password, "roles": roles,
+            "verified": True, "banned": False, "createdAt": _now(),
+        }
+        return self.users[user_id]
+
+    @staticmethod
+    def public_user(user):
+        return {k: v for k, v in user.items() if k != "password"}
+
+    def add_movie(self, data):
+        movie_id = next(self._movie_ids)
+        self.movies[movie_id] = {
+            "id": movie_id, "name": data["name"], "price": data["price"], "description": data.get("description", ""),
+            "imageUrl": data.get("imageUrl"), "location": data["location"], "published": data["published"],
+            "genreId": data["genreId"], "rating": 0, "createdAt": _now(),
+        }
+        return self.movies[movie_id]
+
+
+class FakeServicesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, как у настоящих сервисов
+    # Заголовки и тело уходят отдельными записями: без TCP_NODELAY Nagle вместе с delayed ACK
+    # задерживает каждый keep-alive ответ примерно на 40 мс
+    disable_nagle_algorithm = True
+
+    routes = [
+        ("POST", re.compile(r"^/register$"), "register"),
+        ("POST", re.compile(r"^/login$"), "login"),
+        ("GET", re.compile(r"^/user/(?P<user_id>[^/]+)$"), "get_user"),
+        ("PATCH", re.compile(r"^/user/(?P<user_id>[^/]+)$"), "patch_user"),
+        ("DELETE", re.compile(r"^/user/(?P<user_id>[^/]+)$"), "delete_user"),
+        ("GET", re.compile(r"^/movies$"), "list_movies"),
+        ("POST", re.compile(r"^/movies$"), "create_movie"),
+        ("GET", re.compile(r"^/movies/(?P<movie_id>\d+)$"), "get_movie"),
+        ("DELETE", re.compile(r"^/movies/(?P<movie_id>\d+)$"), "delete_movie"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    # ------------------------------------------------------------------ dispatching
+    def _dispatch(self, method):
+        server = self.server
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+
+        url = urlsplit(self.path)
+        self.query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        try:
+            self.body = json.loads(raw_body) if raw_body else {}
+        except json.JSONDecodeError:
+            return self._send(HTTPStatus.BAD_REQUEST, {"message": "Invalid JSON"})
+
+        for route_method, pattern, handler_name in self.routes:
+            match = pattern.match(url.path)
+            if route_method == method and match:
+                with server.state.lock:
+                    status, payload = getattr(self, handler_name)(**match.groupdict())
+                return self._send(status, payload)
+        return self._send(HTTPStatus.NOT_FOUND, {"message": f"Cannot {method} {url.path}"})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # ------------------------------------------------------------------ helpers
+    @property
+    def state(self):
+        return self.server.state
+
+    def _current_user(self):
+        header = self.headers.get("Authorization", "")
+        token = header[len("Bearer "):] if header.startswith("Bearer ") else None
+        user_id = self.state.tokens.get(token)
+        return self.state.users.get(user_id)
+
+    def _require_roles(self, *roles):
+        """:return: (status, payload) of the error or None if access is allowed."""
+        user = self._current_user()
+        if user is None:
+            return HTTPStatus.UNAUTHORIZED, {"message": "Unauthorized"}
+        if not set(user["roles"]) & set(roles):
+            return HTTPStatus.FORBIDDEN, {"message": "Forbidden resource"}
+        return None
+
+    # ------------------------------------------------------------------ auth service
+    def register(self):
+        data = self.body
+        errors = []
+        if not isinstance(data.get("email"), str) or "@" not in data["email"]:
+            errors.append("email must be an email")
+        if not data.get("fullName"):
+            errors.append("fullName should not be empty")
+        if not isinstance(data.get("password"), str) or len(data["password"]) < 8:
+            errors.append("password must be longer than or equal to 8 characters")
+        elif data.get("passwordRepeat") != data["password"]:
+            errors.append("Пароли не совпадают")
+        if errors:
+            return HTTPStatus.BAD_REQUEST, {"message": errors, "error": "Bad Request"}
+        if any(user["email"] == data["email"] for user in self.state.users.values()):
+            return HTTPStatus.CONFLICT, {"message": "Пользователь с таким email уже зарегистрирован"}
+        user = self.state.add_user(data["email"], data["fullName"], data["password"], ["USER"])
+        return HTTPStatus.CREATED, self.state.public_user(user)
+
+    def login(self):
+        user = next((u for u in self.state.users.values() if u["email"] == self.body.get("email")), None)
+        if user is None or user["password"] != self.body.get("password"):
+            return HTTPStatus.UNAUTHORIZED, {"message": "Неверный логин или пароль"}
+        token = _make_token(user["id"], user["roles"])
+        self.state.tokens[token] = user["id"]
+        return HTTPStatus.OK, {"user": self.state.public_user(user), "accessToken": token,
+                               "refreshToken": uuid.uuid4().hex, "expiresIn": TOKEN_TTL * 1000}
+
+    def get_user(self, user_id):
+        error = self._require_roles("ADMIN", "SUPER_ADMIN")
+        if error:
+            return error
+        user = self.state.users.get(user_id)
+        if user is None:
+            return HTTPStatus.NOT_FOUND, {"message": "Пользователь не найден"}
+        return HTTPStatus.OK, self.state.public_user(user)
+
+    def patch_user(self, user_id):
+        error = self._require_roles("SUPER_ADMIN")
+        if error:
+            return error
+        user = self.state.users.get(user_id)
+        if user is None:
+            return HTTPStatus.NOT_FOUND, {"message": "Пользователь не найден"}
+        for field in ("roles", "verified", "banned"):
+            if field in self.body:
+                user[field] = self.body[field]
+        return HTTPStatus.OK, self.state.public_user(user)
+
+    def delete_user(self, user_id):
+        error = self._require_roles("ADMIN", "SUPER_ADMIN")
+        if error:
+            return error
+        user = self.state.users.pop(user_id, None)
+        if user is None:
+            return HTTPStatus.NOT_FOUND, {"message": "Пользователь не найден"}
+        return HTTPStatus.OK, self.state.public_user(user)
+
+    # ------------------------------------------------------------------ movies service
+    def _query_value(self, name, cast=str, default=None):
+        values = self.query.get(name)
+        return cast(values[0]) if values else default
+
+    def list_movies(self):
+        try:
+            page = max(self._query_value("page", int, 1), 1)
+            page_size = min(max(self._query_value("pageSize", int, 10), 1), MAX_PAGE_SIZE)
+            min_price = self._query_value("minPrice", int, 1)
+            max_price = self._query_value("maxPrice", int, 1000)
+            genre_id = self._query_value("genreId", int)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"message": "Invalid query parameters"}
+        locations = [loc for value in self.query.get("locations", ["MSK,SPB"]) for loc in value.split(",")]
+        published = self._query_value("published")
+        order = self._query_value("createdAt", default="desc")
+
+        movies = [
+            movie for movie in self.state.movies.values()
+            if min_price <= movie["price"] <= max_price
+            and movie["location"] in locations
+            and (genre_id is None or movie["genreId"] == genre_id)
+            and (published is None or str(movie["published"]).lower() == published.lower())
+        ]
+        movies.sort(key=lambda movie: movie["id"], reverse=order != "asc")
+        start = (page - 1) * page_size
+        return HTTPStatus.OK, {
+            "movies": movies[start:start + page_size],
+            "count": len(movies),
+            "page": page,
+            "pageSize": page_size,
+            "pageCount": max(math.ceil(len(movies) / page_size), 1),
+        }
+
+    def get_movie(self, movie_id):
+        movie = self.state.movies.get(int(movie_id))
+        if movie is None:
+            return HTTPStatus.NOT_FOUND, {"message": "Фильм не найден"}
+        return HTTPStatus.OK, movie
+
+    def create_movie(self, **kwargs):
+        error = self._require_roles("ADMIN", "SUPER_ADMIN")
+        if error:
+            return error
+        data = self.body
+        required = {"name": str, "price": int, "location": str, "published": bool, "genreId": int}
+        errors = [f"{field} is required" for field, kind in required.items() if not isinstance(data.get(field), kind)]
+        if errors:
+            return HTTPStatus.BAD_REQUEST, {"message": errors, "error": "Bad Request"}
+        if any(movie["name"] == data["name"] for movie in self.state.movies.values()):
+            return HTTPStatus.CONFLICT, {"message": "Фильм с таким названием уже существует"}
+        return HTTPStatus.CREATED, self.state.add_movie(data)
+
+    def delete_movie(self, movie_id):
+        error = self._require_roles("SUPER_ADMIN")
+        if error:
+            return error
+        movie = self.state.movies.pop(int(movie_id), None)
+        if movie is None:
+            return HTTPStatus.NOT_FOUND, {"message": "Фильм не найден"}
+        return HTTPStatus.OK, movie
+
+
+class FakeServices:
+    """
+    Local stand-in for the auth and movies services served from one in-process HTTP server.
+    Latency (plus random jitter) can be injected into every response.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, super_admin=None):
+        """
+        :param host: Interface to bind.
+        :param port: Port (0 - any free port).
+        :param latency: Delay added to every response, seconds.
+        :param jitter: Maximum random extra delay, seconds.
+        :param super_admin: Tuple (email, password) of the seeded SUPER_ADMIN.
+        """
+        self.server = ThreadingHTTPServer((host, port), FakeServicesHandler)
+        self.server.daemon_threads = True
+        self.server.state = FakeState(super_admin)
+        self.latency = latency
+        self.jitter = jitter
+        self._thread = None
+
+    @property
+    def latency(self):
+        return self.server.latency
+
+    @latency.setter
+    def latency(self, value):
+        self.server.latency = value
+
+    @property
+    def jitter(self):
+        return self.server.jitter
+
+    @jitter.setter
+    def jitter(self, value):
+        self.server.jitter = value
+
+    @property
+    def state(self):
+        return self.server.state
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _serve(queue, kwargs):
+    services = FakeServices(**kwargs)
+    queue.put(services.base_url)
+    services.server.serve_forever()
+
+
+class FakeServicesProcess:
+    """
+    FakeServices running in a separate process, so that the server CPU time
+    is not counted in the measurements of the client process (benchmarks).
+    """
+
+    def __init__(self, **kwargs):
+        """
+        :param kwargs: Arguments of FakeServices.
+        """
+        self.kwargs = kwargs
+        self.process = None
+        self.base_url = None
+
+    def start(self):
+        import multiprocessing
+
+        queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve, args=(queue, self.kwargs), daemon=True)
+        self.process.start()
+        self.base_url = queue.get(timeout=10)
+        return self
+
+    def stop(self):
+        self.process.terminate()
+        self.process.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
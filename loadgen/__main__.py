@@ -0,0 +1,49 @@
+"""
+Запуск нагрузки на существующих API-клиентах:
+
+    python -m loadgen loadgen.scenarios:browse_movies --mode open --stages 10:30,50:60
+    python -m loadgen loadgen.scenarios:browse_movies --mode closed --stages 5:30,20:60 --report load.json
+"""
+import argparse
+import importlib
+import logging
+
+from api.api_manager import ApiManager
+from loadgen.runner import LoadRunner, Stage
+from requester.transport import create_session
+
+
+def load_scenario(path):
+    module_name, function_name = path.split(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name), getattr(module, "setup", None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generation with ApiManager scenarios")
+    parser.add_argument("scenario", help="Scenario as module:function, e.g. loadgen.scenarios:browse_movies")
+    parser.add_argument("--mode", choices=("open", "closed"), default="open",
+                        help="open - fixed arrival rate (RPS), closed - N virtual users")
+    parser.add_argument("--stages", required=True,
+                        help="Comma separated target:duration pairs; target is RPS or users, e.g. 10:30,50:60")
+    parser.add_argument("--max-workers", type=int, default=100, help="Concurrent iterations limit in open mode")
+    parser.add_argument("--report", help="Path to the JSON report")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    scenario, setup = load_scenario(args.scenario)
+    context = setup(ApiManager(create_session())) if setup else None
+
+    runner = LoadRunner(scenario, context=context, max_workers=args.max_workers)
+    stages = Stage.parse(args.stages)
+    stats = runner.run_open(stages) if args.mode == "open" else runner.run_closed(stages)
+
+    print(stats.format_table())
+    if runner.late_arrivals:
+        print(f"Late arrivals (generator could not keep the rate): {runner.late_arrivals}")
+    if args.report:
+        stats.save(args.report)
+
+
+if __name__ == "__main__":
+    main()
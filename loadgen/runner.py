@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.api_manager import ApiManager
+from loadgen.stats import StatsCollector
+from requester import request_events
+from requester.transport import create_session
+
+
+class Stage:
+    """
+    Load stage: the target (RPS for open loop, virtual users for closed loop)
+    is reached linearly during the stage duration.
+    """
+
+    def __init__(self, target, duration):
+        self.target = target
+        self.duration = duration
+
+    @classmethod
+    def parse(cls, stages):
+        """
+        Parses "target:duration,target:duration", e.g. "10:30,50:60".
+        :return: List of Stage objects.
+        """
+        result = []
+        for part in stages.split(","):
+            target, duration = part.split(":")
+            result.append(cls(float(target), float(duration)))
+        return result
+
+
+def target_at(stages, elapsed):
+    """
+    Returns the target value at the moment `elapsed` seconds from the start (linear ramp).
+    :return: Target value or None when all stages are over.
+    """
+    previous = 0.0
+    for stage in stages:
+        if elapsed < stage.duration:
+            return previous + (stage.target - previous) * (elapsed / stage.duration)
+        elapsed -= stage.duration
+        previous = stage.target
+    return None
+
+
+class LoadRunner:
+    """
+    Runs a scenario built on ApiManager under load.
+    Open loop - iterations start at a fixed arrival rate regardless of response times,
+    closed loop - N virtual users repeat the scenario one iteration after another.
+    """
+
+    TICK = 0.005  # Шаг планировщика открытой модели, с
+
+    def __init__(self, scenario, context=None, max_workers=100, stats=None):
+        """
+        :param scenario: Callable(api_manager, context) with one scenario iteration.
+        :param context: Object passed to every iteration (e.g. tokens from setup).
+        :param max_workers: Maximum number of concurrent iterations in open loop.
+        :param stats: StatsCollector object.
+        """
+        self.scenario = scenario
+        self.context = context
+        self.max_workers = max_workers
+        self.stats = stats or StatsCollector()
+        self.late_arrivals = 0
+        self._local = threading.local()
+        self._sessions = []  # Сессии потоков, закрываются по окончании прогона
+        self._sessions_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _api_manager(self):
+        # У каждого потока своя сессия: requests.Session не рассчитан на общий доступ из потоков.
+        # Размыкатель цепи выключен: под нагрузкой он подменял бы ошибки сервиса мгновенными отказами.
+        # Ресурсы не регистрируются: реестр потока никто не очищает, а за прогон он вырос бы до миллионов записей
+        if not hasattr(self._local, "api_manager"):
+            session = create_session(retries=0)
+            with self._sessions_lock:
+                self._sessions.append(session)
+            self._local.api_manager = ApiManager(session, circuit_breaker=False, track_resources=False)
+        return self._local.api_manager
+
+    def _close_sessions(self):
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def _run_iteration(self, scheduled_at=None):
+        start = scheduled_at or time.perf_counter()
+        ok = True
+        try:
+            self.scenario(self._api_manager(), self.context)
+        except Exception as e:
+            ok = False
+            self.logger.debug(f"Scenario iteration failed: {type(e).__name__} - {e}")
+        # В открытой модели время считается от запланированного старта, чтобы учитывать очередь
+        self.stats.record_scenario(self.scenario.__name__, time.perf_counter() - start, ok)
+
+    def run_open(self, stages):
+        """
+        Starts iterations at the arrival rate (RPS) defined by the stages.
+        :param stages: List of Stage objects, target - iterations per second.
+        :return: StatsCollector object.
+        """
+        request_events.add_listener(self.stats)
+        start = last_tick = time.perf_counter()
+        due = 0.0  # Сколько итераций должно было стартовать к текущему моменту (интеграл RPS по времени)
+        launched = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    now = time.perf_counter()
+                    rate = target_at(stages, now - start)
+                    if rate is None:
+                        break
+                    due += rate * (now - last_tick)
+                    last_tick = now
+                    while launched + 1 <= due:
+                        # Все потоки заняты - итерация встанет в очередь, генератор не успевает за RPS
+                        if launched - self._completed() >= self.max_workers:
+                            self.late_arrivals += 1
+                        executor.submit(self._run_iteration, now)
+                        launched += 1
+                    time.sleep(self.TICK)
+        finally:
+            request_events.remove_listener(self.stats)
+            self._close_sessions()
+            self.stats.finish()
+        return self.stats
+
+    def _completed(self):
+        return sum(stats.count for stats in self.stats.scenarios.values())
+
+    def run_closed(self, stages):
+        """
+        Runs virtual users; the number of active users follows the stages.
+        :param stages: List of Stage objects, target - number of virtual users.
+        :return: StatsCollector object.
+        """
+        request_events.add_listener(self.stats)
+        start = time.perf_counter()
+
+        def virtual_user(index):
+            while True:
+                users = target_at(stages, time.perf_counter() - start)
+                if users is None:
+                    return
+                if index < round(users):
+                    self._run_iteration()
+                else:
+                    time.sleep(0.1)
+
+        max_users = int(max(stage.target for stage in stages))
+        try:
+            threads = [threading.Thread(target=virtual_user, args=(index,), daemon=True) for index in range(max_users)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            request_events.remove_listener(self.stats)
+            self._close_sessions()
+            self.stats.finish()
+        return self.stats
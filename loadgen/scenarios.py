@@ -0,0 +1,35 @@
+"""
+Примеры сценариев нагрузки. Сценарий - функция (api_manager, context) с одной итерацией,
+setup(api_manager) выполняется один раз перед запуском и возвращает context.
+"""
+import random
+
+from constants import AUTH_DATA
+from data_generator import DataGenerator
+
+
+def setup(api_manager):
+    response = api_manager.auth_api.login_user(AUTH_DATA)
+    return {"admin_token": response.json()["accessToken"]}
+
+
+def browse_movies(api_manager, context):
+    """Список фильмов с фильтром по цене и просмотр одного из них."""
+    min_price = random.randint(1, 900)
+    response = api_manager.movies_api.get_movies(params={"minPrice": min_price, "maxPrice": min_price + 100})
+    movies = response.json().get("movies", [])
+    if movies:
+        api_manager.movies_api.get_movie(random.choice(movies)["id"])
+
+
+def create_and_delete_movie(api_manager, context):
+    """Создание и удаление фильма супер-админом."""
+    response = api_manager.movies_api.create_movie(DataGenerator.generate_movie_data(), context["admin_token"])
+    api_manager.movies_api.delete_movie(response.json()["id"], context["admin_token"])
+
+
+def register_and_login(api_manager, context):
+    """Регистрация нового пользователя и вход."""
+    user_data = DataGenerator.generate_user_data()
+    api_manager.auth_api.register_user(user_data)
+    api_manager.auth_api.login_user({"email": user_data["email"], "password": user_data["password"]})
@@ -0,0 +1,114 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+
+from requester.metrics import percentile
+
+# Границы корзин гистограммы задержек, мс
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+
+
+class LatencyStats:
+    """
+    Counters and latencies of one endpoint or scenario.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latencies = []
+        self.histogram = dict.fromkeys(HISTOGRAM_BUCKETS_MS, 0)
+
+    def add(self, elapsed, ok=True):
+        """
+        :param elapsed: Latency in seconds.
+        :param ok: False if the call failed or returned an unexpected status.
+        """
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        latency_ms = elapsed * 1000
+        self.latencies.append(latency_ms)
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if latency_ms <= bound:
+                self.histogram[bound] += 1
+                break
+
+    def summary(self, duration):
+        """
+        :param duration: Duration of the run in seconds (for throughput).
+        :return: Dictionary with throughput, error rate and latency percentiles in ms.
+        """
+        values = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "rps": self.count / duration if duration else 0.0,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+            "histogram": {("inf" if math.isinf(bound) else str(bound)): count
+                          for bound, count in self.histogram.items()},
+        }
+
+
+class StatsCollector:
+    """
+    Request listener collecting statistics per "METHOD /templated/endpoint" and per scenario.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = defaultdict(LatencyStats)
+        self.scenarios = defaultdict(LatencyStats)
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def __call__(self, event):
+        with self._lock:
+            self.endpoints[event.name].add(event.elapsed, event.ok)
+
+    def record_scenario(self, name, elapsed, ok):
+        with self._lock:
+            self.scenarios[name].add(elapsed, ok)
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    @property
+    def duration(self):
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def report(self):
+        """
+        :return: Dictionary with the summaries of all endpoints and scenarios.
+        """
+        with self._lock:
+            return {
+                "duration": self.duration,
+                "endpoints": {name: stats.summary(self.duration) for name, stats in sorted(self.endpoints.items())},
+                "scenarios": {name: stats.summary(self.duration) for name, stats in sorted(self.scenarios.items())},
+            }
+
+    def format_table(self):
+        """
+        :return: Text table with throughput, errors and latency percentiles.
+        """
+        report = self.report()
+        header = f"{'name':<40} {'count':>8} {'err%':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        lines = [f"Duration: {report['duration']:.1f}s (latency in ms)", header, "-" * len(header)]
+        for section in ("scenarios", "endpoints"):
+            for name, row in report[section].items():
+                lines.append(
+                    f"{name:<40} {row['count']:>8} {row['error_rate'] * 100:>6.2f}% {row['rps']:>8.2f} "
+                    f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f} {row['max']:>8.1f}"
+                )
+        return "\n".join(lines)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
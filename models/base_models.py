@@ -1,8 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from enum import Enum
-from sqlalchemy import create_engine, Column, String, Boolean, DateTime, text, ForeignKey, Integer
-from sqlalchemy.orm import declarative_base, sessionmaker
 
 
 class UserRole(str, Enum):
@@ -47,40 +45,13 @@ class LoginData(BaseModel):
         return repeat_value
 
 
-Base = declarative_base()
-class UserDBModel(Base):
-    __tablename__ = 'users'
-    id = Column(String, primary_key=True)
-    email = Column(String)
-    full_name = Column(String)
-    password = Column(String)
-    created_at = Column(DateTime)
-    updated_at = Column(DateTime)
-    verified = Column(Boolean)
-    banned = Column(Boolean)
-    roles = Column(String)
+# ORM-модели вынесены в models.db_models; импорт SQLAlchemy происходит только при первом обращении к ним
+_DB_MODELS = ("Base", "UserDBModel", "GenreDBModel", "MovieDBModel", "AccountTransactionTemplate")
 
 
-class MovieDBModel(Base):
-    """
-    Модель для таблицы movies.
-    """
-    __tablename__ = 'movies'  # Имя таблицы в базе данных
+def __getattr__(name):
+    if name in _DB_MODELS:
+        from models import db_models
 
-    # Поля таблицы
-    id = Column(String, primary_key=True)  # Уникальный идентификатор фильма
-    name = Column(String, nullable=False)  # Название фильма
-    description = Column(String)  # Описание фильма
-    price = Column(Integer, nullable=False)  # Цена фильма
-    genre_id = Column(String, ForeignKey('genres.id'), nullable=False)  # Ссылка на жанр
-    image_url = Column(String)  # Ссылка на изображение
-    location = Column(String)  # Локация фильма (например, "MSK")
-    rating = Column(Integer)  # Рейтинг фильма
-    published = Column(Boolean)  # Опубликован ли фильм
-    created_at = Column(DateTime)  # Дата создания записи
-
-
-class AccountTransactionTemplate(Base):
-    __tablename__ = 'accounts_transaction_template'
-    user = Column(String, primary_key=True)
-    balance = Column(Integer, nullable=False)
\ No newline at end of file
+        return getattr(db_models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
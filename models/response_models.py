@@ -0,0 +1,53 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ResponseModel(BaseModel):
+    """
+    Базовая модель ответа API: неизвестные поля сохраняются, чтобы новые поля сервиса не ломали тесты.
+    """
+    model_config = ConfigDict(extra="allow", frozen=True)
+
+
+class Genre(ResponseModel):
+    name: str
+
+
+class Movie(ResponseModel):
+    id: int
+    name: str
+    price: int
+    description: Optional[str] = None
+    imageUrl: Optional[str] = None
+    location: Optional[str] = None
+    published: Optional[bool] = None
+    genreId: Optional[int] = None
+    genre: Optional[Genre] = None
+    rating: Optional[float] = None
+    createdAt: Optional[str] = None
+
+
+class MovieList(ResponseModel):
+    movies: List[Movie]
+    count: Optional[int] = None
+    page: Optional[int] = None
+    pageSize: Optional[int] = None
+    pageCount: Optional[int] = None
+
+
+class User(ResponseModel):
+    id: str
+    email: str
+    fullName: Optional[str] = None
+    roles: List[str] = []
+    verified: Optional[bool] = None
+    banned: Optional[bool] = None
+    createdAt: Optional[str] = None
+
+
+class LoginResponse(ResponseModel):
+    accessToken: str
+    refreshToken: Optional[str] = None
+    expiresIn: Optional[int] = None
+    user: Optional[User] = None
@@ -0,0 +1,33 @@
+"""
+Плагин pytest: дедлайны запросов на тест (TEST_DEADLINE или @pytest.mark.deadline(seconds)) и на весь прогон
+(SESSION_DEADLINE). По истечении дедлайна send_request падает с DeadlineExceeded, не отправляя запрос.
+"""
+import pytest
+
+from constants import TEST_DEADLINE, SESSION_DEADLINE
+from requester.deadline import deadline, set_session_deadline
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("deadlines", "Request deadlines")
+    group.addoption("--test-deadline", type=float, default=TEST_DEADLINE,
+                    help="Time budget for the requests of one test, seconds (0 - no limit)")
+    group.addoption("--session-deadline", type=float, default=SESSION_DEADLINE,
+                    help="Time budget for the requests of the whole run, seconds (0 - no limit)")
+
+
+def pytest_sessionstart(session):
+    seconds = session.config.getoption("--session-deadline")
+    set_session_deadline(seconds if seconds > 0 else None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("deadline")
+    seconds = marker.args[0] if marker is not None else item.config.getoption("--test-deadline")
+    if not seconds or seconds <= 0:
+        yield
+        return
+    # Дедлайн действует на тело теста; фикстуры (подготовка и очистка данных) живут по своим таймаутам
+    with deadline(seconds):
+        yield
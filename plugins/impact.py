@@ -0,0 +1,164 @@
+"""
+Плагин pytest: время и эндпоинты каждого теста сохраняются между прогонами (TEST_IMPACT_PATH).
+По этим данным воркеры xdist получают тесты от самых долгих к коротким (LPT), а --affected-endpoints
+оставляет только тесты, которые обращаются к указанным эндпоинтам.
+"""
+import os
+import time
+
+import pytest
+
+from constants import TEST_IMPACT_PATH
+from requester import request_events
+from utils.impact import ImpactData, lpt_order, parse_endpoint_patterns
+
+recorder_key = pytest.StashKey["ImpactRecorder"]()
+data_key = pytest.StashKey[ImpactData]()
+
+
+class ImpactRecorder:
+    """
+    Request listener collecting the endpoints of the running test and the results of this process.
+    A process runs one test at a time, so requests from helper threads are attributed to it as well.
+    """
+
+    def __init__(self):
+        self.current = None
+        self.endpoints = set()
+        self.skipped = False
+        self.results = []  # (test id, duration, endpoints)
+
+    def __call__(self, event):
+        if self.current is not None:
+            self.endpoints.add(event.name)
+
+
+def _group_name(item):
+    """Имя группы xdist_group в том виде, в каком его добавляет к nodeid pytest-xdist, или None."""
+    names = sorted({str(mark.args[0] if mark.args else mark.kwargs.get("name", "default"))
+                    for mark in item.iter_markers("xdist_group")})
+    return "_".join(names) or None
+
+
+def _test_id(item):
+    """nodeid теста без суффикса "@группа", который pytest-xdist добавляет в режиме loadgroup."""
+    group = _group_name(item)
+    if group and item.nodeid.endswith(f"@{group}"):
+        return item.nodeid[:-len(group) - 1]
+    return item.nodeid
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "Test durations, LPT ordering and impact-based selection")
+    group.addoption("--impact-store", default=TEST_IMPACT_PATH,
+                    help="JSON store with the duration and endpoints of every test (empty - do not use)")
+    group.addoption("--affected-endpoints", default=None,
+                    help='Run only tests touching these endpoints, e.g. "POST /movies, DELETE /user/*, /login"')
+    group.addoption("--test-order", choices=("auto", "lpt", "collection"), default="auto",
+                    help="lpt - longest tests first; auto - lpt on xdist workers only")
+
+
+def pytest_configure(config):
+    path = config.getoption("--impact-store")
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and "impact_data" in workerinput:
+        # Воркеры получают снимок хранилища от контроллера, чтобы порядок сбора у всех совпадал
+        data = ImpactData.from_dict(workerinput["impact_data"])
+    elif path and os.path.exists(path):
+        from utils.shared_store import SharedJsonStore
+
+        data = ImpactData.from_dict(SharedJsonStore(path).read())
+    else:
+        data = ImpactData()
+    config.stash[data_key] = data
+
+    recorder = ImpactRecorder()
+    config.stash[recorder_key] = recorder
+    request_events.add_listener(recorder)
+
+
+def pytest_unconfigure(config):
+    request_events.remove_listener(config.stash[recorder_key])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    pytest-xdist: передаём воркеру данные прошлых прогонов.
+    """
+    node.workerinput["impact_data"] = node.config.stash[data_key].to_dict()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Отбирает тесты по --affected-endpoints и упорядочивает их по убыванию длительности.
+    Работает до pytest-xdist, пока nodeid ещё без суффикса группы.
+    """
+    data = config.stash[data_key]
+
+    # Группа xdist_group - единица планирования: выбирается и выполняется целиком
+    units = {}
+    for item in items:
+        units.setdefault(_group_name(item) or _test_id(item), []).append(item)
+
+    affected = config.getoption("--affected-endpoints")
+    if affected:
+        patterns = parse_endpoint_patterns(affected)
+        selected_units = {name for name, unit in units.items()
+                          if any(data.affected(_test_id(item), patterns) for item in unit)}
+        deselected = [item for name, unit in units.items() if name not in selected_units for item in unit]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        units = {name: unit for name, unit in units.items() if name in selected_units}
+        items[:] = [item for item in items if (_group_name(item) or _test_id(item)) in selected_units]
+
+    order = config.getoption("--test-order")
+    if order == "collection" or not data.tests:
+        return
+    if order == "auto" and not hasattr(config, "workerinput"):
+        return
+    default = data.median_duration()
+    ordered = lpt_order({name: [_test_id(item) for item in unit] for name, unit in units.items()},
+                        lambda test_id: data.duration(test_id, default))
+    items[:] = [item for name in ordered for item in units[name]]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    recorder = item.config.stash[recorder_key]
+    recorder.current = item.nodeid
+    recorder.endpoints = set()
+    recorder.skipped = False
+    start = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start
+    if not recorder.skipped:
+        recorder.results.append((_test_id(item), duration, recorder.endpoints))
+    recorder.current = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    # Пропущенный тест ничего не говорит ни о длительности, ни об эндпоинтах
+    if outcome.get_result().skipped:
+        item.config.stash[recorder_key].skipped = True
+
+
+def pytest_sessionfinish(session, exitstatus):
+    recorder = session.config.stash[recorder_key]
+    path = session.config.getoption("--impact-store")
+    if not path or not recorder.results:
+        return
+
+    from utils.shared_store import SharedJsonStore
+
+    # Каждый воркер дописывает свои тесты под файловой блокировкой
+    with SharedJsonStore(path).transaction() as stored:
+        data = ImpactData.from_dict(stored)
+        for test_id, duration, endpoints in recorder.results:
+            data.update(test_id, duration, endpoints)
+        stored.clear()
+        stored.update(data.to_dict())
+    recorder.results.clear()
@@ -0,0 +1,90 @@
+"""
+Плагин pytest: метрики задержек send_request по эндпоинтам, JSON-артефакт и проверка регрессии p95.
+"""
+import json
+
+import pytest
+
+from constants import LATENCY_REPORT_PATH, LATENCY_REGRESSION_THRESHOLD
+from requester import request_events
+from requester.metrics import RequestMetrics, find_regressions
+
+metrics_key = pytest.StashKey[RequestMetrics]()
+regressions_key = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("latency", "Per-endpoint latency metrics")
+    group.addoption("--latency-report", default=LATENCY_REPORT_PATH,
+                    help="Path to the JSON report with per-endpoint metrics (empty - do not write)")
+    group.addoption("--latency-baseline", default=None,
+                    help="JSON report of a previous run; the run fails if p95 of an endpoint regresses")
+    group.addoption("--latency-threshold", type=float, default=LATENCY_REGRESSION_THRESHOLD,
+                    help="Allowed p95 growth compared to the baseline, percent")
+
+
+def pytest_configure(config):
+    metrics = RequestMetrics()
+    config.stash[metrics_key] = metrics
+    config.stash[regressions_key] = []
+    request_events.add_listener(metrics)
+
+
+def pytest_unconfigure(config):
+    request_events.remove_listener(config.stash[metrics_key])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    pytest-xdist: собираем метрики воркера на контроллере.
+    """
+    data = getattr(node, "workeroutput", {}).get("request_metrics")
+    if data:
+        node.config.stash[metrics_key].merge_dict(data)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    metrics = config.stash[metrics_key]
+
+    # Воркер xdist только передаёт сырые данные контроллеру
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["request_metrics"] = metrics.to_dict()
+        return
+
+    summary = metrics.summary()
+    if not summary:
+        return
+
+    report_path = config.getoption("--latency-report")
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"endpoints": summary}, f, indent=2)
+
+    baseline_path = config.getoption("--latency-baseline")
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f).get("endpoints", {})
+        regressions = find_regressions(summary, baseline, config.getoption("--latency-threshold"))
+        config.stash[regressions_key] = regressions
+        if regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    metrics = config.stash[metrics_key]
+    if hasattr(config, "workeroutput") or not metrics.endpoints:
+        return
+    terminalreporter.write_sep("-", "request latency per endpoint (ms)")
+    terminalreporter.write_line(metrics.format_table())
+
+    regressions = config.stash[regressions_key]
+    if regressions:
+        terminalreporter.write_sep("!", "p95 latency regressions", red=True)
+        for name, baseline_p95, current_p95 in regressions:
+            terminalreporter.write_line(
+                f"{name}: p95 {current_p95:.1f} ms vs baseline {baseline_p95:.1f} ms "
+                f"(threshold +{config.getoption('--latency-threshold'):.0f}%)", red=True
+            )
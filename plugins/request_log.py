@@ -0,0 +1,33 @@
+"""
+Плагин pytest: буфер запросов каждого теста (REQUEST_LOG_MODE=deferred) и вывод его в отчёт при падении теста.
+"""
+import pytest
+
+from requester.request_log import request_log
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """
+    Открывает пустой буфер запросов перед каждым тестом.
+    """
+    request_log.start(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    При падении теста прикладывает к отчёту запросы из буфера (режим REQUEST_LOG_MODE=deferred).
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and len(request_log):
+        report.sections.append((f"Captured requests {report.when}", request_log.render()))
+
+
+@pytest.fixture(scope="function")
+def captured_requests():
+    """
+    Фикстура, возвращающая буфер запросов текущего теста (render() - вывод по требованию).
+    """
+    return request_log
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import httpx
+
+from constants import HTTP_RETRY_TOTAL, HTTP_RETRY_STATUSES
+from requester import request_events
+from requester.cassette import get_cassette
+from requester.deadline import apply_deadline, DeadlineExceeded, remaining
+from requester.custom_requester import CustomRequester
+from requester.transport import IDEMPOTENT_METHODS, get_timeout, retry_delay
+
+
+class AsyncCustomRequester(CustomRequester):
+    """
+    Asynchronous counterpart of CustomRequester built on top of httpx.AsyncClient.
+    Keeps the same headers, expected_status semantics and curl-style logging,
+    so independent calls can be combined with asyncio.gather.
+    """
+
+    def __init__(self, session, base_url):
+        """
+        Initialize the async requester.
+        :param session: httpx.AsyncClient object.
+        :param base_url: Base URL for the API.
+        """
+        super().__init__(session=session, base_url=base_url)
+
+    async def send_request(self, method, endpoint, headers=None, data=None, params=None,
+                           expected_status=(200, 201), need_logging=True):
+        """
+        Universal coroutine for sending HTTP requests.
+        :param method: HTTP method (GET, POST, PUT, DELETE, etc.).
+        :param endpoint: API endpoint (e.g., "/login").
+        :param headers: Additional headers (e.g., with authorization token).
+        :param data: Request body (JSON data).
+        :param params: Query parameters.
+        :param expected_status: Expected HTTP status code (default (200, 201)).
+        :param need_logging: Flag to log the request/response (default True).
+        :return: httpx.Response object.
+        """
+        url = f"{self.base_url}{endpoint}"
+
+        # Merge base headers with any provided headers
+        request_headers = {**self.headers, **(headers or {})}
+
+        start = time.perf_counter()
+        response = None
+        try:
+            cassette = get_cassette()
+            if cassette is not None and cassette.mode == "replay":
+                response = cassette.replay(method, url, params, data, request_headers)
+            else:
+                response = await self._perform_request_async(method, url, endpoint, data, params, request_headers)
+                if cassette is not None:
+                    cassette.record(method, url, params, data, response.status_code, response.headers,
+                                    response.content, request_headers)
+
+            if need_logging:
+                self.handle_logging(response)
+
+            self.check_status(response, expected_status)
+        except Exception as error:
+            request_events.emit(request_events.RequestEvent(method, self.base_url, endpoint,
+                                                            time.perf_counter() - start, response, error,
+                                                            service=self.service))
+            raise
+        request_events.emit(request_events.RequestEvent(method, self.base_url, endpoint,
+                                                        time.perf_counter() - start, response,
+                                                        service=self.service))
+        return response
+
+    async def _perform_request_async(self, method, url, endpoint, data, params, request_headers):
+        """
+        Sends the request, retrying idempotent ones on 502/503, dropped connections and read timeouts
+        (the same conditions as urllib3 Retry of the sync session; connection errors are retried by httpx).
+        Every attempt gets the timeout shortened to the deadline, and no retry is started
+        if it would not finish before the deadline; the circuit breaker of the service counts the final outcome.
+        :return: httpx.Response object.
+        """
+        # Дедлайн проверяется до размыкателя: истёкший дедлайн теста - не отказ сервиса
+        timeout = apply_deadline(get_timeout(endpoint), f"{method} {endpoint}")
+        breaker = self.get_circuit_breaker()
+        if breaker is not None:
+            breaker.before_request()
+        retries = HTTP_RETRY_TOTAL if method.upper() in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                if attempt > 1:
+                    timeout = apply_deadline(get_timeout(endpoint), f"{method} {endpoint}")
+                connect_timeout, read_timeout = timeout
+                response = None
+                try:
+                    response = await self.session.request(
+                        method, url, json=data, params=params, headers=request_headers,
+                        timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+                except (httpx.ReadError, httpx.RemoteProtocolError, httpx.ReadTimeout):
+                    if attempt > retries:
+                        raise
+                else:
+                    if response.status_code not in HTTP_RETRY_STATUSES or attempt > retries:
+                        break
+                delay = retry_delay(attempt, response)
+                left = remaining()
+                if left is not None and left <= delay:
+                    raise DeadlineExceeded(f"Deadline exceeded while retrying {method} {url}")
+                await asyncio.sleep(delay)
+        except DeadlineExceeded:
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+        except Exception as error:
+            if breaker is not None:
+                breaker.record_failure(f"{method} {url}: {type(error).__name__}")
+            raise
+        except BaseException:
+            # Отмена задачи (CancelledError) не должна оставлять полуоткрытую цепь с занятой пробой
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.record_failure(f"{method} {url}: {response.status_code}")
+            else:
+                breaker.record_success()
+        return response
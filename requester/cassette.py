@@ -0,0 +1,306 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from constants import HTTP_CASSETTE_MODE, HTTP_CASSETTE_PATH, CASSETTE_DYNAMIC_FIELDS
+
+_MASK = "<dynamic>"
+_REDACTED = "<redacted>"
+# Секреты не попадают в журнал: пароли заменяются заглушкой, у токенов отрезается подпись
+_SECRET_FIELDS = frozenset(("password", "passwordRepeat"))
+_TOKEN_FIELDS = frozenset(("accessToken",))
+_KEY_LENGTH = 16
+# PYTEST_CURRENT_TEST: "<nodeid>[@группа xdist loadgroup] (setup|call|teardown)"
+_CURRENT_TEST = re.compile(r"^(?P<nodeid>.*?)(@[^/\[\]\s()]*)?( \((?P<phase>setup|call|teardown)\))?$")
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised in replay mode when the cassette has no matching interaction.
+    """
+
+
+def _normalize(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _mask(body, dynamic_fields, seen=None):
+    """
+    Replaces values of dynamic fields with placeholders; equal values get the same placeholder,
+    so e.g. a registration with mismatching password and passwordRepeat keeps its own key.
+    """
+    seen = {} if seen is None else seen
+    if isinstance(body, dict):
+        return {k: seen.setdefault(_normalize(v), f"{_MASK}{len(seen)}") if k in dynamic_fields
+                else _mask(v, dynamic_fields, seen)
+                for k, v in body.items()}
+    if isinstance(body, list):
+        return [_mask(item, dynamic_fields, seen) for item in body]
+    return body
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {k: _REDACTED if k in _SECRET_FIELDS and v is not None
+                else _strip_signature(v) if k in _TOKEN_FIELDS
+                else _redact(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _strip_signature(token):
+    """
+    Keeps the header and the claims of a JWT (the caller identity stays readable in replay),
+    but drops the signature, so the journal holds no usable credential.
+    """
+    if isinstance(token, str) and token.count(".") == 2:
+        header, payload, _ = token.split(".")
+        return f"{header}.{payload}.{_REDACTED}"
+    return _REDACTED if token is not None else None
+
+
+def caller_identity(headers):
+    """
+    Normalized identity of the caller taken from the bearer token: roles, or the user id without roles.
+    Requests differing only by the token of one role get the same identity in record and replay.
+    :param headers: Request headers.
+    :return: String like "roles:ADMIN", "user:<id>", "bearer" (not a JWT) or "anonymous".
+    """
+    from utils.token_cache import TokenCache
+
+    authorization = next((value for key, value in (headers or {}).items() if key.lower() == "authorization"), "")
+    if not authorization:
+        return "anonymous"
+    claims = TokenCache.decode_claims(authorization.split(" ", 1)[-1]) or {}
+    roles = claims.get("roles", claims.get("role"))
+    if roles:
+        return "roles:" + ",".join(sorted([roles] if isinstance(roles, str) else map(str, roles)))
+    if claims.get("id") or claims.get("sub"):
+        return f"user:{claims.get('id') or claims.get('sub')}"
+    return "bearer"
+
+
+def current_test():
+    """
+    The running test (the same with and without pytest-xdist) and its phase.
+    :return: Tuple (node id, "setup"/"call"/"teardown"); ("", "") outside of a test.
+    """
+    match = _CURRENT_TEST.match(os.environ.get("PYTEST_CURRENT_TEST", ""))
+    return match.group("nodeid"), match.group("phase") or ""
+
+
+def make_keys(method, url, params, body, dynamic_fields=CASSETTE_DYNAMIC_FIELDS, headers=None):
+    """
+    Builds the lookup keys of an interaction, from the strictest to the loosest:
+    exact body, body with dynamic fields masked, and templated path (ids replaced) with masked body.
+    Every key includes the caller identity (see caller_identity), so the same request made by
+    different roles is never mixed up. Only the URL path is used, so a cassette recorded on one host
+    can be replayed with another.
+    :return: Tuple (exact_key, loose_key, template_key) of hex digests.
+    """
+    from requester.request_events import template_endpoint
+
+    path = urlsplit(url).path
+    prefix = f"{method.upper()} {caller_identity(headers)}"
+    params_part = _normalize(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    masked = _normalize(_mask(body, dynamic_fields))
+    keys = (f"{prefix} {path} {params_part} {_normalize(body)}",
+            f"{prefix} {path} {params_part} {masked}",
+            f"{prefix} {template_endpoint(path)} {params_part} {masked}")
+    return tuple(hashlib.sha1(key.encode("utf-8")).hexdigest()[:_KEY_LENGTH] for key in keys)
+
+
+class Cassette:
+    """
+    Append-only journal of HTTP interactions.
+    Every line starts with the keys of make_keys scoped to the test and phase that sent the request
+    (see _keys): "<key>\\t...\\t<key>\\t<json>", so the replay index is built from the line prefixes without
+    parsing JSON, and the file is memory-mapped instead of loaded whole. On every level of strictness a request
+    is looked up among the interactions of its own test first, so the run order of tests (e.g. on xdist
+    workers) does not matter; interactions with the same key are served in the recorded order,
+    the last one is repeated.
+    Values of dynamic fields substituted in a replayed response are remembered and substituted
+    in all later responses too (e.g. the name of a created movie in GET /movies/{id}).
+    """
+
+    def __init__(self, path, mode, dynamic_fields=CASSETTE_DYNAMIC_FIELDS):
+        """
+        :param path: Path to the journal.
+        :param mode: "record" or "replay".
+        :param dynamic_fields: Body fields ignored when an exact match is not found.
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self.dynamic_fields = dynamic_fields
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        self._indexes = tuple(defaultdict(deque) for _ in range(9))
+        self._last = {}
+        self._used = set()
+        self._substitutions = {}  # Записанное значение динамического поля -> значение этого прогона
+        if mode == "record":
+            from filelock import FileLock
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+            # Воркеры xdist дописывают в один файл, строки не должны перемешиваться
+            self._file_lock = FileLock(f"{self.path}.lock")
+        elif mode == "replay":
+            self._build_index()
+        else:
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+
+    def _keys(self, method, url, params, body, headers):
+        """
+        Keys of make_keys, each one scoped to the test and phase, to the phase only and global.
+        Requests of session fixtures run in the setup of whichever test needs them first,
+        so in replay they are found among the recorded setup requests of other tests.
+        """
+        test, phase = current_test()
+        scopes = (f"{test} ({phase})", f"({phase})")
+        keys = []
+        for key in make_keys(method, url, params, body, self.dynamic_fields, headers):
+            keys.extend(hashlib.sha1(f"{scope} {key}".encode("utf-8")).hexdigest()[:_KEY_LENGTH] for scope in scopes)
+            keys.append(key)
+        return tuple(keys)
+
+    # ------------------------------------------------------------------ record
+    def record(self, method, url, params, body, status_code, headers, content, request_headers=None):
+        """
+        Appends an interaction to the journal; passwords and token signatures are redacted.
+        :param headers: Response headers.
+        :param request_headers: Request headers (the caller identity is taken from Authorization).
+        """
+        keys = self._keys(method, url, params, body, request_headers)
+        text = content.decode("utf-8", errors="replace")
+        try:
+            text = json.dumps(_redact(json.loads(text)), ensure_ascii=False)
+        except ValueError:
+            pass
+        entry = {
+            "m": method.upper(), "u": url, "p": params, "b": _redact(body), "s": status_code,
+            "h": {k: v for k, v in headers.items() if k.lower() in ("content-type", "etag", "last-modified")},
+            "c": text,
+        }
+        line = "\t".join((*keys, json.dumps(entry, ensure_ascii=False, separators=(',', ':')))) + "\n"
+        with self._lock, self._file_lock:
+            self._file.write(line.encode("utf-8"))
+            self._file.flush()
+
+    # ------------------------------------------------------------------ replay
+    def _build_index(self):
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            raise CassetteMissError(f"Cassette {self.path} is empty or does not exist, record it first")
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        position = 0
+        size = len(self._mmap)
+        step = _KEY_LENGTH + 1
+        while position < size:
+            end = self._mmap.find(b"\n", position)
+            end = size if end == -1 else end
+            offset = (position + step * len(self._indexes), end)
+            for number, index in enumerate(self._indexes):
+                start = position + step * number
+                index[self._mmap[start:start + _KEY_LENGTH].decode("ascii")].append(offset)
+            position = end + 1
+
+    def _take(self, index, key):
+        # Одна запись лежит и в точном, и в нестрогом индексе - пропускаем уже выданные
+        queue = index.get(key)
+        while queue:
+            offset = queue.popleft()
+            if offset not in self._used:
+                return offset
+        return None
+
+    def replay(self, method, url, params, body, headers):
+        """
+        Returns the recorded response for the request.
+        :return: requests.Response object.
+        """
+        keys = self._keys(method, url, params, body, headers)
+        with self._lock:
+            offset = None
+            for index, key in zip(self._indexes, keys):
+                offset = self._take(index, key)
+                if offset is not None:
+                    break
+            if offset is None:
+                offset = next((self._last[key] for key in keys if key in self._last), None)
+            if offset is None:
+                raise CassetteMissError(f"No recorded interaction for {method.upper()} {url} "
+                                        f"({caller_identity(headers)}) params={params} body={body}")
+            self._used.add(offset)
+            for key in keys:
+                self._last[key] = offset
+            entry = json.loads(self._mmap[offset[0]:offset[1]].decode("utf-8"))
+            content = self._substitute_dynamic(entry["c"], entry["b"], body)
+        return self._build_response(entry, content, method, url, params, body, headers)
+
+    def _substitute_dynamic(self, content, recorded_body, body):
+        """
+        Replaces recorded values of dynamic fields in the response with the current ones
+        (e.g. the echoed movie name generated by Faker in this run) and remembers the pairs
+        for the following responses.
+        """
+        if isinstance(recorded_body, dict) and isinstance(body, dict):
+            for field in self.dynamic_fields:
+                old, new = recorded_body.get(field), body.get(field)
+                if isinstance(old, str) and isinstance(new, str) and old not in (new, _REDACTED):
+                    self._substitutions[json.dumps(old, ensure_ascii=False)[1:-1]] = \
+                        json.dumps(new, ensure_ascii=False)[1:-1]
+        for old, new in self._substitutions.items():
+            if old in content:
+                content = content.replace(old, new)
+        return content
+
+    def _build_response(self, entry, content, method, url, params, body, headers):
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        response = requests.Response()
+        response.status_code = entry["s"]
+        response.headers = CaseInsensitiveDict(entry["h"])
+        response._content = content.encode("utf-8")
+        # Тело уже прочитано: iter_content отдаёт его кусками, как у потокового ответа
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = url
+        response.elapsed = timedelta(0)
+        response.request = requests.Request(method, url, params=params, json=body, headers=headers).prepare()
+        response.from_cassette = True
+        return response
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._mmap is not None:
+            self._mmap.close()
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """
+    Returns the process-wide cassette for HTTP_CASSETTE_MODE or None when the mode is off.
+    """
+    global _cassette
+    if not HTTP_CASSETTE_MODE:
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(HTTP_CASSETTE_PATH, HTTP_CASSETTE_MODE)
+        return _cassette
@@ -0,0 +1,103 @@
+import threading
+import time
+
+from constants import CIRCUIT_BREAKER_ENABLED, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_RESET_TIMEOUT
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Raised instead of sending a request to a service whose circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one service (base URL).
+    After `failure_threshold` consecutive connection errors or 5xx responses the circuit opens and
+    requests fail immediately; after `reset_timeout` one probe request is let through (half-open):
+    its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, name, failure_threshold=CIRCUIT_BREAKER_THRESHOLD, reset_timeout=CIRCUIT_BREAKER_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        """
+        :param name: Service name for error messages (base URL).
+        :param failure_threshold: Number of consecutive failures opening the circuit.
+        :param reset_timeout: Seconds before a probe request is allowed.
+        :param clock: Time source (monotonic seconds).
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error = None
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Lets the request through or raises CircuitOpenError.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_in = self._opened_at + self.reset_timeout - self.clock()
+            if self.state == OPEN and retry_in <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(
+                f"Circuit for {self.name} is open after {self.failures} consecutive failures "
+                f"(last: {self.last_error}); next probe in {max(retry_in, 0):.1f}s"
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """
+        Frees the probe slot without changing the state: the request ended for a reason that says nothing
+        about the service (deadline of the test, cancellation), so the next request may probe instead.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, error):
+        """
+        :param error: Description of the failure (exception or status) for the error message.
+        """
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = self.clock()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(base_url):
+    """
+    Returns the process-wide circuit breaker of the service or None if CIRCUIT_BREAKER_ENABLED is off.
+    :param base_url: Base URL of the service.
+    """
+    if not CIRCUIT_BREAKER_ENABLED or not base_url:
+        return None
+    with _breakers_lock:
+        if base_url not in _breakers:
+            _breakers[base_url] = CircuitBreaker(base_url)
+        return _breakers[base_url]
@@ -1,8 +1,18 @@
 import requests
 from http import HTTPStatus
 from enums.colors import RED, GREEN, RESET
+from constants import REQUEST_LOG_MODE, STREAM_CHUNK_SIZE
+from requester import request_events
+from requester.cassette import get_cassette
+from requester.circuit_breaker import get_circuit_breaker
+from requester.deadline import apply_deadline
+from requester.json_stream import JsonArrayStream
+from requester.request_log import request_log
+from requester.response_cache import ResponseCache
+from requester.transport import get_timeout
 import logging
 import os
+import time
 
 
 class CustomRequester:
@@ -21,6 +31,26 @@ class CustomRequester:
         self.session = session
         self.headers = self.base_headers.copy()
         self.logger = logging.getLogger(__name__)
+        self.cleanup_registry = None  # CleanupRegistry, куда записываются созданные ресурсы
+        self.response_cache = None  # ResponseCache для GET-запросов (включается через enable_response_cache)
+        self.circuit_breaker_enabled = True  # False - без размыкателя цепи (например, для нагрузочных прогонов)
+        self.service = None  # Имя сервиса в метриках; задают API-классы, у прочих клиентов метрики не сравниваются
+
+    def get_circuit_breaker(self):
+        """
+        Returns the circuit breaker of the service or None if it is off for this client or globally.
+        :return: CircuitBreaker object or None.
+        """
+        return get_circuit_breaker(self.base_url) if self.circuit_breaker_enabled else None
+
+    def enable_response_cache(self, cache=None):
+        """
+        Turns on the client-side cache of GET responses.
+        :param cache: ResponseCache object (a new one with default settings if not passed).
+        :return: Used ResponseCache object.
+        """
+        self.response_cache = cache or ResponseCache()
+        return self.response_cache
 
     def send_request(self, method, endpoint, headers=None, data=None, params=None,
                      expected_status=(200, 201), need_logging=True):
@@ -40,11 +70,148 @@ class CustomRequester:
         # Merge base headers with any provided headers
         request_headers = {**self.headers, **(headers or {})}
 
-        response = self.session.request(method, url, json=data, params=params, headers=request_headers)
+        start = time.perf_counter()
+        response = None
+        from_cache = False
+        try:
+            if self.response_cache is not None and method.upper() == "GET":
+                response, from_cache = self._send_cached(method, url, endpoint, params, request_headers,
+                                                         need_logging)
+            else:
+                response = self._perform_request(method, url, endpoint, data, params, request_headers)
+                if need_logging:
+                    self.handle_logging(response)
+                # Изменение ресурса делает устаревшими его закэшированные GET-ответы
+                if self.response_cache is not None and response.status_code < 400:
+                    self.response_cache.invalidate(url)
+
+            self.check_status(response, expected_status)
+        except Exception as error:
+            request_events.emit(request_events.RequestEvent(method, self.base_url, endpoint,
+                                                            time.perf_counter() - start, response, error,
+                                                            from_cache, service=self.service))
+            raise
+        request_events.emit(request_events.RequestEvent(method, self.base_url, endpoint,
+                                                        time.perf_counter() - start, response,
+                                                        from_cache=from_cache, service=self.service))
+        return response
+
+    def stream_request(self, method, endpoint, key=None, headers=None, data=None, params=None,
+                       expected_status=(200, 201), need_logging=True, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Sends the request with stream=True and yields the elements of a JSON array of the body one by one,
+        without loading the whole body: memory is bounded by one element and one chunk.
+        The request is sent on the first iteration; the connection is released when the generator
+        is exhausted or closed (break, contextlib.closing), so the caller can stop early.
+        :param method: HTTP method.
+        :param endpoint: API endpoint (e.g., "/movies").
+        :param key: Top-level key of the array (e.g. "movies"); None - the body itself is an array.
+        :param headers: Additional headers.
+        :param data: Request body (JSON data).
+        :param params: Query parameters.
+        :param expected_status: Expected HTTP status code (default (200, 201)).
+        :param need_logging: Flag to log the request (the body of a successful response is never logged).
+        :param chunk_size: Size of the body chunks read from the socket, bytes.
+        :return: Generator of parsed array elements.
+        """
+        url = f"{self.base_url}{endpoint}"
+        request_headers = {**self.headers, **(headers or {})}
+
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._perform_request(method, url, endpoint, data, params, request_headers, stream=True)
+            if response.status_code not in expected_status:
+                # Тело ошибки невелико: читаем его до закрытия ответа, иначе в логе (и отложенном отчёте) оно пустое
+                response.content
+            if need_logging:
+                self.handle_logging(response)
+            self.check_status(response, expected_status)
+        except Exception as error:
+            if response is not None:
+                response.close()
+            request_events.emit(request_events.RequestEvent(method, self.base_url, endpoint,
+                                                            time.perf_counter() - start, response, error,
+                                                            service=self.service))
+            raise
+        # Задержка считается до заголовков ответа: дальше тело читается в темпе вызывающего кода
+        request_events.emit(request_events.RequestEvent(method, self.base_url, endpoint,
+                                                        time.perf_counter() - start, response,
+                                                        service=self.service))
+        try:
+            yield from JsonArrayStream(response.iter_content(chunk_size), key)
+        finally:
+            response.close()
+
+    def _perform_request(self, method, url, endpoint, data, params, request_headers, stream=False):
+        """
+        Sends the request over the network
+        (or serves it from the cassette in HTTP_CASSETTE_MODE=replay).
+        The timeout is shortened to the test/session deadline; the request is not sent at all
+        if the deadline has passed or the circuit of the service is open.
+        :param stream: Do not read the body right away (requests stream=True).
+        :return: requests.Response object.
+        """
+        cassette = get_cassette()
+        if cassette is not None and cassette.mode == "replay":
+            return cassette.replay(method, url, params, data, request_headers)
+
+        timeout = apply_deadline(get_timeout(endpoint), f"{method} {endpoint}")
+        breaker = self.get_circuit_breaker()
+        if breaker is not None:
+            breaker.before_request()
+
+        try:
+            response = self.session.request(method, url, json=data, params=params, headers=request_headers,
+                                            timeout=timeout, stream=stream)
+        except Exception as error:
+            if breaker is not None:
+                breaker.record_failure(f"{method} {endpoint}: {type(error).__name__}")
+            raise
+        if breaker is not None:
+            # 5xx - сервис нездоров, 4xx - сервис отвечает, значит цепь можно держать замкнутой
+            if response.status_code >= 500:
+                breaker.record_failure(f"{method} {endpoint}: {response.status_code}")
+            else:
+                breaker.record_success()
+        # Признак переиспользования keep-alive ставит соединение, по которому пришёл ответ (TrackingHTTPAdapter)
+        response.connection_reused = getattr(response.raw, "connection_reused", None)
+
+        # В режиме записи тело читается целиком даже для потоковых запросов: журналу нужен весь ответ
+        if cassette is not None:
+            cassette.record(method, url, params, data, response.status_code, response.headers, response.content,
+                            request_headers)
+        return response
 
+    def _send_cached(self, method, url, endpoint, params, request_headers, need_logging):
+        """
+        Serves a GET request from the response cache, revalidating stale entries.
+        :return: Tuple (requests.Response object, True if served without a request).
+        """
+        cache = self.response_cache
+        key = cache.make_key(url, params, request_headers)
+        entry = cache.lookup(key)
+        if entry is not None and cache.is_fresh(entry):
+            return cache.hit(entry), True
+
+        conditional_headers = cache.conditional_headers(entry)
+        response = self._perform_request(method, url, endpoint, None, params,
+                                         {**request_headers, **conditional_headers})
         if need_logging:
-            self.log_request_and_response(response)
+            self.handle_logging(response)
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED and entry is not None:
+            return cache.revalidated(entry), False
+        cache.store(key, response)
+        return response, False
 
+    @staticmethod
+    def check_status(response, expected_status):
+        """
+        Raises ValueError if the response status is not among the expected ones.
+        :param response: Response object.
+        :param expected_status: Expected HTTP status code or a collection of codes.
+        """
         # Подготовка строки с ожидаемыми статусами
         if isinstance(expected_status, (list, tuple)):
             expected_phrase = ", ".join(f"{s} ({HTTPStatus(s).phrase})" for s in expected_status)
@@ -57,7 +224,16 @@ class CustomRequester:
                 f"Expected: {expected_phrase}"
             )
 
-        return response
+    def handle_logging(self, response):
+        """
+        Logs the response right away or, in deferred mode, only stores a reference to it
+        in the per-test ring buffer (rendered when the test fails).
+        :param response: Response object.
+        """
+        if REQUEST_LOG_MODE == "deferred":
+            request_log.capture(response)
+        else:
+            self.log_request_and_response(response)
 
     def log_request_and_response(self, response):
         """
@@ -65,29 +241,49 @@ class CustomRequester:
         :param response: Response object.
         """
         try:
-            request = response.request
-            headers = " \\\n".join([f"-H '{header}: {value}'" for header, value in request.headers.items()])
-            full_test_name = f"pytest {os.environ.get('PYTEST_CURRENT_TEST', '').replace(' (call)', '')}"
-
-            body = ""
-            if hasattr(request, 'body') and request.body is not None:
-                if isinstance(request.body, bytes):
-                    body = request.body.decode('utf-8')
-                body = f"-d '{body}' \n" if body != '{}' else ''
-
-            self.logger.info(
-                f"{GREEN}{full_test_name}{RESET}\n"
-                f"curl -X {request.method} '{request.url}' \\\n"
-                f"{headers} \\\n"
-                f"{body}"
-            )
+            self.logger.info(self.format_request(response))
 
-            response_status = response.status_code
-            is_success = response.ok
-            response_data = response.text
-            if not is_success:
-                self.logger.info(f"\tRESPONSE:"
-                                 f"\nSTATUS_CODE: {RED}{response_status}{RESET}"
-                                 f"\nDATA: {RED}{response_data}{RESET}")
+            if response.status_code >= 400:
+                self.logger.info(self.format_response(response))
         except Exception as e:
             self.logger.info(f"\nLogging went wrong: {type(e)} - {e}")
+
+    @staticmethod
+    def format_request(response, test_name=None):
+        """
+        Builds a curl command for the request of the response.
+        :param response: Response object.
+        :param test_name: Test name; taken from PYTEST_CURRENT_TEST if not passed.
+        :return: String with the test name and the curl command.
+        """
+        request = response.request
+        headers = " \\\n".join([f"-H '{header}: {value}'" for header, value in request.headers.items()])
+        if test_name is None:
+            test_name = os.environ.get('PYTEST_CURRENT_TEST', '').replace(' (call)', '')
+        full_test_name = f"pytest {test_name}"
+
+        # requests хранит тело в request.body, httpx - в request.content
+        raw_body = request.body if hasattr(request, 'body') else getattr(request, 'content', None)
+        body = ""
+        if raw_body:
+            if isinstance(raw_body, bytes):
+                body = raw_body.decode('utf-8')
+            body = f"-d '{body}' \n" if body != '{}' else ''
+
+        return (
+            f"{GREEN}{full_test_name}{RESET}\n"
+            f"curl -X {request.method} '{request.url}' \\\n"
+            f"{headers} \\\n"
+            f"{body}"
+        )
+
+    @staticmethod
+    def format_response(response):
+        """
+        Builds a text with the response status and body.
+        :param response: Response object.
+        :return: String with the response details.
+        """
+        return (f"\tRESPONSE:"
+                f"\nSTATUS_CODE: {RED}{response.status_code}{RESET}"
+                f"\nDATA: {RED}{response.text}{RESET}")
@@ -0,0 +1,75 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Дедлайн текущего теста (или другого блока кода); asyncio-задачи наследуют его автоматически
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+# Дедлайн всего прогона - общий для всех потоков процесса
+_session_deadline = None
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised before a request when the test or session deadline has already passed.
+    """
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Limits the time of all requests sent inside the block; nested deadlines can only shorten it.
+    :param seconds: Time budget of the block, seconds.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def set_session_deadline(seconds):
+    """
+    Sets the process-wide deadline (None - no deadline).
+    :param seconds: Time budget from now, seconds.
+    """
+    global _session_deadline
+    _session_deadline = None if seconds is None else time.monotonic() + seconds
+
+
+def remaining():
+    """
+    Returns the seconds left until the nearest deadline or None if there is no deadline.
+    """
+    deadlines = [value for value in (_deadline.get(), _session_deadline) if value is not None]
+    if not deadlines:
+        return None
+    return min(deadlines) - time.monotonic()
+
+
+def apply_deadline(timeout, description=""):
+    """
+    Fails fast if the deadline has passed, otherwise shortens the (connect, read) timeout to the time left.
+    :param timeout: Tuple (connect_timeout, read_timeout).
+    :param description: Request description for the error message.
+    :return: Tuple (connect_timeout, read_timeout).
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {description}".strip())
+    connect_timeout, read_timeout = timeout
+    return min(connect_timeout, left), min(read_timeout, left)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor running every task in a copy of the submitting thread's context,
+    so the deadline of the test reaches requests sent from the pool threads.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -0,0 +1,142 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonArrayStream:
+    """
+    Incremental parser of a JSON array inside a streamed response body.
+    Only the current element and the unparsed tail of the last chunk are kept in memory: each element is
+    decoded with json.JSONDecoder.raw_decode as soon as it is complete and yielded right away.
+    The other top-level fields of the object (e.g. "count", "pageCount") are collected into `meta`.
+    """
+
+    def __init__(self, chunks, key=None):
+        """
+        :param chunks: Iterable of body chunks (bytes or str), e.g. response.iter_content(STREAM_CHUNK_SIZE).
+        :param key: Top-level key of the array (e.g. "movies"); None - the body itself is an array.
+        """
+        self.key = key
+        self.meta = {}
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        if self.key is None:
+            yield from self._array()
+            self._expect_end()
+            return
+
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            self._expect_end()
+            return
+        while True:
+            name = self._value()
+            if not isinstance(name, str):
+                raise ValueError(f"Expected an object key, got {name!r}")
+            self._expect(":")
+            if name == self.key:
+                yield from self._array()
+            else:
+                self.meta[name] = self._value()
+            separator = self._next_char()
+            if separator == "}":
+                break
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' after the value of {name!r}, got {separator!r}")
+        self._expect_end()
+
+    def _array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._next_char()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in the array, got {separator!r}")
+
+    def _value(self):
+        """
+        Decodes the next complete value, reading more chunks while it is cut off.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # Число в конце буфера ("12" или "1.", "1e") может продолжиться в следующем чанке
+            if (end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS) and self._read():
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self):
+        """
+        Skips whitespace and returns the next character without consuming it ("" at the end of the body).
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def _next_char(self):
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, expected):
+        char = self._next_char()
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} in the JSON stream, got {char!r}")
+
+    def _expect_end(self):
+        char = self._peek()
+        if char:
+            raise ValueError(f"Unexpected data after the JSON value: {char!r}")
+
+    def _read(self):
+        """
+        Appends the next chunk to the buffer, dropping the already parsed part.
+        :return: False if the body is exhausted.
+        """
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        self._eof = True
+        tail = self._utf8.decode(b"", final=True)
+        self._buffer = self._buffer[self._pos:] + tail
+        self._pos = 0
+        return bool(tail)
+
+
+def iter_json_array(chunks, key=None):
+    """
+    Yields elements of a JSON array from a chunked body (see JsonArrayStream).
+    :param chunks: Iterable of body chunks.
+    :param key: Top-level key of the array; None - the body itself is an array.
+    :return: Generator of parsed elements.
+    """
+    return iter(JsonArrayStream(chunks, key))
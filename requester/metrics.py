@@ -0,0 +1,164 @@
+import math
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile.
+    :param sorted_values: Sorted list of values.
+    :param percent: Percentile (0-100).
+    :return: Value or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class EndpointMetrics:
+    """
+    Timings and traffic of one "service METHOD /templated/endpoint".
+    Latency percentiles are built from successful requests only, failed ones are counted in `errors`.
+    """
+
+    def __init__(self):
+        self.gated = False  # Запросы API-клиента сервиса: только они проверяются на регрессию p95
+        self.latencies = []  # мс
+        self.ttfbs = []  # мс
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.reused = 0
+        self.new_connections = 0
+
+    def add(self, event):
+        self.gated = self.gated or event.service is not None
+        if event.ok:
+            self.latencies.append(event.elapsed * 1000)
+            if event.ttfb is not None:
+                self.ttfbs.append(event.ttfb * 1000)
+        else:
+            # Время ошибки (таймаут, отказ соединения, дедлайн) говорит не о скорости сервиса
+            self.errors += 1
+        self.bytes_in += event.bytes_in
+        self.bytes_out += event.bytes_out
+        if event.connection_reused is True:
+            self.reused += 1
+        elif event.connection_reused is False:
+            self.new_connections += 1
+
+    def to_dict(self):
+        """
+        :return: Raw data (used to merge results of xdist workers).
+        """
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        metrics = cls()
+        vars(metrics).update(data)
+        return metrics
+
+    def merge(self, other):
+        self.gated = self.gated or other.gated
+        self.latencies.extend(other.latencies)
+        self.ttfbs.extend(other.ttfbs)
+        for field in ("errors", "bytes_in", "bytes_out", "reused", "new_connections"):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        ttfbs = sorted(self.ttfbs)
+        return {
+            "count": len(latencies) + self.errors,
+            "errors": self.errors,
+            "gated": self.gated,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+            "ttfb_p50": percentile(ttfbs, 50),
+            "ttfb_p95": percentile(ttfbs, 95),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "connections_reused": self.reused,
+            "connections_new": self.new_connections,
+        }
+
+
+class RequestMetrics:
+    """
+    Request listener (see requester.request_events) grouping metrics by service, method and templated endpoint.
+    Requests of other clients (e.g. unit tests against local servers) are grouped by host and never gated.
+    """
+
+    @staticmethod
+    def key(event):
+        """
+        :return: Bucket name, e.g. "movies GET /movies/{id}" or "127.0.0.1:8080 GET /movies".
+        """
+        service = event.service or urlsplit(event.base_url or "").netloc or "unknown"
+        return f"{service} {event.name}"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = defaultdict(EndpointMetrics)
+
+    def __call__(self, event):
+        if event.from_cache:
+            return
+        with self._lock:
+            self.endpoints[self.key(event)].add(event)
+
+    def to_dict(self):
+        with self._lock:
+            return {name: metrics.to_dict() for name, metrics in self.endpoints.items()}
+
+    def merge_dict(self, data):
+        with self._lock:
+            for name, raw in data.items():
+                self.endpoints[name].merge(EndpointMetrics.from_dict(raw))
+
+    def summary(self):
+        with self._lock:
+            return {name: metrics.summary() for name, metrics in sorted(self.endpoints.items())}
+
+    def format_table(self):
+        """
+        :return: Text table with latency percentiles (ms), TTFB, traffic and connection reuse.
+        """
+        header = (f"{'endpoint':<40} {'count':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} "
+                  f"{'ttfb95':>8} {'in KB':>8} {'out KB':>8} {'reuse':>6}")
+        lines = [header, "-" * len(header)]
+        for name, row in self.summary().items():
+            known = row["connections_reused"] + row["connections_new"]
+            reuse = f"{row['connections_reused'] / known * 100:.0f}%" if known else "n/a"
+            lines.append(
+                f"{name:<40} {row['count']:>6} {row['errors']:>4} {row['p50']:>8.1f} {row['p95']:>8.1f} "
+                f"{row['p99']:>8.1f} {row['max']:>8.1f} {row['ttfb_p95']:>8.1f} {row['bytes_in'] / 1024:>8.1f} "
+                f"{row['bytes_out'] / 1024:>8.1f} {reuse:>6}"
+            )
+        return "\n".join(lines)
+
+
+def find_regressions(summary, baseline, threshold_percent, min_count=5):
+    """
+    Compares p95 latency of every endpoint with the baseline.
+    :param summary: Current RequestMetrics.summary().
+    :param baseline: Saved summary of a previous run.
+    :param threshold_percent: Allowed p95 growth in percent.
+    :param min_count: Endpoints with fewer successful calls are ignored (too noisy).
+    :return: List of (endpoint, baseline_p95, current_p95) tuples.
+    """
+    regressions = []
+    for name, row in summary.items():
+        base = baseline.get(name)
+        if not base or not row.get("gated", True):
+            continue
+        if row["count"] - row["errors"] < min_count or base.get("count", 0) - base.get("errors", 0) < min_count:
+            continue
+        if row["p95"] > base["p95"] * (1 + threshold_percent / 100):
+            regressions.append((name, base["p95"], row["p95"]))
+    return regressions
@@ -0,0 +1,98 @@
+import re
+import threading
+
+# Числовые id и UUID в пути заменяются на {id}: /movies/42 -> /movies/{id}
+_ID_SEGMENT = re.compile(r"/(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)")
+
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+def template_endpoint(endpoint):
+    """
+    Replaces identifiers in the endpoint with a placeholder.
+    :param endpoint: API endpoint (e.g., "/movies/42").
+    :return: Templated endpoint (e.g., "/movies/{id}").
+    """
+    return _ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0])
+
+
+class RequestEvent:
+    """
+    Information about one send_request call passed to the listeners.
+    """
+
+    def __init__(self, method, base_url, endpoint, elapsed, response=None, error=None, from_cache=False,
+                 service=None):
+        self.method = method.upper()
+        self.base_url = base_url
+        self.service = service  # Имя сервиса API-клиента ("auth", "movies") или None для прочих клиентов
+        self.endpoint = endpoint
+        self.template = template_endpoint(endpoint)
+        self.elapsed = elapsed  # Полное время вызова в секундах
+        self.response = response
+        self.error = error  # Исключение: сетевая ошибка или неожиданный статус
+        self.from_cache = from_cache
+
+    @property
+    def name(self):
+        """Method plus templated endpoint, e.g. "GET /movies/{id}"."""
+        return f"{self.method} {self.template}"
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def ttfb(self):
+        """Time to the response headers in seconds (Response.elapsed) or None."""
+        elapsed = getattr(self.response, "elapsed", None)
+        return elapsed.total_seconds() if elapsed is not None and not self.from_cache else None
+
+    @property
+    def bytes_in(self):
+        if self.response is None or self.from_cache:
+            return 0
+        # Не читаем тело потокового ответа, иначе оно будет потеряно для вызывающего кода
+        content = getattr(self.response, "_content", None)
+        return len(content) if isinstance(content, bytes) else 0
+
+    @property
+    def bytes_out(self):
+        request = getattr(self.response, "request", None)
+        if request is None or self.from_cache:
+            return 0
+        body = request.body if hasattr(request, "body") else getattr(request, "content", None)
+        if isinstance(body, str):
+            return len(body.encode("utf-8"))
+        return len(body) if body else 0
+
+    @property
+    def connection_reused(self):
+        """True/False if known (see CustomRequester._perform_request), otherwise None."""
+        return getattr(self.response, "connection_reused", None)
+
+
+def add_listener(listener):
+    """
+    Subscribes a callable(RequestEvent) to all requests of all CustomRequester instances.
+    """
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def emit(event):
+    """
+    Passes the event to the listeners; a failing listener never breaks the request.
+    """
+    for listener in list(_listeners):
+        try:
+            listener(event)
+        except Exception:
+            pass
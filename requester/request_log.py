@@ -0,0 +1,98 @@
+import contextvars
+import threading
+from collections import deque
+
+from constants import REQUEST_LOG_BUFFER_SIZE
+
+
+class _TestBuffer:
+    """
+    Responses captured during one test.
+    """
+
+    def __init__(self, test_name, maxlen):
+        self.test_name = test_name
+        self.responses = deque(maxlen=maxlen)
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+
+class RequestLog:
+    """
+    Bounded ring buffer with the responses sent during the current test.
+    Only references are stored; curl/response text is built on render().
+    Every start() opens a new buffer in the current context: threads of ContextThreadPoolExecutor
+    and asyncio tasks write into the buffer of the test that started them, even if they finish later.
+    """
+
+    def __init__(self, maxlen=REQUEST_LOG_BUFFER_SIZE):
+        """
+        :param maxlen: Maximum number of stored responses, older ones are dropped.
+        """
+        self.maxlen = maxlen
+        # Буфер последнего теста - для потоков, запущенных без копирования контекста
+        self._latest = _TestBuffer(None, maxlen)
+        self._current = contextvars.ContextVar(f"request_log_{id(self)}", default=None)
+
+    def _buffer(self):
+        return self._current.get() or self._latest
+
+    @property
+    def test_name(self):
+        return self._buffer().test_name
+
+    @property
+    def dropped(self):
+        return self._buffer().dropped
+
+    def start(self, test_name):
+        """
+        Opens an empty buffer for a new test.
+        :param test_name: Test node id.
+        """
+        self._latest = _TestBuffer(test_name, self.maxlen)
+        self._current.set(self._latest)
+
+    def capture(self, response):
+        """
+        Stores a reference to the response.
+        :param response: Response object.
+        """
+        buffer = self._buffer()
+        with buffer.lock:
+            if len(buffer.responses) == self.maxlen:
+                buffer.dropped += 1
+            buffer.responses.append(response)
+
+    def render(self):
+        """
+        Builds curl commands and failed response details for all stored responses.
+        :return: String with the captured requests.
+        """
+        from requester.custom_requester import CustomRequester
+
+        buffer = self._buffer()
+        with buffer.lock:
+            responses = list(buffer.responses)
+            dropped = buffer.dropped
+
+        parts = []
+        if dropped:
+            parts.append(f"... {dropped} earlier request(s) dropped from the buffer")
+        for response in responses:
+            try:
+                parts.append(CustomRequester.format_request(response, test_name=buffer.test_name))
+                if response.status_code >= 400:
+                    parts.append(CustomRequester.format_response(response))
+            except Exception as e:
+                parts.append(f"Rendering went wrong: {type(e)} - {e}")
+        return "\n".join(parts)
+
+    def __len__(self):
+        buffer = self._buffer()
+        with buffer.lock:
+            return len(buffer.responses)
+
+
+# Один объект на процесс; буфер свой у каждого теста (см. start)
+request_log = RequestLog()
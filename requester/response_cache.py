@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+
+from constants import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+
+
+class CacheEntry:
+    def __init__(self, response):
+        self.response = response
+        self.stored_at = time.monotonic()
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of GET responses.
+    A fresh entry is returned without a request; a stale entry with ETag/Last-Modified
+    is revalidated with If-None-Match/If-Modified-Since (304 - the cached response is reused).
+    Writes through the same client invalidate the resource and its collection.
+    Thread-safe: one cache is shared by the threads of a client (RBAC matrix, page prefetch).
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        """
+        :param max_entries: Maximum number of stored responses.
+        :param ttl: Seconds a response is served without revalidation.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(url, params, headers):
+        """
+        Builds a cache key; the Authorization header is a part of it,
+        since different roles may get different responses.
+        """
+        params_key = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return url, params_key, headers.get("Authorization")
+
+    def lookup(self, key):
+        """
+        Returns the entry for the key (fresh or stale) or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry):
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Returns validators of a stale entry for a conditional request.
+        """
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def hit(self, entry):
+        """
+        Registers a hit and returns the cached response.
+        """
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(entry.response.content)
+        return entry.response
+
+    def revalidated(self, entry):
+        """
+        Registers a successful revalidation (304) and returns the cached response.
+        """
+        with self._lock:
+            self.revalidations += 1
+            self.bytes_saved += len(entry.response.content)
+            entry.stored_at = time.monotonic()
+        return entry.response
+
+    def store(self, key, response):
+        """
+        Registers a miss and stores a cacheable response.
+        """
+        with self._lock:
+            self.misses += 1
+            if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = CacheEntry(response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url):
+        """
+        Drops the resource and its collection (e.g. /movies/1 and /movies).
+        :param url: Full URL of the modified resource.
+        """
+        collection_url = url.rstrip("/").rsplit("/", 1)[0]
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in (url, collection_url)]:
+                del self._entries[key]
+
+    def stats(self):
+        """
+        :return: Dictionary with hit/miss/revalidation counters and saved bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "bytes_saved": self.bytes_saved,
+                "entries": len(self._entries),
+            }
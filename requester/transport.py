@@ -0,0 +1,184 @@
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import InvalidHeader, MaxRetryError
+from urllib3.util.retry import Retry
+
+from constants import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_KEEP_ALIVE, HTTP_CONNECT_TIMEOUT,
+                       HTTP_READ_TIMEOUT, HTTP_RETRY_TOTAL, HTTP_RETRY_BACKOFF_FACTOR, HTTP_RETRY_BACKOFF_JITTER,
+                       HTTP_RETRY_STATUSES, ENDPOINT_TIMEOUTS)
+from requester.deadline import DeadlineExceeded, remaining
+
+# Методы, которые безопасно повторять при обрыве соединения или 502/503
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class _ReuseTrackingMixin:
+    """
+    Marks every urllib3 response with connection_reused: False if the socket was opened for this request.
+    """
+    _fresh_socket = True
+
+    def connect(self):
+        super().connect()
+        self._fresh_socket = True
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        response.connection_reused = not self._fresh_socket
+        self._fresh_socket = False
+        return response
+
+
+class _TrackedHTTPConnection(_ReuseTrackingMixin, HTTPConnection):
+    pass
+
+
+class _TrackedHTTPSConnection(_ReuseTrackingMixin, HTTPSConnection):
+    pass
+
+
+class _TrackedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TrackedHTTPConnection
+
+
+class _TrackedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TrackedHTTPSConnection
+
+
+class TrackingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose responses tell whether a keep-alive connection was reused (response.raw.connection_reused).
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TrackedHTTPConnectionPool,
+                                                   "https": _TrackedHTTPSConnectionPool}
+
+
+class DeadlineRetry(Retry):
+    """
+    urllib3 Retry that does not start a retry which can not begin before the test/session deadline:
+    the response is returned as is (or the error raised) instead of sleeping past the deadline.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new_retry = super().increment(method, url, response=response, error=error, _pool=_pool,
+                                      _stacktrace=_stacktrace)
+        left = remaining()
+        if left is not None:
+            delay = None
+            if response is not None and new_retry.respect_retry_after_header:
+                delay = new_retry.get_retry_after(response)
+            delay = new_retry.get_backoff_time() if delay is None else delay
+            if left <= delay:
+                raise MaxRetryError(_pool, url, error or DeadlineExceeded(f"Deadline exceeded while retrying {url}"))
+        return new_retry
+
+
+def build_retry(retries=HTTP_RETRY_TOTAL):
+    """
+    Builds the urllib3 retry policy.
+    Connection errors are retried for every method (the request has not been sent yet),
+    read errors and 502/503 responses only for idempotent methods.
+    No retry is started if it could not begin before the deadline (see DeadlineRetry).
+    :param retries: Maximum number of retries (0 - every error and status is returned as is).
+    :return: urllib3 Retry object.
+    """
+    return DeadlineRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        other=0,
+        allowed_methods=IDEMPOTENT_METHODS,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+        backoff_jitter=HTTP_RETRY_BACKOFF_JITTER,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+
+
+def create_session(retries=HTTP_RETRY_TOTAL):
+    """
+    Creates a requests.Session with sized connection pools and the retry policy.
+    :param retries: Maximum number of retries, see build_retry (0 - e.g. for load generation,
+        where a retry would hide the failure and count one request as several).
+    :return: requests.Session object.
+    """
+    session = requests.Session()
+    adapter = TrackingHTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=build_retry(retries),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not HTTP_KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def create_async_client():
+    """
+    Creates an httpx.AsyncClient with the same pool and timeout settings.
+    httpx retries only connection errors itself, status retries are done by AsyncCustomRequester.
+    :return: httpx.AsyncClient object.
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+        max_keepalive_connections=HTTP_POOL_MAXSIZE if HTTP_KEEP_ALIVE else 0,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, retries=HTTP_RETRY_TOTAL)
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def get_timeout(endpoint):
+    """
+    Returns (connect, read) timeout for the endpoint.
+    :param endpoint: API endpoint (e.g., "/movies/1").
+    :return: Tuple (connect_timeout, read_timeout).
+    """
+    matches = [prefix for prefix in ENDPOINT_TIMEOUTS if endpoint.startswith(prefix)]
+    if matches:
+        return ENDPOINT_TIMEOUTS[max(matches, key=len)]
+    return HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+
+
+def backoff_delay(attempt):
+    """
+    Jittered exponential backoff delay, same formula as urllib3 Retry.
+    :param attempt: Number of the retry (starting from 1).
+    :return: Delay in seconds.
+    """
+    if attempt <= 1:
+        return 0
+    delay = HTTP_RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1))
+    return min(delay + random.uniform(0, HTTP_RETRY_BACKOFF_JITTER), Retry.DEFAULT_BACKOFF_MAX)
+
+
+def retry_delay(attempt, response=None):
+    """
+    Delay before a retry of AsyncCustomRequester, matching urllib3 Retry of the sync session:
+    Retry-After of a 413/429/503 response is honoured, otherwise the jittered exponential backoff is used.
+    :param attempt: Number of the retry (starting from 1).
+    :param response: Response that is retried (None - the request failed with a read error).
+    :return: Delay in seconds.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and response.status_code in Retry.RETRY_AFTER_STATUS_CODES:
+        try:
+            return Retry(0).parse_retry_after(retry_after)
+        except InvalidHeader:
+            pass
+    return backoff_delay(attempt)
@@ -0,0 +1,63 @@
+import json
+from functools import cached_property
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен, без него используется стандартный json
+    orjson = None
+
+
+def loads(content):
+    """
+    Parses JSON from bytes with orjson when it is installed, otherwise with the standard json module.
+    :param content: Raw response body.
+    :return: Parsed object.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class TypedResponse:
+    """
+    Wrapper around a response that parses the body only once.
+    `data` validates the raw bytes straight into the pydantic model (without an intermediate dict),
+    or the dictionary if `json()` has already parsed the body; `json()` returns the cached dictionary.
+    Other attributes are taken from the wrapped response.
+    """
+
+    def __init__(self, response, model):
+        """
+        :param response: requests.Response or httpx.Response object.
+        :param model: Pydantic model of the response body.
+        """
+        self.response = response
+        self.model = model
+
+    @cached_property
+    def data(self):
+        """
+        Response body validated into the model.
+        """
+        if "_json" in self.__dict__:
+            return self.model.model_validate(self._json)
+        return self.model.model_validate_json(self.response.content)
+
+    @cached_property
+    def _json(self):
+        return loads(self.response.content)
+
+    def json(self):
+        """
+        Response body as a dictionary (parsed on the first call).
+        """
+        return self._json
+
+    def __getattr__(self, name):
+        # Вызывается только для атрибутов, которых нет у обёртки: status_code, text, headers и т.д.
+        if name == "response":
+            raise AttributeError(name)
+        return getattr(self.response, name)
+
+    def __repr__(self):
+        return f"<TypedResponse [{self.response.status_code}] {self.model.__name__}>"
@@ -0,0 +1,42 @@
+import asyncio
+
+
+class TestAsyncApi:
+    """
+    Tests for verifying the async API clients.
+    """
+
+    def test_get_movies_concurrently(self, api_manager):
+        """
+        Checks that several list requests can be sent concurrently.
+        """
+        params_list = [{"minPrice": 1, "maxPrice": 500}, {"minPrice": 500, "maxPrice": 1000}, {"locations": "MSK"}]
+
+        async def scenario():
+            async with api_manager.create_async() as api:
+                return await asyncio.gather(*(api.movies_api.get_movies(params=params) for params in params_list))
+
+        responses = asyncio.run(scenario())
+        assert len(responses) == len(params_list)
+        for response in responses:
+            assert "movies" in response.json(), "Response does not contain the 'movies' key"
+
+    def test_register_and_login_concurrently(self, api_manager, register_user_data, super_admin_token):
+        """
+        Checks the register -> login chain via the async client and cleans up the user.
+        """
+
+        async def scenario():
+            async with api_manager.create_async() as api:
+                register_response = await api.auth_api.register_user(register_user_data)
+                login_payload = {"email": register_user_data["email"], "password": register_user_data["password"]}
+                login_response, user_info = await asyncio.gather(
+                    api.auth_api.login_user(login_payload),
+                    api.auth_api.get_user(register_response.json()["id"], super_admin_token),
+                )
+                await api.auth_api.delete_user(register_response.json()["id"], super_admin_token)
+                return login_response, user_info
+
+        login_response, user_info = asyncio.run(scenario())
+        assert "accessToken" in login_response.json(), "Login response does not contain 'accessToken'"
+        assert user_info["email"] == register_user_data["email"], "Email не совпадает"
@@ -1,5 +1,9 @@
 from http import HTTPStatus
-from models.base_models import LoginData, UserDBModel
+
+import pytest
+
+from models.base_models import LoginData
+from models.db_models import UserDBModel
 
 
 class TestAuthAPI:
@@ -68,7 +72,8 @@ class TestAuthAPI:
         response = api_manager.auth_api.login_user(login_data, expected_status=(400, 401))
         assert response.status_code in [400, 401]
 
-    def test_register_user_db_session(self, api_manager, register_user_data, db_session):
+    @pytest.mark.service_db
+    def test_register_user_db_session(self, api_manager, register_user_data, db_expect):
         """
         Тест на регистрацию пользователя с проверкой в базе данных.
         """
@@ -76,12 +81,8 @@ class TestAuthAPI:
         response = api_manager.auth_api.register_user(register_user_data)
         register_user_response = response.json()
 
-        # Проверяем добавил ли сервис Auth нового пользователя в базу данных
-        users_from_db = db_session.query(UserDBModel).filter(UserDBModel.id == register_user_response.get('id'))
-
-        # получили обьект из бзы данных и проверили что он действительно существует в единственном экземпляре
-        assert users_from_db.count() == 1, "обьект не попал в базу данных"
-        # Достаем первый и единственный обьект из списка полученных
-        user_from_db = users_from_db.first()
-        # можем осуществить проверку всех полей в базе данных например Email
+        # Проверяем добавил ли сервис Auth нового пользователя в базу данных: наличие единственной строки
+        # и её Email проверяются одним запросом, пока запись не появится (или не истечёт DB_POLL_TIMEOUT)
+        [user_from_db], = db_expect.expect_present(UserDBModel.id, register_user_response.get('id'),
+                                                   email=register_user_data['email']).verify()
         assert user_from_db.email == register_user_data['email'], "Email не совпадает"
@@ -0,0 +1,117 @@
+import base64
+import json
+
+import pytest
+
+from requester.cassette import Cassette, CassetteMissError, caller_identity
+from requester.json_stream import iter_json_array
+
+
+def make_token(role, user_id):
+    """Неподписанный JWT с ролью и id пользователя, как у сервиса авторизации."""
+    payload = base64.urlsafe_b64encode(json.dumps({"id": user_id, "roles": [role]}).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJub25lIn0.{payload}.signature"
+
+
+class TestCassette:
+    """
+    Tests for verifying the record/replay journal.
+    """
+
+    def test_replay_returns_recorded_response(self, tmp_path):
+        """
+        Checks that a recorded interaction is replayed by method, path and params, regardless of the host.
+        """
+        path = tmp_path / "requests.jsonl"
+        cassette = Cassette(path, "record")
+        cassette.record("GET", "https://api.example/movies", {"pageSize": 5}, None, 200,
+                        {"Content-Type": "application/json"}, b'{"movies": []}')
+        cassette.close()
+
+        replay = Cassette(path, "replay")
+        response = replay.replay("GET", "http://localhost:8080/movies", {"pageSize": 5}, None, {})
+        assert response.status_code == 200
+        assert response.json() == {"movies": []}
+
+        with pytest.raises(CassetteMissError):
+            replay.replay("GET", "http://localhost:8080/movies", {"pageSize": 10}, None, {})
+
+    def test_dynamic_fields_are_substituted(self, tmp_path):
+        """
+        Checks that a body with other generated values matches and gets them back in the response.
+        """
+        path = tmp_path / "requests.jsonl"
+        cassette = Cassette(path, "record", dynamic_fields=("name",))
+        cassette.record("POST", "https://api.example/movies", None, {"name": "Old", "price": 100}, 201,
+                        {}, b'{"id": 1, "name": "Old", "price": 100}')
+        cassette.close()
+
+        replay = Cassette(path, "replay", dynamic_fields=("name",))
+        response = replay.replay("POST", "https://api.example/movies", None, {"name": "New", "price": 100}, {})
+        assert response.json() == {"id": 1, "name": "New", "price": 100}
+
+    def test_same_request_of_different_roles_is_not_mixed_up(self, tmp_path):
+        """
+        Checks that requests differing only by the caller's token replay the response of the caller's role,
+        whichever user of the role sends it and in whatever order.
+        """
+        path = tmp_path / "requests.jsonl"
+        cassette = Cassette(path, "record")
+        for role, status in (("ADMIN", 201), ("USER", 403)):
+            cassette.record("POST", "https://api.example/movies", None, {"name": "A", "price": 1}, status, {},
+                            b"{}", {"Authorization": f"Bearer {make_token(role, 'recorded')}"})
+        cassette.close()
+
+        replay = Cassette(path, "replay")
+        for role, status in (("USER", 403), ("ADMIN", 201)):
+            response = replay.replay("POST", "http://localhost/movies", None, {"name": "B", "price": 1},
+                                     {"Authorization": f"Bearer {make_token(role, 'another-user')}"})
+            assert response.status_code == status, f"{role} got the response of another role"
+
+    def test_generated_values_are_substituted_in_later_responses(self, tmp_path):
+        """
+        Checks that a name substituted in the POST response is also substituted in a later GET of the resource.
+        """
+        path = tmp_path / "requests.jsonl"
+        cassette = Cassette(path, "record", dynamic_fields=("name",))
+        cassette.record("POST", "https://api.example/movies", None, {"name": "Old-1"}, 201, {},
+                        b'{"id": 7, "name": "Old-1"}')
+        cassette.record("GET", "https://api.example/movies/7", None, None, 200, {}, b'{"id": 7, "name": "Old-1"}')
+        cassette.close()
+
+        replay = Cassette(path, "replay", dynamic_fields=("name",))
+        replay.replay("POST", "https://api.example/movies", None, {"name": "New-1"}, {})
+        assert replay.replay("GET", "https://api.example/movies/7", None, None, {}).json()["name"] == "New-1"
+
+    def test_secrets_are_redacted(self, tmp_path):
+        """
+        Checks that passwords and token signatures never reach the journal,
+        while the replayed login still identifies the caller.
+        """
+        path = tmp_path / "requests.jsonl"
+        token = make_token("SUPER_ADMIN", "admin")
+        cassette = Cassette(path, "record")
+        cassette.record("POST", "https://auth.example/login", None, {"email": "a@b.c", "password": "Secret123"}, 200,
+                        {}, json.dumps({"accessToken": token}).encode("utf-8"))
+        cassette.close()
+
+        journal = path.read_text(encoding="utf-8")
+        assert "Secret123" not in journal and token not in journal
+
+        replay = Cassette(path, "replay")
+        replayed = replay.replay("POST", "https://auth.example/login", None,
+                                 {"email": "a@b.c", "password": "Secret123"}, {}).json()["accessToken"]
+        assert caller_identity({"Authorization": f"Bearer {replayed}"}) == "roles:SUPER_ADMIN"
+
+    def test_replayed_response_can_be_streamed(self, tmp_path):
+        """
+        Checks that a replayed response supports iter_content, as a streamed one does.
+        """
+        path = tmp_path / "requests.jsonl"
+        cassette = Cassette(path, "record")
+        cassette.record("GET", "https://api.example/movies", None, None, 200, {}, b'{"movies": [{"id": 1}, {"id": 2}]}')
+        cassette.close()
+
+        response = Cassette(path, "replay").replay("GET", "https://api.example/movies", None, None, {})
+        assert list(iter_json_array(response.iter_content(4), key="movies")) == [{"id": 1}, {"id": 2}]
+        response.close()
@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+import pytest
+
+from requester.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from requester.deadline import apply_deadline, deadline, remaining, ContextThreadPoolExecutor, DeadlineExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """
+    Tests for verifying the circuit breaker and request deadlines.
+    """
+
+    def test_opens_after_threshold_and_recovers_after_probe(self):
+        """
+        Checks that consecutive failures open the circuit, requests are rejected until the reset timeout,
+        then a single probe is let through and its success closes the circuit.
+        """
+        clock = FakeClock()
+        breaker = CircuitBreaker("http://service", failure_threshold=3, reset_timeout=10, clock=clock)
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure("503")
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        clock.now = 10
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        breaker.before_request()
+
+    def test_failed_probe_opens_circuit_again(self):
+        """
+        Checks that a failed half-open probe reopens the circuit for another reset timeout.
+        """
+        clock = FakeClock()
+        breaker = CircuitBreaker("http://service", failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure("ConnectionError")
+        clock.now = 5
+        breaker.before_request()
+        breaker.record_failure("ConnectionError")
+        assert breaker.state == OPEN
+        clock.now = 9
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_success_resets_failure_count(self):
+        """
+        Checks that only consecutive failures open the circuit.
+        """
+        breaker = CircuitBreaker("http://service", failure_threshold=2, reset_timeout=5, clock=FakeClock())
+        breaker.record_failure("500")
+        breaker.record_success()
+        breaker.record_failure("500")
+        assert breaker.state == CLOSED
+
+    def test_deadline_shortens_timeout_and_fails_fast(self):
+        """
+        Checks that the timeout is clamped to the time left and an expired deadline fails before the request.
+        """
+        assert apply_deadline((5, 30)) == (5, 30)
+        with deadline(2):
+            connect_timeout, read_timeout = apply_deadline((5, 30))
+            assert 0 < connect_timeout <= 2 and 0 < read_timeout <= 2
+            with deadline(60):
+                assert apply_deadline((5, 30))[1] <= 2
+        with deadline(0):
+            with pytest.raises(DeadlineExceeded):
+                apply_deadline((5, 30), "GET /movies")
+
+    def test_deadline_reaches_pool_threads(self):
+        """
+        Checks that tasks submitted to ContextThreadPoolExecutor see the deadline of the submitting test.
+        """
+        with deadline(30), ContextThreadPoolExecutor(max_workers=2) as executor:
+            left = executor.submit(remaining).result()
+        assert left is not None and 0 < left <= 30
+
+    def test_async_retries_do_not_overrun_deadline(self):
+        """
+        Checks that every async retry gets the timeout shortened to the time left, not the one of the first attempt.
+        """
+        import httpx
+
+        from requester.async_custom_requester import AsyncCustomRequester
+
+        read_timeouts = []
+
+        async def handler(request):
+            read_timeouts.append(request.extensions["timeout"]["read"])
+            await asyncio.sleep(0.2)
+            return httpx.Response(503)
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                requester = AsyncCustomRequester(client, "http://deadline.test")
+                requester.circuit_breaker_enabled = False
+                with deadline(1):
+                    await requester.send_request("GET", "/movies", need_logging=False)
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(scenario())
+        assert time.monotonic() - start < 1.5
+        assert len(read_timeouts) >= 2 and read_timeouts[1] < read_timeouts[0] <= 1
+
+    def test_expired_deadline_is_not_a_service_failure(self):
+        """
+        Checks that async requests failing on the deadline of the test do not open the circuit
+        and free the probe of a half-open circuit.
+        """
+        import httpx
+
+        from requester.async_custom_requester import AsyncCustomRequester
+
+        breaker = CircuitBreaker("http://deadline.test", failure_threshold=2, reset_timeout=0)
+        breaker.record_failure("boom")
+        breaker.record_failure("boom")
+
+        async def handler(request):
+            return httpx.Response(503)
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                requester = AsyncCustomRequester(client, "http://deadline.test")
+                requester.get_circuit_breaker = lambda: breaker
+                for seconds in (0, 0.05):
+                    with deadline(seconds), pytest.raises(DeadlineExceeded):
+                        await requester.send_request("GET", "/movies", need_logging=False)
+
+        asyncio.run(scenario())
+        assert breaker.failures == 2 and breaker.last_error == "boom"
+        breaker.before_request()  # Проба свободна
+
+    def test_cancelled_probe_is_released(self):
+        """
+        Checks that a cancelled async probe request does not leave the half-open circuit stuck.
+        """
+        import httpx
+
+        from requester.async_custom_requester import AsyncCustomRequester
+
+        clock = FakeClock()
+        breaker = CircuitBreaker("http://cancel.test", failure_threshold=1, reset_timeout=1, clock=clock)
+        breaker.record_failure("boom")
+        clock.now = 2
+
+        async def handler(request):
+            await asyncio.sleep(10)
+            return httpx.Response(200)
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                requester = AsyncCustomRequester(client, "http://cancel.test")
+                requester.get_circuit_breaker = lambda: breaker
+                task = asyncio.ensure_future(requester.send_request("GET", "/movies", need_logging=False))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(scenario())
+        assert breaker.state == HALF_OPEN
+        breaker.before_request()  # Следующий запрос может стать пробой
@@ -0,0 +1,103 @@
+import threading
+
+from requester.deadline import ContextThreadPoolExecutor
+from utils.cleanup_registry import CleanupRegistry, MOVIE, USER
+
+
+def make_registry(fail_ids=()):
+    registry = CleanupRegistry(max_workers=4)
+    registry.token_provider = lambda: "admin-token"
+    deleted = []
+    lock = threading.Lock()
+
+    def delete(resource_id, token):
+        if resource_id in fail_ids:
+            raise ConnectionError("service is down")
+        with lock:
+            deleted.append((resource_id, token))
+
+    registry.deleters = {MOVIE: delete, USER: delete}
+    return registry, deleted
+
+
+class TestCleanupRegistry:
+    """
+    Tests for verifying the registry of created resources and its teardown by scope.
+    """
+
+    def test_teardown_deletes_only_the_given_scope(self):
+        """
+        Checks that teardown deletes the resources of its scope and keeps the others.
+        """
+        registry, deleted = make_registry()
+        registry.register(MOVIE, 1)
+        with registry.scope("module"):
+            registry.register(MOVIE, 2)
+        registry.register(USER, "u1", scope="session")
+
+        result = registry.teardown("function")
+
+        assert result["deleted"] == [(MOVIE, 1)]
+        assert deleted == [(1, "admin-token")]
+        assert sorted(registry.pending(), key=str) == [(MOVIE, 2), (USER, "u1")]
+
+    def test_failed_deletes_stay_pending(self):
+        """
+        Checks that resources which could not be deleted are reported as leaked and stay registered.
+        """
+        registry, deleted = make_registry(fail_ids={2})
+        for movie_id in (1, 2, 3):
+            registry.register(MOVIE, movie_id)
+
+        result = registry.teardown("function")
+
+        assert result["leaked"] == [(MOVIE, 2)]
+        assert registry.pending("function") == [(MOVIE, 2)]
+        assert sorted(resource_id for resource_id, _ in deleted) == [1, 3]
+
+    def test_discard_forgets_resource(self):
+        """
+        Checks that a resource deleted by the test itself is not deleted again.
+        """
+        registry, deleted = make_registry()
+        registry.register(MOVIE, 1)
+        registry.discard(MOVIE, 1)
+
+        assert registry.teardown("function")["deleted"] == []
+        assert deleted == []
+
+    def test_scope_is_inherited_by_pool_threads(self):
+        """
+        Checks that resources registered from pool threads inside scope() get the scope of the block.
+        """
+        registry, _ = make_registry()
+        with registry.scope("module"), ContextThreadPoolExecutor(max_workers=8) as executor:
+            for movie_id in range(50):
+                executor.submit(registry.register, MOVIE, movie_id)
+        registry.register(MOVIE, "after")
+
+        assert len(registry.pending("module")) == 50
+        assert registry.pending("function") == [(MOVIE, "after")]
+
+    def test_concurrent_scopes_do_not_leak_into_each_other(self):
+        """
+        Checks that scope() blocks in different threads do not change the scope of each other.
+        """
+        registry, _ = make_registry()
+        barrier = threading.Barrier(2)
+
+        def register_in(scope, resource_id):
+            with registry.scope(scope):
+                barrier.wait()
+                registry.register(MOVIE, resource_id)
+                barrier.wait()
+
+        threads = [threading.Thread(target=register_in, args=("module", "m")),
+                   threading.Thread(target=register_in, args=("session", "s"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry.pending("module") == [(MOVIE, "m")]
+        assert registry.pending("session") == [(MOVIE, "s")]
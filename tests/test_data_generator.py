@@ -0,0 +1,27 @@
+from data_generator import BulkDataGenerator
+
+
+class TestBulkDataGenerator:
+    """
+    Tests for verifying the bulk test data generator.
+    """
+
+    def test_same_seed_gives_same_payloads(self):
+        """
+        Checks that payloads are reproducible for the same seed and namespace.
+        """
+        first = BulkDataGenerator(seed=42, namespace="gw0run")
+        second = BulkDataGenerator(seed=42, namespace="gw0run")
+        assert first.movies(50) == second.movies(50)
+        assert first.users(50) == second.users(50)
+
+    def test_names_and_emails_are_unique(self):
+        """
+        Checks uniqueness inside a batch and between generators of different workers.
+        """
+        worker_a = BulkDataGenerator(seed=1, namespace="gw0")
+        worker_b = BulkDataGenerator(seed=1, namespace="gw1")
+        names = [movie["name"] for movie in worker_a.movies(1000) + worker_b.movies(1000)]
+        emails = [user["email"] for user in worker_a.users(1000) + worker_b.users(1000)]
+        assert len(set(names)) == len(names)
+        assert len(set(emails)) == len(emails)
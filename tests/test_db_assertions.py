@@ -0,0 +1,91 @@
+import threading
+import time
+import uuid
+
+import pytest
+
+from utils.db import create_sqlite_engine, dispose_db_engine
+from utils.db_assertions import DbExpectations
+
+
+@pytest.fixture
+def sqlite_engine():
+    """
+    Фикстура отдельной временной SQLite-базы со схемой моделей (без засеянных фильмов и пользователей).
+    """
+    engine = create_sqlite_engine("", seed_rows=0)
+    yield engine
+    dispose_db_engine(engine)
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    from sqlalchemy.orm import sessionmaker
+
+    session = sessionmaker(bind=sqlite_engine)()
+    yield session
+    session.close()
+
+
+def insert_movie(engine, name):
+    from models.db_models import MovieDBModel
+
+    with engine.begin() as connection:
+        connection.execute(MovieDBModel.__table__.insert(),
+                           {"id": str(uuid.uuid4()), "name": name, "price": 100, "genre_id": "1",
+                            "location": "MSK", "published": True})
+
+
+class TestDbExpectations:
+    """
+    Tests for verifying batched DB expectations on the embedded SQLite backend.
+    """
+
+    def test_checks_are_batched_per_column(self, sqlite_engine, sqlite_session):
+        """
+        Checks that expectations on one column are resolved with a single query.
+        """
+        from models.db_models import MovieDBModel
+
+        insert_movie(sqlite_engine, "First")
+        insert_movie(sqlite_engine, "Second")
+        expectations = DbExpectations(sqlite_session, timeout=0)
+
+        first, second, _ = expectations.expect_present(MovieDBModel.name, "First", location="MSK") \
+            .expect_present(MovieDBModel.name, "Second") \
+            .expect_absent(MovieDBModel.name, "Third") \
+            .verify()
+
+        assert first[0].name == "First" and second[0].name == "Second"
+        assert expectations.queries == 1
+
+    def test_unmet_expectation_fails_with_description(self, sqlite_session):
+        """
+        Checks that an expectation that is not met after the timeout raises AssertionError with its description.
+        """
+        from models.db_models import MovieDBModel
+
+        expectations = DbExpectations(sqlite_session, timeout=0.2, initial_delay=0.05, max_delay=0.05)
+
+        with pytest.raises(AssertionError, match="MovieDBModel.name == 'Missing': expected 1 row"):
+            expectations.expect_present(MovieDBModel.name, "Missing").verify()
+
+    def test_last_poll_happens_at_the_deadline(self, sqlite_engine, sqlite_session):
+        """
+        Checks that a row written after the last full backoff pause, but before the deadline, is still found.
+        """
+        from models.db_models import MovieDBModel
+
+        # Опросы в 0 и 0.6 с не видят строку, она появляется в 0.8 с, дедлайн - 1 с
+        writer = threading.Timer(0.8, insert_movie, args=(sqlite_engine, "Late"))
+        expectations = DbExpectations(sqlite_session, timeout=1.0, initial_delay=0.6, max_delay=0.6)
+        start = time.monotonic()
+        writer.start()
+        try:
+            [rows] = expectations.expect_present(MovieDBModel.name, "Late").verify()
+        finally:
+            writer.join()
+
+        assert rows[0].name == "Late"
+        assert time.monotonic() - start < 1.5
+        assert expectations.queries == 3
@@ -1,10 +1,9 @@
 import datetime
-import random
 from http import HTTPStatus
 
 import pytest
 
-from models.base_models import MovieDBModel, AccountTransactionTemplate
+from models.db_models import MovieDBModel, AccountTransactionTemplate
 
 
 class TestMoviesAPI:
@@ -26,12 +25,8 @@ class TestMoviesAPI:
         """
         Checks filtering movies by price.
         """
-        response = api_manager.movies_api.get_movies(params={"minPrice": 100, "maxPrice": 500})
-        assert response.status_code in [200, 201], (
-            f"Unexpected status code: {response.status_code}"
-        )
-
-        for movie in response.json().get("movies", []):
+        # Фильмы разбираются по мере чтения тела: большой ответ не загружается в память целиком
+        for movie in api_manager.movies_api.stream_movies(params={"minPrice": 100, "maxPrice": 500}):
             assert 100 <= movie["price"] <= 500, (
                 f"Movie price {movie['price']} is out of the range [100, 500]"
             )
@@ -39,66 +34,74 @@ class TestMoviesAPI:
     def test_create_movie(self, api_manager, super_admin_token, movie_data):
         """
         Checks successful movie creation and verifies its existence via GET request.
+        The created movie is deleted by the cleanup registry after the test.
         """
-        movie_id = None
-        try:
-            response = api_manager.movies_api.create_movie(movie_data, super_admin_token)
-            assert response.status_code in [200, 201], (
-                f"Unexpected status code: {response.status_code}, Response: {response.text}"
-            )
+        response = api_manager.movies_api.create_movie(movie_data, super_admin_token, typed=True)
+        assert response.status_code in [200, 201], (
+            f"Unexpected status code: {response.status_code}, Response: {response.text}"
+        )
 
-            response_data = response.json()
-            assert "id" in response_data, f"Response does not contain 'id': {response_data}"
-            assert "name" in response_data, f"Response does not contain 'name': {response_data}"
-            assert response_data["name"] == movie_data["name"], (
-                f"Expected {movie_data['name']}, but got {response_data['name']}"
-            )
+        # Тело разбирается и валидируется один раз: отсутствие id или name упадёт на валидации модели
+        movie = response.data
+        assert movie.name == movie_data["name"], (
+            f"Expected {movie_data['name']}, but got {movie.name}"
+        )
 
-            movie_id = response_data["id"]
+        get_response = api_manager.movies_api.get_movie(movie.id)
+        assert get_response.status_code in [200, 201], (
+            f"Failed to fetch movie, status code: {get_response.status_code}, Response: {get_response.text}"
+        )
 
-            get_response = api_manager.movies_api.get_movie(movie_id)
-            assert get_response.status_code in [200, 201], (
-                f"Failed to fetch movie, status code: {get_response.status_code}, Response: {get_response.text}"
+    def test_iter_movies_by_price(self, api_manager):
+        """
+        Checks that the paginated iterator respects filters on every page.
+        """
+        movies_checked = 0
+        for movie in api_manager.movies_api.iter_movies(params={"minPrice": 100, "maxPrice": 500}):
+            assert 100 <= movie["price"] <= 500, (
+                f"Movie price {movie['price']} is out of the range [100, 500]"
             )
+            movies_checked += 1
+            if movies_checked >= 100:
+                break
 
-        finally:
-            if movie_id:
-                response = api_manager.movies_api.delete_movie(movie_id, super_admin_token)
-                assert response.status_code in [200, 201], (
-                    f"Failed to delete movie with ID {movie_id}. Response: {response.text}"
-                )
+    def test_get_movie_by_id(self, api_manager, shared_movie):
+        """
+        Checks the retrieval of an existing movie by its ID.
+        """
+        response = api_manager.movies_api.get_movie(shared_movie["id"], typed=True)
+        assert response.status_code in [200, 201], (
+            f"Unexpected status code: {response.status_code}, Response: {response.text}"
+        )
+        assert response.data.name == shared_movie["name"], (
+            f"Expected {shared_movie['name']}, but got {response.data.name}"
+        )
 
-    def test_delete_movie_success(self, api_manager, create_movie, super_admin_token):
+    def test_delete_movie_success(self, api_manager, exclusive_movie, super_admin_token):
         """
         Checks successful deletion of a movie with a valid ID.
         """
-        movie_id = create_movie(need_delete=False)
+        movie_id = exclusive_movie()["id"]
 
         response = api_manager.movies_api.delete_movie(movie_id, super_admin_token)
         assert response.status_code in [200, 201], (
             f"Unexpected status code: {response.status_code}, Response: {response.text}"
         )
 
-        get_response = api_manager.movies_api.get_movies(super_admin_token)
-        assert get_response.status_code in [200, 201], (
-            f"Failed to fetch movies, status code: {get_response.status_code}, Response: {get_response.text}"
-        )
-
-        movies = get_response.json().get("movies", [])
-        assert all(movie["id"] != movie_id for movie in movies), (
+        # Проверяем отсутствие фильма по всем страницам списка, а не только по первой
+        assert api_manager.movies_api.find_movie(movie_id) is None, (
             f"Movie with ID {movie_id} is still present in the movie list."
         )
 
-    def test_create_delete_movie(self, api_manager, super_admin_token, db_session, movie_data):
+    @pytest.mark.service_db
+    def test_create_delete_movie(self, api_manager, super_admin_token, db_expect, movie_data):
         # как бы выглядел SQL запрос
         """SELECT id, "name", price, description, image_url, "location", published, rating, genre_id, created_at
            FROM public.movies
-           WHERE name='Test Moviej1h8qss9s5';"""
+           WHERE name IN ('Test Moviej1h8qss9s5');"""
 
-        movies_from_db = db_session.query(MovieDBModel).filter(MovieDBModel.name == movie_data["name"])
-
-        # проверяем что до начала тестирования фильма с таким названием нет
-        assert movies_from_db.count() == 0, "В базе уже присутствует фильм с таким названием"
+        # проверяем что до начала тестирования фильма с таким названием нет (один запрос, без ожидания)
+        db_expect.expect_absent(MovieDBModel.name, movie_data["name"]).verify(timeout=0)
 
         response = api_manager.movies_api.create_movie(
             movie_data,
@@ -107,11 +110,10 @@ class TestMoviesAPI:
         assert response.status_code == 201, "Фильм должен успешно создаться"
         response = response.json()
 
-        # проверяем после вызова api_manager.movies_api.create_movie в базе появился наш фильм
-        movies_from_db = db_session.query(MovieDBModel).filter(MovieDBModel.name == movie_data["name"])
-        assert movies_from_db.count() == 1, "В базе уже присутствует фильм с таким названием"
-
-        movie_from_db = movies_from_db.first()
+        # проверяем после вызова api_manager.movies_api.create_movie в базе появился наш фильм;
+        # строка и её поля читаются одним запросом, запись сервиса ждём с экспоненциальной паузой
+        [movie_from_db], = db_expect.expect_present(MovieDBModel.name, movie_data["name"],
+                                                    price=movie_data["price"]).verify()
         # можете обратить внимание что в базе данных етсь поле created_at которое мы не здавали явно
         # наш сервис сам его заполнил. проверим что он заполнил его верно с погрешностью в 5 минут
         assert movie_from_db.created_at >= (
@@ -124,8 +126,7 @@ class TestMoviesAPI:
         assert delete_response.status_code == 200, "Фильм должен успешно удалиться"
 
         # проверяем что в конце тестирования фильма с таким названием действительно нет в базе
-        movies_from_db = db_session.query(MovieDBModel).filter(MovieDBModel.name == movie_data["name"])
-        assert movies_from_db.count() == 0, "Фильм небыл удален из базы!"
+        db_expect.expect_absent(MovieDBModel.name, movie_data["name"]).verify()
 
     @pytest.mark.parametrize(
         "stan_balance, bob_balance, transfer_amount, expected_exception, expected_stan_balance, expected_bob_balance",
@@ -136,12 +137,15 @@ class TestMoviesAPI:
             (100, 500, 200, ValueError, 100, 500),
         ]
     )
-    def test_accounts_transaction_template(self, db_session, stan_balance, bob_balance, transfer_amount, expected_exception,
-                                           expected_stan_balance, expected_bob_balance):
+    def test_accounts_transaction_template(self, db_transaction, unique_resource_name, stan_balance, bob_balance,
+                                           transfer_amount, expected_exception, expected_stan_balance,
+                                           expected_bob_balance):
         # ====================================================================== Подготовка к тесту
-        # Создаем записи в базе данных с параметризованными балансами
-        stan = AccountTransactionTemplate(user=f"Stan_{random.randint(1, 100)}", balance=stan_balance)
-        bob = AccountTransactionTemplate(user=f"Bob_{random.randint(1, 100)}", balance=bob_balance)
+        # Тест работает внутри транзакции, которая откатывается после него (commit фиксирует только SAVEPOINT)
+        db_session = db_transaction
+        # Создаем записи в базе данных с параметризованными балансами (имена уникальны между воркерами)
+        stan = AccountTransactionTemplate(user=unique_resource_name("Stan"), balance=stan_balance)
+        bob = AccountTransactionTemplate(user=unique_resource_name("Bob"), balance=bob_balance)
 
         # Добавляем записи в сессию
         db_session.add_all([stan, bob])
@@ -183,8 +187,3 @@ class TestMoviesAPI:
             db_session.refresh(bob)
             assert stan.balance == expected_stan_balance
             assert bob.balance == expected_bob_balance
-
-        # ====================================================================== Очистка данных
-        db_session.delete(stan)
-        db_session.delete(bob)
-        db_session.commit()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import os
+from pathlib import Path
+
+from utils.impact import ImpactData, endpoint_matches, lpt_order, parse_endpoint_patterns
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Внутренний прогон: test_create и test_read в одной группе xdist, test_new без данных прошлых прогонов
+SAMPLE_TESTS = """
+import pytest
+
+from requester import request_events
+from requester.request_events import RequestEvent
+
+
+def touch(method, endpoint):
+    request_events.emit(RequestEvent(method, "http://api.test", endpoint, 0.01))
+
+
+@pytest.mark.xdist_group("movies")
+def test_create():
+    touch("POST", "/movies")
+
+
+@pytest.mark.xdist_group("movies")
+def test_read():
+    touch("GET", "/movies")
+
+
+def test_login():
+    touch("POST", "/login")
+
+
+def test_unit():
+    pass
+
+
+def test_new():
+    touch("GET", "/genres")
+"""
+
+
+class TestImpact:
+    """
+    Tests for verifying test impact data, endpoint selection and LPT ordering.
+    """
+
+    def test_endpoint_patterns(self):
+        """
+        Checks that patterns match with or without a method and with wildcards.
+        """
+        assert endpoint_matches("POST /movies", "POST /movies")
+        assert endpoint_matches("DELETE /movies/{id}", "/movies*")
+        assert endpoint_matches("DELETE /user/{id}", "* /user/*")
+        assert not endpoint_matches("GET /movies", "POST /movies")
+        assert parse_endpoint_patterns(" POST /movies, ,/login ") == ["POST /movies", "/login"]
+
+    def test_affected_tests_and_smoothed_duration(self):
+        """
+        Checks that only tests touching the endpoints are affected, unknown tests always are,
+        and the duration is smoothed between runs.
+        """
+        data = ImpactData()
+        data.update("test_movies", 2.0, {"POST /movies", "GET /movies"})
+        data.update("test_unit", 0.1, set())
+        data.update("test_movies", 4.0, {"POST /movies"}, smoothing=0.5)
+
+        assert data.affected("test_movies", ["POST /movies"])
+        assert not data.affected("test_unit", ["POST /movies"])
+        assert data.affected("test_new", ["POST /movies"])
+        assert data.duration("test_movies") == 3.0
+        assert data.tests["test_movies"]["endpoints"] == ["POST /movies"]
+
+    def test_lpt_order_puts_longest_units_first(self):
+        """
+        Checks that units are ordered by their total duration, unknown tests taking the default.
+        """
+        durations = {"a": 1.0, "b1": 2.0, "b2": 2.0, "c": 3.0}
+        units = {"a": ["a"], "group_b": ["b1", "b2"], "c": ["c"], "new": ["new"]}
+        assert lpt_order(units, lambda test_id: durations.get(test_id, 0.5)) == ["group_b", "c", "a", "new"]
+
+    def test_affected_endpoints_select_whole_xdist_groups(self, pytester, monkeypatch):
+        """
+        Checks that --affected-endpoints keeps an xdist_group whole if one of its tests is affected,
+        deselects unaffected tests, always runs unknown ones and records the endpoints of the run.
+        """
+        monkeypatch.setenv("PYTHONPATH", os.pathsep.join([str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]))
+        pytester.makepyfile(test_sample=SAMPLE_TESTS)
+        store = pytester.path / "impact.json"
+        recorded = ImpactData()
+        recorded.update("test_sample.py::test_create", 1.0, {"POST /movies"})
+        recorded.update("test_sample.py::test_read", 1.0, {"GET /movies"})
+        recorded.update("test_sample.py::test_login", 1.0, {"POST /login"})
+        recorded.update("test_sample.py::test_unit", 0.1, set())
+        store.write_text(json.dumps(recorded.to_dict()))
+
+        result = pytester.runpytest_subprocess("-p", "plugins.impact", "-p", "no:cacheprovider", "-v",
+                                               "--impact-store", str(store), "--affected-endpoints", "POST /movies")
+
+        result.assert_outcomes(passed=3, deselected=2)
+        result.stdout.fnmatch_lines_random(["*test_create PASSED*", "*test_read PASSED*", "*test_new PASSED*"])
+        stored = ImpactData.from_dict(json.loads(store.read_text()))
+        assert stored.tests["test_sample.py::test_new"]["endpoints"] == ["GET /genres"]
@@ -0,0 +1,16 @@
+from utils.import_budget import measure
+
+
+class TestImportBudget:
+    """
+    Tests for verifying that the HTTP layer does not load DB and model dependencies on import.
+    """
+
+    def test_conftest_does_not_import_orm(self):
+        """
+        Checks that SQLAlchemy, the DB driver and pydantic are loaded only when a test asks for them.
+        """
+        packages = {timing.package for timing in measure("conftest")}
+        assert not packages & {"sqlalchemy", "psycopg2", "pydantic"}, (
+            f"conftest imports heavy dependencies: {packages & {'sqlalchemy', 'psycopg2', 'pydantic'}}"
+        )
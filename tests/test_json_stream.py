@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from requester.json_stream import JsonArrayStream, iter_json_array
+
+
+def split(body, size):
+    data = body.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonStream:
+    """
+    Tests for verifying the incremental JSON array parser.
+    """
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+    def test_elements_and_meta_match_json_loads(self, chunk_size):
+        """
+        Checks that any chunking (including a cut inside numbers and multi-byte characters)
+        gives the same elements and top-level fields as json.loads.
+        """
+        body = json.dumps({
+            "count": 3,
+            "movies": [{"id": 1, "name": "Фильм ✓", "price": 12345}, {"id": 2, "tags": [1, 2]}, 1.5e3],
+            "page": 1,
+            "pageCount": None,
+        }, ensure_ascii=False, indent=1)
+        stream = JsonArrayStream(split(body, chunk_size), key="movies")
+        assert list(stream) == json.loads(body)["movies"]
+        assert stream.meta == {"count": 3, "page": 1, "pageCount": None}
+
+    def test_top_level_array_and_empty_array(self):
+        """
+        Checks a body that is an array itself and an empty array under the key.
+        """
+        assert list(iter_json_array(split("[10, true, \"x\"]", 3))) == [10, True, "x"]
+        assert list(iter_json_array(split('{"movies": []}', 4), key="movies")) == []
+
+    def test_early_stop_does_not_read_the_rest(self):
+        """
+        Checks that stopping after the first element reads only the chunks it needs.
+        """
+        chunks_read = []
+
+        def chunks():
+            for chunk in split('{"movies": [' + ", ".join(['{"id": 0}'] * 1000) + "]}", 16):
+                chunks_read.append(chunk)
+                yield chunk
+
+        assert next(iter_json_array(chunks(), key="movies")) == {"id": 0}
+        assert len(chunks_read) <= 2
+
+    def test_truncated_body_raises(self):
+        """
+        Checks that a body cut in the middle of an element is reported instead of silently ignored.
+        """
+        with pytest.raises(ValueError):
+            list(iter_json_array(split('{"movies": [{"id": 1}, {"id"', 5), key="movies"))
+
+    def test_stream_movies_replayed_from_cassette(self, tmp_path, monkeypatch):
+        """
+        Checks that MoviesAPI.stream_movies goes through _perform_request in replay mode
+        and yields the movies of the recorded body.
+        """
+        import requests
+
+        import requester.custom_requester as custom_requester
+        from api.movies_api import MoviesAPI
+        from requester.cassette import Cassette
+
+        path = tmp_path / "requests.jsonl"
+        cassette = Cassette(path, "record")
+        cassette.record("GET", "https://api.example/movies", {"minPrice": 1}, None, 200,
+                        {"Content-Type": "application/json"},
+                        json.dumps({"movies": [{"id": i, "price": 10} for i in range(50)], "count": 50}).encode())
+        cassette.close()
+        monkeypatch.setattr(custom_requester, "get_cassette", lambda: Cassette(path, "replay"))
+
+        api = MoviesAPI(requests.Session(), base_url="http://127.0.0.1:9")
+        assert [movie["id"] for movie in api.stream_movies(params={"minPrice": 1})] == list(range(50))
+        assert api.stream_movies(params={"minPrice": 1}, callback=lambda movie: movie["id"] < 4) == 5
+
+    def test_error_body_of_stream_request_is_kept_for_deferred_log(self, monkeypatch):
+        """
+        Checks that the body of an unexpected error status is still rendered by the deferred request log
+        after stream_request has closed the response.
+        """
+        import io
+
+        import requests
+        from requests.adapters import BaseAdapter
+
+        import requester.custom_requester as custom_requester
+        from requester.custom_requester import CustomRequester
+        from requester.request_log import RequestLog
+
+        class ErrorAdapter(BaseAdapter):
+            def send(self, request, **kwargs):
+                response = requests.Response()
+                response.status_code = 400
+                response.raw = io.BytesIO(b'{"message": "minPrice must be positive"}')
+                response.request = request
+                response.url = request.url
+                return response
+
+            def close(self):
+                pass
+
+        log = RequestLog()
+        log.start("test_stream_error")
+        monkeypatch.setattr(custom_requester, "REQUEST_LOG_MODE", "deferred")
+        monkeypatch.setattr(custom_requester, "request_log", log)
+        session = requests.Session()
+        session.mount("http://stream.test", ErrorAdapter())
+        requester = CustomRequester(session, "http://stream.test")
+        requester.circuit_breaker_enabled = False
+
+        with pytest.raises(ValueError, match="Unexpected status code: 400"):
+            list(requester.stream_request("GET", "/movies", key="movies", params={"minPrice": -1}))
+        assert "minPrice must be positive" in log.render()
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from requester.metrics import find_regressions
+from requester.transport import create_session
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Внутренний прогон: клиент сервиса movies шлёт запросы с задержкой из переменной окружения;
+# медленные ошибки и запросы к локальному серверу юнит-теста не должны влиять на проверку p95
+EMITTING_TEST = """
+import os
+from types import SimpleNamespace
+
+from requester import request_events
+from requester.request_events import RequestEvent
+
+
+def emit(base_url, elapsed, error=None, service=None):
+    response = SimpleNamespace(status_code=200, elapsed=None, _content=b"{}")
+    request_events.emit(RequestEvent("GET", base_url, "/movies/1", elapsed, response=response, error=error,
+                                     service=service))
+
+
+def test_requests():
+    elapsed = float(os.environ["FAKE_ELAPSED"])
+    for _ in range(10):
+        emit("http://api.test", elapsed, service="movies")
+        emit("http://api.test", 5.0, error=TimeoutError("read timeout"), service="movies")
+        emit("http://127.0.0.1:9999", 5.0)
+"""
+
+
+def row(p95, count=10, errors=0, gated=True):
+    return {"count": count, "errors": errors, "gated": gated, "p95": p95}
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLatencyMetrics:
+    """
+    Tests for verifying the per-service latency buckets, the p95 regression check and connection reuse detection.
+    """
+
+    def test_regression_above_threshold(self):
+        """
+        Checks that only endpoints whose p95 grew more than the threshold are reported.
+        """
+        summary = {"GET /movies": row(130.0), "POST /login": row(110.0)}
+        baseline = {"GET /movies": row(100.0), "POST /login": row(100.0)}
+
+        assert find_regressions(summary, baseline, threshold_percent=20) == [("GET /movies", 100.0, 130.0)]
+
+    def test_rare_new_and_ungated_endpoints_are_ignored(self):
+        """
+        Checks that endpoints with too few successful calls, missing in the baseline
+        or not sent by a service client do not fail the run.
+        """
+        summary = {"GET /movies": row(500.0, count=8, errors=5), "GET /genres": row(500.0),
+                   "127.0.0.1:8080 GET /movies": row(500.0, gated=False)}
+        baseline = {"GET /movies": row(100.0), "POST /login": row(100.0), "127.0.0.1:8080 GET /movies": row(100.0)}
+
+        assert find_regressions(summary, baseline, threshold_percent=20) == []
+
+    @pytest.mark.parametrize("elapsed, expected_outcome", [(0.01, 0), (0.5, 1)])
+    def test_p95_gate_fails_the_run(self, pytester, monkeypatch, elapsed, expected_outcome):
+        """
+        Checks that --latency-baseline fails an otherwise green run only when p95 regresses.
+        """
+        monkeypatch.setenv("PYTHONPATH", os.pathsep.join([str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]))
+        monkeypatch.setenv("FAKE_ELAPSED", str(elapsed))
+        baseline = pytester.path / "baseline.json"
+        baseline.write_text(json.dumps({"endpoints": {"movies GET /movies/{id}": row(10.0),
+                                                      "127.0.0.1:9999 GET /movies/{id}": row(10.0, gated=False)}}))
+        pytester.makepyfile(test_emit=EMITTING_TEST)
+
+        result = pytester.runpytest_subprocess("-p", "plugins.latency_metrics", "-p", "no:cacheprovider",
+                                               "--latency-baseline", str(baseline), "--latency-report", "report.json")
+
+        assert result.ret == expected_outcome
+        result.assert_outcomes(passed=1)
+        report = json.loads((pytester.path / "report.json").read_text())["endpoints"]
+        assert report["movies GET /movies/{id}"]["count"] == 20
+        assert report["movies GET /movies/{id}"]["errors"] == 10
+        assert report["127.0.0.1:9999 GET /movies/{id}"]["gated"] is False
+
+    def test_connection_reuse_is_reported_by_the_response(self):
+        """
+        Checks that the first response reports a new connection and the next ones a reused keep-alive connection.
+        """
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        session = create_session()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/movies"
+            reused = [session.get(url).raw.connection_reused for _ in range(3)]
+        finally:
+            session.close()
+            server.shutdown()
+            server.server_close()
+
+        assert reused == [False, True, True]
@@ -0,0 +1,38 @@
+from loadgen import runner as loadgen_runner
+from loadgen.runner import LoadRunner, Stage
+
+
+class FakeSession:
+    """
+    Заглушка сессии: запоминает, была ли она закрыта.
+    """
+
+    def __init__(self, **kwargs):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestLoadRunner:
+    """
+    Tests for verifying that load threads do not keep created resources and close their sessions.
+    """
+
+    def test_thread_managers_are_released_after_the_run(self, monkeypatch):
+        """
+        Checks that load managers register nothing for cleanup and their sessions are closed when the run ends.
+        """
+        monkeypatch.setattr(loadgen_runner, "create_session", FakeSession)
+        managers = []
+
+        def scenario(api_manager, context):
+            managers.append(api_manager)
+
+        LoadRunner(scenario).run_closed([Stage(2, 0.3)])
+
+        assert managers
+        assert all(manager.cleanup_registry is None for manager in managers)
+        assert all(manager.movies_api.cleanup_registry is None and manager.auth_api.cleanup_registry is None
+                   for manager in managers)
+        assert all(manager.session.closed for manager in managers)
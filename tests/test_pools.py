@@ -0,0 +1,136 @@
+import base64
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from entities.user import User
+from requester.deadline import ContextThreadPoolExecutor
+from utils.movie_pool import MoviePool
+from utils.token_cache import TokenCache
+from utils.user_pool import UserPool
+
+
+def make_jwt(exp):
+    """Собирает неподписанный JWT с заданным exp."""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode()
+    return f"{encode({'alg': 'none'})}.{encode({'exp': exp})}.signature"
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.data = SimpleNamespace(**payload)
+
+    def json(self):
+        return self.payload
+
+
+class StubAsyncApi:
+    """Асинхронный ApiManager-заглушка: каждый третий запрос падает."""
+
+    def __init__(self):
+        self.calls = 0
+        self.auth_api = self
+        self.movies_api = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def _next(self, payload):
+        self.calls += 1
+        if self.calls % 3 == 0:
+            raise ConnectionError("service is down")
+        return StubResponse(payload)
+
+    async def register_user(self, user_data):
+        return self._next({"id": f"user-{self.calls}"})
+
+    async def login_user(self, login_payload, typed=False):
+        return StubResponse({"accessToken": "token"})
+
+    async def create_movie(self, payload, token):
+        return self._next({"id": self.calls, **payload})
+
+    async def change_user_role(self, user_id, roles, token):
+        return StubResponse({})
+
+
+class TestPools:
+    """
+    Tests for verifying that pools keep track of everything they created when a part of a batch fails.
+    """
+
+    def test_user_pool_keeps_registered_users_on_failure(self):
+        """
+        Checks that users registered before a failure are still deleted at the end of the session.
+        """
+        api = StubAsyncApi()
+        pool = UserPool(SimpleNamespace(create_async=lambda: api), "admin-token",
+                        user_data_factory=lambda: {"email": "a@b.c", "password": "Password1"}, batch_size=6)
+        with pytest.raises(ConnectionError):
+            pool.provision()
+        assert len(pool._created) == 4
+        assert len(pool._available["USER"]) == 4
+
+    def test_movie_pool_keeps_created_movies_on_failure(self):
+        """
+        Checks that movies created before a failure are still deleted at the end of the session.
+        """
+        api = StubAsyncApi()
+        pool = MoviePool(SimpleNamespace(create_async=lambda: api), "admin-token",
+                         movie_data_factory=lambda **fields: {"name": "Movie", **fields})
+        with pytest.raises(ConnectionError):
+            pool.provision([{"location": "MSK"}], count=6)
+        assert pool._created_ids == [movie["id"] for movie in pool._shared]
+        assert len(pool._created_ids) == 4
+
+    def test_expiring_token_is_refreshed_on_checkout(self):
+        """
+        Checks that a pooled user whose token expires within the refresh margin gets a new one on checkout.
+        """
+        fresh_token = make_jwt(int(time.time()) + 3600)
+        logins = []
+
+        def login_user(payload, typed=False):
+            logins.append(payload["email"])
+            return SimpleNamespace(data=SimpleNamespace(accessToken=fresh_token))
+
+        pool = UserPool(SimpleNamespace(auth_api=SimpleNamespace(login_user=login_user)), "admin-token",
+                        token_cache=TokenCache(refresh_margin=60))
+        expiring_token = make_jwt(int(time.time()) + 30)
+        user = User("pooled@mail.com", "Password1", ["USER"], None, user_id="u1", token=expiring_token)
+        pool.token_cache.get_token(user.email, user.password, lambda: expiring_token, role="USER")
+        pool.checkin(user)
+
+        assert pool.checkout("USER").token == fresh_token
+        pool.checkin(user)
+        assert pool.checkout("USER").token == fresh_token
+        assert logins == ["pooled@mail.com"]
+
+    def test_concurrent_checkout_hands_out_each_user_once(self):
+        """
+        Checks that users checked out from several threads are never handed out twice.
+        """
+        token = make_jwt(int(time.time()) + 3600)
+        pool = UserPool(SimpleNamespace(), "admin-token")
+        for number in range(200):
+            user = User(f"user{number}@mail.com", "Password1", ["USER"], None, user_id=number, token=token)
+            pool.token_cache.get_token(user.email, user.password, lambda: token, role="USER")
+            pool.checkin(user)
+        barrier = threading.Barrier(8)
+
+        def take(_):
+            barrier.wait()
+            return [pool.checkout("USER").id for _ in range(25)]
+
+        with ContextThreadPoolExecutor(max_workers=8) as executor:
+            taken = [user_id for ids in executor.map(take, range(8)) for user_id in ids]
+
+        assert sorted(taken) == list(range(200))
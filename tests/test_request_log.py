@@ -0,0 +1,111 @@
+import os
+import threading
+from pathlib import Path
+
+import requests
+
+from requester.deadline import ContextThreadPoolExecutor
+from requester.request_log import RequestLog
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Внутренний прогон: запрос получает 500 вместо 200, тест падает, буфер выводится в отчёт
+FAILING_TEST = """
+import requests
+from requests.adapters import BaseAdapter
+
+from requester.custom_requester import CustomRequester
+
+
+class ErrorAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 500
+        response._content = b'{"message": "boom"}'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def test_ok():
+    pass
+
+
+def test_fails():
+    session = requests.Session()
+    session.mount("http://log.test", ErrorAdapter())
+    CustomRequester(session, "http://log.test").send_request("GET", "/movies/42")
+"""
+
+
+def make_response(path):
+    request = requests.Request("GET", f"http://log.test{path}").prepare()
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"{}"
+    response.request = request
+    response.url = request.url
+    return response
+
+
+class TestRequestLog:
+    """
+    Tests for verifying the per-test buffer of requests and its deferred rendering.
+    """
+
+    def test_pool_threads_write_into_the_buffer_of_their_test(self):
+        """
+        Checks that requests of a pool thread land in the buffer of the test that started it,
+        even when the thread finishes after the next test has started.
+        """
+        log = RequestLog(maxlen=10)
+        release = threading.Event()
+        log.start("test_first")
+        with ContextThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(lambda: (release.wait(), log.capture(make_response("/late"))))
+            log.start("test_second")
+            log.capture(make_response("/own"))
+            release.set()
+            future.result()
+
+        rendered = log.render()
+        assert len(log) == 1
+        assert "/own" in rendered and "/late" not in rendered
+
+    def test_concurrent_capture_counts_dropped_responses(self):
+        """
+        Checks that concurrent captures keep the buffer bounded and count every dropped response.
+        """
+        log = RequestLog(maxlen=5)
+        log.start("test_concurrent")
+        response = make_response("/movies")
+
+        def capture_many():
+            for _ in range(200):
+                log.capture(response)
+
+        with ContextThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(8):
+                executor.submit(capture_many)
+
+        assert len(log) == 5
+        assert log.dropped == 8 * 200 - 5
+        assert "1595 earlier request(s) dropped" in log.render()
+
+    def test_failed_test_report_contains_captured_requests(self, pytester, monkeypatch):
+        """
+        Checks that in deferred mode the requests are rendered only into the report of the failed test.
+        """
+        monkeypatch.setenv("PYTHONPATH", os.pathsep.join([str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]))
+        monkeypatch.setenv("REQUEST_LOG_MODE", "deferred")
+        pytester.makepyfile(test_requests=FAILING_TEST)
+
+        result = pytester.runpytest_subprocess("-p", "plugins.request_log", "-p", "no:cacheprovider",
+                                               "-o", "log_cli=0")
+
+        result.assert_outcomes(passed=1, failed=1)
+        result.stdout.fnmatch_lines(["*Captured requests call*", "*curl*http://log.test/movies/42*"])
+        assert result.stdout.str().count("Captured requests") == 1
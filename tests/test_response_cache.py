@@ -0,0 +1,126 @@
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+
+from requester.custom_requester import CustomRequester
+from requester.response_cache import ResponseCache
+
+
+def make_response(status=200, body=b'{"movies": []}', headers=None, url="http://cache.test/movies"):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.url = url
+    return response
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Транспорт requests, отвечающий заранее заданными ответами и запоминающий запросы."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_requester(responses):
+    session = requests.Session()
+    adapter = ScriptedAdapter(responses)
+    session.mount("http://cache.test", adapter)
+    requester = CustomRequester(session, "http://cache.test")
+    return requester, requester.enable_response_cache(ResponseCache(max_entries=10, ttl=60)), adapter
+
+
+class TestResponseCache:
+    """
+    Tests for verifying the client-side cache of GET responses.
+    """
+
+    def test_lru_eviction(self):
+        """
+        Checks that the least recently used entry is evicted first.
+        """
+        cache = ResponseCache(max_entries=2, ttl=60)
+        for name in ("a", "b"):
+            cache.store((name, (), None), make_response())
+        cache.lookup(("a", (), None))
+        cache.store(("c", (), None), make_response())
+        assert cache.lookup(("b", (), None)) is None
+        assert cache.lookup(("a", (), None)) is not None and cache.lookup(("c", (), None)) is not None
+
+    def test_ttl_expiry(self):
+        """
+        Checks that an entry is fresh within the TTL and stale after it.
+        """
+        cache = ResponseCache(max_entries=2, ttl=60)
+        cache.store(("a", (), None), make_response())
+        entry = cache.lookup(("a", (), None))
+        assert cache.is_fresh(entry)
+        entry.stored_at -= 61
+        assert not cache.is_fresh(entry)
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        """
+        Checks that a stale entry is revalidated with If-None-Match and reused on 304.
+        """
+        requester, cache, adapter = make_requester([
+            make_response(headers={"ETag": '"v1"'}),
+            make_response(status=304, body=b"", headers={"ETag": '"v1"'}),
+        ])
+        first = requester.send_request("GET", "/movies", need_logging=False)
+        assert requester.send_request("GET", "/movies", need_logging=False) is first
+        assert len(adapter.requests) == 1, "A fresh entry must be served without a request"
+
+        cache.lookup(cache.make_key("http://cache.test/movies", None, requester.headers)).stored_at -= 61
+        assert requester.send_request("GET", "/movies", need_logging=False).content == first.content
+        assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+        assert cache.stats()["revalidations"] == 1
+
+    def test_write_invalidates_resource_and_collection(self):
+        """
+        Checks that a POST through the same client drops the cached collection.
+        """
+        requester, cache, adapter = make_requester([
+            make_response(), make_response(status=201, body=b'{"id": 1}'), make_response(body=b'{"movies": [1]}'),
+        ])
+        requester.send_request("GET", "/movies", need_logging=False)
+        requester.send_request("POST", "/movies", data={"name": "x"}, need_logging=False)
+        assert requester.send_request("GET", "/movies", need_logging=False).json() == {"movies": [1]}
+        assert len(adapter.requests) == 3
+
+    def test_concurrent_access(self):
+        """
+        Checks that concurrent lookups, stores and invalidations do not break the cache.
+        """
+        cache = ResponseCache(max_entries=50, ttl=60)
+        errors = []
+
+        def work(worker):
+            try:
+                for i in range(2000):
+                    url = f"http://cache.test/movies/{(i + worker) % 100}"
+                    cache.store((url, (), None), make_response())
+                    cache.lookup((url, (), None))
+                    if i % 10 == 0:
+                        cache.invalidate(url)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert cache.stats()["entries"] <= 50
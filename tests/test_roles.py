@@ -1,45 +1,80 @@
 import pytest
 
+from data_generator import get_bulk_generator
+from enums.roles import Roles
+from utils.rbac_matrix import ANY_STATUS, MatrixEndpoint
+
+USER, ADMIN, SUPER_ADMIN = Roles.USER.value, Roles.ADMIN.value, Roles.SUPER_ADMIN.value
+
+
+def _create_movie(matrix):
+    """Фильм, созданный супер-админом (удаляется реестром очистки после модуля)."""
+    return matrix.api_manager.movies_api.create_movie(get_bulk_generator().movie(),
+                                                      matrix.tokens[SUPER_ADMIN]).json()["id"]
+
+
+def _register_user(matrix):
+    """Новый пользователь (удаляется реестром очистки после модуля)."""
+    return matrix.api_manager.auth_api.register_user(get_bulk_generator().user()).json()["id"]
+
+
+RBAC_MATRIX = [
+    MatrixEndpoint(
+        "GET /movies",
+        lambda api, token, _: api.movies_api.send_request(
+            "GET", "/movies", headers={"Authorization": f"Bearer {token}"}, expected_status=ANY_STATUS),
+        {USER: 200, ADMIN: 200, SUPER_ADMIN: 200},
+    ),
+    MatrixEndpoint(
+        "GET /movies/{id}",
+        lambda api, token, movie_id: api.movies_api.send_request(
+            "GET", f"/movies/{movie_id}", headers={"Authorization": f"Bearer {token}"}, expected_status=ANY_STATUS),
+        {USER: 200, ADMIN: 200, SUPER_ADMIN: 200},
+        resource=_create_movie,
+    ),
+    MatrixEndpoint(
+        "POST /movies",
+        lambda api, token, _: api.movies_api.create_movie(get_bulk_generator().movie(), token,
+                                                          expected_status=ANY_STATUS),
+        {USER: 403, ADMIN: 201, SUPER_ADMIN: 201},
+    ),
+    MatrixEndpoint(
+        "DELETE /movies/{id}",
+        lambda api, token, movie_id: api.movies_api.delete_movie(movie_id, token, expected_status=ANY_STATUS),
+        {USER: 403, ADMIN: 403, SUPER_ADMIN: 200},
+        resource=_create_movie,
+        exclusive=True,
+    ),
+    MatrixEndpoint(
+        "GET /user/{id}",
+        lambda api, token, user_id: api.auth_api.send_request(
+            "GET", f"/user/{user_id}", headers={"Authorization": f"Bearer {token}"}, expected_status=ANY_STATUS),
+        {USER: 403, ADMIN: 200, SUPER_ADMIN: 200},
+        resource=_register_user,
+    ),
+    MatrixEndpoint(
+        "DELETE /user/{id}",
+        lambda api, token, user_id: api.auth_api.send_request(
+            "DELETE", f"/user/{user_id}", headers={"Authorization": f"Bearer {token}"}, expected_status=ANY_STATUS),
+        {USER: 403, ADMIN: 200, SUPER_ADMIN: 200},
+        resource=_register_user,
+        exclusive=True,
+    ),
+]
+
+CELLS = [(endpoint.name, role) for endpoint in RBAC_MATRIX for role in endpoint.expected]
+
+
+# С --dist loadgroup все ячейки попадают в один воркер, и матрица выполняется один раз
+@pytest.mark.xdist_group("rbac_matrix")
 class TestRoles:
-    @pytest.mark.parametrize("role, expected_status", [
-        ("USER", [403]),       # Пользователь с ролью USER не может удалять фильмы
-        ("SUPER_ADMIN", [200, 201])         # SUPER_ADMIN может удалять фильмы
-    ])
-    def test_delete_movie_by_role(self, api_manager, user_create, movie_data, super_admin_token, role, expected_status):
+    @pytest.mark.parametrize("endpoint, role", CELLS, ids=[f"{role}-{endpoint}" for endpoint, role in CELLS])
+    def test_permission(self, rbac_matrix, endpoint, role):
         """
-        Проверяет, какие роли могут удалять фильмы.
-        Для SUPER_ADMIN фильм создаётся с его же токеном.
-        Для USER фильм создаётся через супер-админа (чтобы гарантировать, что он существует),
-        а попытка удаления от имени USER должна вернуть статус 403.
+        Проверяет ячейку матрицы прав: статус ответа для роли должен совпадать с ожидаемым.
+        Все ячейки выполняются параллельно при первом обращении, ресурсы только для чтения общие,
+        а фильмы и пользователи для удаления создаются отдельно на каждую роль.
         """
-        user = user_create(role)
-
-        if role == "SUPER_ADMIN":
-            # Создаем фильм от имени SUPER_ADMIN
-            movie_data_local = movie_data.copy()
-            movie_data_local["name"] = f"{role} Movie to Delete)"
-            create_response = api_manager.movies_api.create_movie(movie_data_local, user.token)
-            assert create_response.status_code in [200, 201], (
-                f"{role} должен создавать фильм, но получил {create_response.status_code}"
-            )
-            movie_id = create_response.json()["id"]
-        else:  # role == "USER"
-            # Создаем фильм через супер-админа, чтобы фильм точно существовал
-            create_response = api_manager.movies_api.create_movie(movie_data, super_admin_token)
-            assert create_response.status_code in [200, 201], (
-                f"Movie creation via super admin failed: {create_response.status_code}"
-            )
-            movie_id = create_response.json()["id"]
-
-        # Пытаемся удалить фильм с использованием токена созданного пользователя
-        delete_response = api_manager.movies_api.delete_movie(movie_id, user.token, expected_status=expected_status)
-        assert delete_response.status_code in expected_status, (
-            f"{role} должен получить статус {expected_status}, но получил {delete_response.status_code}"
-        )
-
-        # Если удаление не произошло (для USER), делаем cleanup от имени супер-админа
-        if delete_response.status_code not in [200, 201]:
-            cleanup_response = api_manager.movies_api.delete_movie(movie_id, super_admin_token)
-            assert cleanup_response.status_code in [200, 201], (
-                f"Cleanup deletion failed: {cleanup_response.status_code}"
-            )
+        result = rbac_matrix.result(RBAC_MATRIX, endpoint, role)
+        assert result.error is None, f"{role} {endpoint}: request failed - {result.error}"
+        assert result.ok, f"{role} должен получить статус {result.expected} на {endpoint}, но получил {result.status}"
@@ -0,0 +1,70 @@
+import base64
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from utils.token_cache import TokenCache
+
+
+def make_jwt(exp):
+    """Собирает неподписанный JWT с заданным exp."""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode()
+    return f"{encode({'alg': 'none'})}.{encode({'exp': exp})}.signature"
+
+
+class TestTokenCache:
+    """
+    Tests for verifying the token cache.
+    """
+
+    def test_token_is_reused_until_expiry(self, tmp_path):
+        """
+        Checks that a fresh token is taken from the cache and login is called once.
+        """
+        cache = TokenCache(tmp_path / "tokens.json")
+        token = make_jwt(int(time.time()) + 3600)
+        calls = []
+
+        def login():
+            calls.append(1)
+            return token
+
+        assert cache.get_token("user@mail.com", "password1", login) == token
+        assert cache.get_token("user@mail.com", "password1", login) == token
+        assert len(calls) == 1
+
+    def test_token_is_shared_through_store(self, tmp_path):
+        """
+        Checks that another cache instance (another worker) reads the token from disk.
+        """
+        token = make_jwt(int(time.time()) + 3600)
+        TokenCache(tmp_path / "tokens.json").get_token("user@mail.com", "password1", lambda: token)
+
+        other_worker_cache = TokenCache(tmp_path / "tokens.json")
+        assert other_worker_cache.get_token("user@mail.com", "password1", lambda: "new-token") == token
+        assert other_worker_cache.logins == 0
+
+    def test_token_is_refreshed_ahead_of_expiry(self, tmp_path):
+        """
+        Checks that a token expiring within the refresh margin is replaced.
+        """
+        cache = TokenCache(tmp_path / "tokens.json", refresh_margin=60)
+        expiring_token = make_jwt(int(time.time()) + 30)
+        new_token = make_jwt(int(time.time()) + 3600)
+
+        cache.get_token("user@mail.com", "password1", lambda: expiring_token)
+        assert cache.get_token("user@mail.com", "password1", lambda: new_token) == new_token
+
+    @pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX-only")
+    def test_store_is_readable_by_owner_only(self, tmp_path):
+        """
+        Checks that the on-disk store with plain tokens is created with 0600 permissions.
+        """
+        TokenCache(tmp_path / "tokens.json").get_token("user@mail.com", "password1",
+                                                       lambda: make_jwt(int(time.time()) + 3600))
+
+        assert stat.S_IMODE(os.stat(tmp_path / "tokens.json").st_mode) == 0o600
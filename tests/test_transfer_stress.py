@@ -0,0 +1,25 @@
+import pytest
+
+from utils.transfer_stress import STRATEGIES, TransferStress
+
+
+class TestTransferStress:
+    """
+    Tests for verifying concurrent transfers between AccountTransactionTemplate accounts.
+    """
+
+    @pytest.mark.parametrize("strategy", list(STRATEGIES))
+    def test_total_balance_is_conserved(self, db_engine, strategy):
+        """
+        Checks that concurrent transfers neither lose nor create money.
+        """
+        stress = TransferStress(db_engine, accounts=5, initial_balance=1000, workers=4, seed=1)
+        stress.setup()
+        try:
+            result = stress.run(strategy, transfers=200)
+        finally:
+            stress.teardown()
+
+        assert result.failed == 0, f"Transfers failed: {result}"
+        assert result.committed + result.rejected == result.transfers, f"Lost transfers: {result}"
+        assert result.conserved, f"Total balance changed: {result.initial_total} -> {result.final_total}"
@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from constants import HTTP_CONNECT_TIMEOUT, HTTP_POOL_MAXSIZE, HTTP_READ_TIMEOUT, HTTP_RETRY_BACKOFF_FACTOR, \
+    HTTP_RETRY_BACKOFF_JITTER, LOGIN_ENDPOINT
+from requester import transport
+from requester.async_custom_requester import AsyncCustomRequester
+from requester.deadline import deadline
+from requester.transport import create_session, create_async_client, backoff_delay, get_timeout, retry_delay
+
+
+class ScriptedServer:
+    """
+    Локальный HTTP-сервер, отвечающий статусами из списка (последний повторяется).
+    Элемент списка - статус или (статус, заголовки); сервер считает запросы и клиентские соединения.
+    """
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status = server.statuses[min(server.requests, len(server.statuses) - 1)]
+                status, headers = status if isinstance(status, tuple) else (status, {})
+                server.requests += 1
+                server.connections.add(self.client_address)
+                if self.headers.get("Content-Length"):
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            do_POST = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def session_factory():
+    """
+    Фикстура, создающая сессии транспорта и закрывающая их после теста.
+    """
+    sessions = []
+
+    def _create(**kwargs):
+        sessions.append(create_session(**kwargs))
+        return sessions[-1]
+
+    yield _create
+    for session in sessions:
+        session.close()
+
+
+class TestTransport:
+    """
+    Tests for verifying the HTTP transport: retry policy and connection pools.
+    """
+
+    def test_unavailable_service_is_retried(self, session_factory):
+        """
+        Checks that 503 of an idempotent request is retried by the default session.
+        """
+        with ScriptedServer([503, 200]) as server:
+            response = session_factory().get(f"{server.url}/movies")
+
+        assert response.status_code == 200
+        assert server.requests == 2
+
+    def test_session_without_retries_returns_first_response(self, session_factory):
+        """
+        Checks that create_session(retries=0) returns the error as is and sends the request once.
+        """
+        with ScriptedServer([503, 200]) as server:
+            response = session_factory(retries=0).get(f"{server.url}/movies")
+
+        assert response.status_code == 503
+        assert server.requests == 1
+
+    def test_retries_stop_at_the_deadline(self, session_factory):
+        """
+        Checks that the sync session does not start a retry whose backoff would end after the deadline.
+        """
+        session = session_factory()
+        with ScriptedServer([503]) as server, deadline(1):
+            start = time.monotonic()
+            response = session.get(f"{server.url}/movies")
+            elapsed = time.monotonic() - start
+
+        assert response.status_code == 503
+        assert server.requests == 2
+        assert elapsed < 1
+
+    def test_non_idempotent_request_is_not_retried(self, session_factory):
+        """
+        Checks that 503 of a POST is returned as is: the request may have been applied.
+        """
+        with ScriptedServer([503, 200]) as server:
+            response = session_factory().post(f"{server.url}/movies", json={})
+
+        assert response.status_code == 503
+        assert server.requests == 1
+
+    @pytest.mark.parametrize("method, expected_status, expected_requests", [("GET", 200, 2), ("POST", 503, 1)])
+    def test_async_client_retries_like_sync_session(self, method, expected_status, expected_requests):
+        """
+        Checks that AsyncCustomRequester retries 503 only for idempotent methods, like the sync session.
+        """
+
+        async def send(url):
+            async with create_async_client() as client:
+                requester = AsyncCustomRequester(client, url)
+                requester.circuit_breaker_enabled = False
+                return await requester.send_request(method, "/movies", data={}, expected_status=(200, 503))
+
+        with ScriptedServer([503, 200]) as server:
+            response = asyncio.run(send(server.url))
+
+        assert response.status_code == expected_status
+        assert server.requests == expected_requests
+
+    def test_sequential_requests_share_one_pooled_connection(self, session_factory):
+        """
+        Checks that keep-alive connections are pooled: sequential requests use one connection.
+        """
+        session = session_factory()
+        with ScriptedServer([200]) as server:
+            for _ in range(5):
+                session.get(f"{server.url}/movies")
+
+        assert server.requests == 5
+        assert len(server.connections) == 1
+        assert session.get_adapter(server.url)._pool_maxsize == HTTP_POOL_MAXSIZE
+
+    def test_endpoint_timeouts_use_longest_prefix(self, monkeypatch):
+        """
+        Checks that the timeout of the longest matching endpoint prefix wins over the defaults.
+        """
+        assert get_timeout(LOGIN_ENDPOINT) == (HTTP_CONNECT_TIMEOUT, 10)
+
+        monkeypatch.setattr(transport, "ENDPOINT_TIMEOUTS", {"/movies": (1, 5), "/movies/": (1, 7)})
+        assert get_timeout("/movies/42") == (1, 7)
+        assert get_timeout("/movies?page=2") == (1, 5)
+        assert get_timeout(LOGIN_ENDPOINT) == (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    def test_backoff_delay_is_exponential_with_jitter(self, monkeypatch):
+        """
+        Checks that the first retry is immediate and the next ones grow exponentially plus jitter.
+        """
+        monkeypatch.setattr(transport.random, "uniform", lambda low, high: high)
+
+        assert backoff_delay(1) == 0
+        assert backoff_delay(2) == pytest.approx(HTTP_RETRY_BACKOFF_FACTOR * 2 + HTTP_RETRY_BACKOFF_JITTER)
+        assert backoff_delay(3) == pytest.approx(HTTP_RETRY_BACKOFF_FACTOR * 4 + HTTP_RETRY_BACKOFF_JITTER)
+        assert backoff_delay(100) == transport.Retry.DEFAULT_BACKOFF_MAX
+
+    def test_retry_after_of_unavailable_service_is_honoured(self):
+        """
+        Checks that Retry-After of a 503 response overrides the backoff, as urllib3 does for the sync session.
+        """
+        class Response:
+            def __init__(self, status_code, headers):
+                self.status_code = status_code
+                self.headers = headers
+
+        assert retry_delay(2, Response(503, {"Retry-After": "3"})) == 3
+        assert retry_delay(1, Response(502, {"Retry-After": "3"})) == 0
+        assert retry_delay(1, Response(503, {"Retry-After": "soon"})) == 0
+        assert retry_delay(1) == 0
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from models.response_models import MovieList
+from requester.typed_response import TypedResponse
+
+
+class TestTypedResponse:
+    """
+    Tests for verifying the parse-once response wrapper.
+    """
+
+    def test_body_is_validated_once(self):
+        """
+        Checks that the model is built from raw bytes once and the wrapped response stays accessible.
+        """
+        raw = SimpleNamespace(status_code=200, content=b'{"movies": [{"id": 1, "name": "Movie", "price": 100}], '
+                                                       b'"count": 1, "pageCount": 1}')
+        response = TypedResponse(raw, MovieList)
+
+        assert response.data is response.data
+        assert response.data.movies[0].name == "Movie"
+        assert response.json() is response.json()
+        assert response.status_code == 200
+
+    def test_json_and_data_share_one_parse(self, monkeypatch):
+        """
+        Checks that data built after json() reuses the parsed dictionary instead of parsing the bytes again.
+        """
+        import requester.typed_response as typed_response
+
+        calls = []
+        monkeypatch.setattr(typed_response, "loads", lambda content: calls.append(content) or
+                            {"movies": [], "count": 0, "pageCount": 0})
+        monkeypatch.setattr(MovieList, "model_validate_json", classmethod(lambda cls, content: calls.append(content)))
+        response = TypedResponse(SimpleNamespace(status_code=200, content=b'{}'), MovieList)
+
+        assert response.json()["count"] == 0
+        assert response.data.count == 0
+        assert len(calls) == 1
+
+    def test_typed_create_registers_id_from_the_model(self):
+        """
+        Checks that a typed create_movie registers the created id without parsing the body into a dictionary.
+        """
+        from api.movies_api import MoviesAPI
+        from utils.cleanup_registry import CleanupRegistry, MOVIE
+
+        body = b'{"id": 7, "name": "Movie", "price": 100}'
+        api = MoviesAPI(None, base_url="http://typed.test")
+        api.send_request = lambda **kwargs: SimpleNamespace(status_code=201, content=body)
+        api.cleanup_registry = CleanupRegistry()
+
+        response = api.create_movie({"name": "Movie"}, "token", typed=True)
+
+        assert api.cleanup_registry.pending() == [(MOVIE, 7)]
+        assert "_json" not in response.__dict__
@@ -0,0 +1,134 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from constants import CLEANUP_MAX_WORKERS
+from requester.deadline import ContextThreadPoolExecutor
+
+MOVIE = "movie"
+USER = "user"
+
+
+class CleanupRegistry:
+    """
+    Registry of resources created through the API clients.
+    AuthAPI.register_user and MoviesAPI.create_movie record created ids here,
+    successful deletes remove them. teardown() deletes everything registered for a scope
+    concurrently (thread pool) through the API or in bulk through SQL.
+    """
+
+    SCOPES = ("function", "module", "session")
+
+    def __init__(self, max_workers=CLEANUP_MAX_WORKERS):
+        """
+        :param max_workers: Number of threads used for API deletion.
+        """
+        self.max_workers = max_workers
+        self.token_provider = None  # Callable, returning a token allowed to delete resources
+        self.deleters = {}  # Тип ресурса -> функция удаления (resource_id, token)
+        self._entries = {}  # (тип, id) -> scope
+        self._lock = threading.Lock()
+        # Текущий scope живёт в контексте: потоки ContextThreadPoolExecutor и asyncio-задачи наследуют его,
+        # а блоки scope() в разных потоках не мешают друг другу
+        self._scope = contextvars.ContextVar(f"cleanup_scope_{id(self)}", default="function")
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, kind, resource_id, scope=None):
+        """
+        Records a created resource.
+        :param kind: Resource type (MOVIE or USER).
+        :param resource_id: Resource identifier.
+        :param scope: Scope after which the resource is deleted (default - the current one).
+        """
+        with self._lock:
+            self._entries[(kind, resource_id)] = scope or self._scope.get()
+
+    def discard(self, kind, resource_id):
+        """
+        Forgets a resource (e.g. after the test deleted it itself).
+        """
+        with self._lock:
+            self._entries.pop((kind, resource_id), None)
+
+    @contextmanager
+    def scope(self, scope):
+        """
+        Resources created inside the block are registered with the given scope.
+        :param scope: "function", "module" or "session".
+        """
+        if scope not in self.SCOPES:
+            raise ValueError(f"Unsupported cleanup scope: {scope}")
+        token = self._scope.set(scope)
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+
+    def pending(self, scope=None):
+        """
+        Returns the registered resources.
+        :param scope: Filter by scope (None - all scopes).
+        :return: List of (kind, resource_id) tuples.
+        """
+        with self._lock:
+            return [key for key, entry_scope in self._entries.items() if scope is None or entry_scope == scope]
+
+    def teardown(self, scope, db_session=None):
+        """
+        Deletes all resources of the scope.
+        :param scope: "function", "module" or "session".
+        :param db_session: SQLAlchemy session; if passed, resources are deleted in bulk via SQL.
+        :return: Dictionary with deleted and leaked resources and the teardown time.
+        """
+        keys = self.pending(scope)
+        if not keys:
+            return {"deleted": [], "leaked": [], "elapsed": 0.0}
+
+        start = time.perf_counter()
+        if db_session is not None:
+            leaked = self._delete_via_db(keys, db_session)
+        else:
+            leaked = self._delete_via_api(keys)
+        elapsed = time.perf_counter() - start
+
+        for key in keys:
+            if key not in leaked:
+                self.discard(*key)
+        deleted = [key for key in keys if key not in leaked]
+        self.logger.info(f"Cleanup [{scope}]: deleted {len(deleted)} resource(s) in {elapsed:.3f}s"
+                         + (f", leaked: {leaked}" if leaked else ""))
+        return {"deleted": deleted, "leaked": leaked, "elapsed": elapsed}
+
+    def _delete_via_api(self, keys):
+        token = self.token_provider()
+
+        def delete(key):
+            kind, resource_id = key
+            self.deleters[kind](resource_id, token)
+
+        leaked = []
+        with ContextThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {key: executor.submit(delete, key) for key in keys}
+        for key, future in futures.items():
+            if future.exception() is not None:
+                self.logger.info(f"Cleanup: failed to delete {key[0]} {key[1]}: {future.exception()}")
+                leaked.append(key)
+        return leaked
+
+    @staticmethod
+    def _delete_via_db(keys, db_session):
+        from models.db_models import MovieDBModel, UserDBModel
+
+        models = {MOVIE: MovieDBModel, USER: UserDBModel}
+        try:
+            for kind, model in models.items():
+                ids = [str(resource_id) for key_kind, resource_id in keys if key_kind == kind]
+                if ids:
+                    db_session.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            return list(keys)
+        return []
@@ -0,0 +1,128 @@
+import datetime
+import os
+import tempfile
+import uuid
+
+from constants import (HOST, PORT, DATABASE_NAME, USERNAME_SQL, PASSWORD, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                       DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_TIMEOUT, DB_BACKEND, SQLITE_PATH, DB_SEED_ROWS)
+
+_temporary_files = set()  # Временные файлы SQLite, удаляемые в dispose_db_engine
+
+
+def create_db_engine(**overrides):
+    """
+    Creates the SQLAlchemy engine of the test database (DB_BACKEND) with the DB_POOL_* settings.
+    SQLAlchemy and the driver are imported here, not at module import.
+    :param overrides: create_engine keyword arguments overriding the defaults (e.g. pool_size).
+    :return: sqlalchemy.engine.Engine object.
+    """
+    if DB_BACKEND == "sqlite":
+        return create_sqlite_engine(SQLITE_PATH, **overrides)
+
+    from sqlalchemy import create_engine
+
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        **overrides,
+    }
+    return create_engine(f"postgresql+psycopg2://{USERNAME_SQL}:{PASSWORD}@{HOST}:{PORT}/{DATABASE_NAME}", **options)
+
+
+def create_sqlite_engine(path=SQLITE_PATH, seed_rows=DB_SEED_ROWS, **overrides):
+    """
+    Creates an embedded SQLite stand-in of the service database with the schema of models.db_models,
+    seeded with genres, movies and users.
+    :param path: Database file; "" - a temporary file of this process (so xdist workers do not share it),
+                 ":memory:" - one in-memory connection (fastest, but not for concurrent threads).
+    :param seed_rows: Number of movies and users inserted in bulk.
+    :param overrides: create_engine keyword arguments overriding the defaults.
+    :return: sqlalchemy.engine.Engine object.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import StaticPool
+
+    from models.db_models import Base
+
+    options = {"connect_args": {"check_same_thread": False, "timeout": DB_POOL_TIMEOUT}}
+    if path == ":memory:":
+        url = "sqlite://"
+        options["poolclass"] = StaticPool
+    else:
+        if not path:
+            file_descriptor, path = tempfile.mkstemp(prefix="demo_qa_", suffix=".db")
+            os.close(file_descriptor)
+            _temporary_files.add(path)
+        url = f"sqlite:///{path}"
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    options.update(overrides)
+    engine = create_engine(url, **options)
+
+    # pysqlite сам открывает транзакцию только перед изменениями, из-за чего не работают SAVEPOINT
+    # и чтение вне транзакции; отключаем это и начинаем транзакцию явно (рецепт из документации SQLAlchemy)
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys = ON")
+        dbapi_connection.execute("PRAGMA synchronous = OFF")
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    seed_database(engine, seed_rows)
+    return engine
+
+
+def dispose_db_engine(engine):
+    """
+    Closes the pool of the engine and removes its temporary SQLite file, if any.
+    :param engine: SQLAlchemy engine.
+    """
+    engine.dispose()
+    path = engine.url.database
+    if path in _temporary_files:
+        _temporary_files.discard(path)
+        os.remove(path)
+
+
+def seed_database(engine, rows):
+    """
+    Bulk-inserts genres and `rows` movies and users (one executemany per table).
+    An already seeded database (an existing SQLITE_PATH file) is left as is.
+    :param engine: SQLAlchemy engine.
+    :param rows: Number of movies and users.
+    """
+    from sqlalchemy import func, select
+
+    from data_generator import get_bulk_generator
+    from models.db_models import GenreDBModel, MovieDBModel, UserDBModel
+
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(GenreDBModel.__table__)).scalar_one():
+            return
+
+    generator = get_bulk_generator()
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    genres = [{"id": str(genre_id), "name": f"Genre {genre_id}"} for genre_id in range(1, 11)]
+    movies = [
+        {"id": str(uuid.uuid4()), "name": movie["name"], "description": movie["description"], "price": movie["price"],
+         "genre_id": str(movie["genreId"]), "image_url": movie["imageUrl"], "location": movie["location"],
+         "rating": 0, "published": movie["published"], "created_at": now}
+        for movie in generator.movies(rows)
+    ]
+    users = [
+        {"id": str(uuid.uuid4()), "email": user["email"], "full_name": user["fullName"], "password": user["password"],
+         "created_at": now, "updated_at": now, "verified": True, "banned": False, "roles": "USER"}
+        for user in generator.users(rows)
+    ]
+    with engine.begin() as connection:
+        connection.execute(GenreDBModel.__table__.insert(), genres)
+        if movies:
+            connection.execute(MovieDBModel.__table__.insert(), movies)
+        if users:
+            connection.execute(UserDBModel.__table__.insert(), users)
@@ -0,0 +1,113 @@
+import time
+from collections import defaultdict
+
+from constants import DB_POLL_TIMEOUT, DB_POLL_INITIAL_DELAY, DB_POLL_MAX_DELAY
+
+
+class _Check:
+    def __init__(self, column, value, present, count, fields):
+        self.column = column
+        self.value = value
+        self.present = present
+        self.count = count
+        self.fields = fields
+        self.rows = []
+
+    def describe(self):
+        model = self.column.class_.__name__
+        state = f"{self.count} row(s)" if self.present else "no rows"
+        fields = f" with {self.fields}" if self.fields else ""
+        return f"{model}.{self.column.key} == {self.value!r}: expected {state}{fields}, got {len(self.rows)}"
+
+    def is_met(self):
+        if not self.present:
+            return not self.rows
+        if len(self.rows) != self.count:
+            return False
+        return all(getattr(row, name) == expected for row in self.rows for name, expected in self.fields.items())
+
+
+class DbExpectations:
+    """
+    Batched checks of rows written by the services.
+    Pending "row exists"/"row is absent" expectations are resolved with one `column IN (...)` query
+    per table and column; until all of them are met the query is repeated with exponential backoff
+    (the services may write asynchronously) or an AssertionError is raised after the timeout.
+    """
+
+    def __init__(self, session, timeout=DB_POLL_TIMEOUT, initial_delay=DB_POLL_INITIAL_DELAY,
+                 max_delay=DB_POLL_MAX_DELAY):
+        """
+        :param session: SQLAlchemy session.
+        :param timeout: How long to wait for the expected state, seconds (0 - check once).
+        :param initial_delay: First pause between polls, seconds.
+        :param max_delay: Upper bound of the pause between polls, seconds.
+        """
+        self.session = session
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.queries = 0
+        self._checks = []
+
+    def expect_present(self, column, value, count=1, **fields):
+        """
+        Expects `count` rows with column == value (and the given field values).
+        :param column: Model column, e.g. MovieDBModel.name.
+        :param value: Column value.
+        :param count: Expected number of rows.
+        :param fields: Expected attribute values of the rows.
+        :return: self, so checks can be chained.
+        """
+        self._checks.append(_Check(column, value, True, count, fields))
+        return self
+
+    def expect_absent(self, column, value):
+        """
+        Expects no rows with column == value.
+        :return: self, so checks can be chained.
+        """
+        self._checks.append(_Check(column, value, False, 0, {}))
+        return self
+
+    def verify(self, timeout=None):
+        """
+        Resolves all pending expectations and clears them.
+        :param timeout: Overrides the timeout for this call (0 - check the current state once).
+        :return: List of matched rows per check (in the order the checks were added).
+        """
+        checks, self._checks = self._checks, []
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        delay = self.initial_delay
+        pending = checks
+        while True:
+            self._fetch(pending)
+            pending = [check for check in pending if not check.is_met()]
+            if not pending:
+                return [check.rows for check in checks]
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise AssertionError("DB state did not converge:\n" + "\n".join(check.describe() for check in pending))
+            # Завершаем читающую транзакцию: иначе запись сервиса может быть не видна
+            # (снимок транзакции) или заблокирована (SQLite) до конца ожидания
+            self.session.commit()
+            # Последняя пауза укорачивается, чтобы опросить базу ровно в момент дедлайна
+            time.sleep(min(delay, left))
+            delay = min(delay * 2, self.max_delay)
+
+    def _fetch(self, checks):
+        # Объекты из identity map сессии могли устареть - перечитываем их из базы
+        self.session.expire_all()
+        # Ключ - (модель, имя колонки): сами атрибуты модели перегружают == и не годятся в ключи словаря
+        groups = defaultdict(list)
+        for check in checks:
+            groups[(check.column.class_, check.column.key)].append(check)
+        for group in groups.values():
+            column = group[0].column
+            rows = self.session.query(column.class_).filter(column.in_(list({check.value: None for check in group}))).all()
+            self.queries += 1
+            by_value = defaultdict(list)
+            for row in rows:
+                by_value[getattr(row, column.key)].append(row)
+            for check in group:
+                check.rows = by_value.get(check.value, [])
@@ -0,0 +1,97 @@
+import fnmatch
+import statistics
+
+from constants import TEST_IMPACT_SMOOTHING
+
+
+class ImpactData:
+    """
+    Wall time and touched endpoints ("GET /movies/{id}") of every test, collected over previous runs.
+    Stored as {"tests": {test id: {"duration": seconds, "endpoints": [...]}}} in a SharedJsonStore.
+    """
+
+    def __init__(self, tests=None):
+        """
+        :param tests: Dictionary test id -> {"duration": float, "endpoints": list}.
+        """
+        self.tests = tests or {}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(dict(data.get("tests", {})))
+
+    def to_dict(self):
+        return {"tests": self.tests}
+
+    def update(self, test_id, duration, endpoints, smoothing=TEST_IMPACT_SMOOTHING):
+        """
+        Records the result of a run: the duration is smoothed with the previous one, endpoints are replaced.
+        :param test_id: Test node id (without the xdist_group suffix).
+        :param duration: Wall time of setup + call + teardown, seconds.
+        :param endpoints: Collection of endpoint names touched by the test.
+        :param smoothing: Weight of the new duration (1 - keep only the last run).
+        """
+        previous = self.tests.get(test_id)
+        if previous is not None:
+            duration = smoothing * duration + (1 - smoothing) * previous["duration"]
+        self.tests[test_id] = {"duration": round(duration, 4), "endpoints": sorted(endpoints)}
+
+    def duration(self, test_id, default=None):
+        """
+        Returns the known duration of the test or the default (median of the known ones if not passed).
+        """
+        entry = self.tests.get(test_id)
+        if entry is not None:
+            return entry["duration"]
+        return self.median_duration() if default is None else default
+
+    def median_duration(self):
+        """
+        Median duration of the known tests (expected duration of a new test), seconds.
+        """
+        return statistics.median(entry["duration"] for entry in self.tests.values()) if self.tests else 0.0
+
+    def affected(self, test_id, patterns):
+        """
+        Tells whether the test exercises any of the endpoints.
+        A test without recorded data is considered affected (its endpoints are unknown).
+        :param test_id: Test node id.
+        :param patterns: Endpoint patterns: "POST /movies", "* /user/{id}", "/movies*" (any method).
+        :return: True if the test has to run.
+        """
+        entry = self.tests.get(test_id)
+        if entry is None:
+            return True
+        return any(endpoint_matches(endpoint, pattern) for endpoint in entry["endpoints"] for pattern in patterns)
+
+
+def endpoint_matches(endpoint, pattern):
+    """
+    Matches "METHOD /template" against a pattern; a pattern without a method matches any method.
+    :param endpoint: Endpoint name, e.g. "DELETE /movies/{id}".
+    :param pattern: fnmatch pattern, e.g. "DELETE /movies/*" or "/movies*".
+    """
+    if " " not in pattern.strip():
+        endpoint = endpoint.split(" ", 1)[-1]
+    return fnmatch.fnmatchcase(endpoint, " ".join(pattern.split()))
+
+
+def parse_endpoint_patterns(value):
+    """
+    Splits the --affected-endpoints value: "POST /movies, DELETE /movies/{id}" -> list of patterns.
+    """
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+
+def lpt_order(units, duration):
+    """
+    Orders scheduling units longest first (longest processing time).
+    Fed to a pull-based scheduler (pytest-xdist load/loadgroup), this is LPT list scheduling:
+    every free worker takes the longest remaining unit, so the shards finish close together.
+    :param units: Dictionary unit name -> list of test ids, in collection order.
+    :param duration: Callable(test id) -> expected seconds.
+    :return: List of unit names.
+    """
+    totals = {name: sum(duration(test_id) for test_id in test_ids) for name, test_ids in units.items()}
+    return sorted(units, key=lambda name: -totals[name])
+
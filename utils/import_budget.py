@@ -0,0 +1,98 @@
+"""
+Проверка бюджета времени запуска: сколько стоит импорт модулей фреймворка.
+
+    python -m utils.import_budget conftest --budget-ms 500
+    python -m utils.import_budget api.api_manager --forbid sqlalchemy,psycopg2,pydantic --top 20
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from constants import IMPORT_BUDGET_MS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class ImportTiming:
+    """
+    One line of `python -X importtime`: own and cumulative import time of a module, microseconds.
+    """
+
+    def __init__(self, name, self_us, cumulative_us):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+
+    @property
+    def package(self):
+        return self.name.split(".")[0]
+
+
+def measure(module, python=sys.executable):
+    """
+    Imports the module in a fresh interpreter with -X importtime.
+    :param module: Dotted module name (e.g. "conftest").
+    :param python: Interpreter to use.
+    :return: List of ImportTiming objects in import order.
+    """
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr[-2000:]}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def by_package(timings):
+    """
+    Sums own import time by top-level package.
+    :return: List of (package, milliseconds) sorted by time, descending.
+    """
+    totals = defaultdict(int)
+    for timing in timings:
+        totals[timing.package] += timing.self_us
+    return sorted(((package, us / 1000) for package, us in totals.items()), key=lambda item: item[1], reverse=True)
+
+
+def format_report(module, timings, top=15):
+    total_ms = sum(timing.self_us for timing in timings) / 1000
+    lines = [f"import {module}: {total_ms:.1f} ms, {len(timings)} modules", f"{'package':<30} {'ms':>8}"]
+    lines += [f"{package:<30} {ms:>8.1f}" for package, ms in by_package(timings)[:top]]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time budget check")
+    parser.add_argument("modules", nargs="*", default=["conftest"], help="Modules to import (default conftest)")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Allowed import time per module")
+    parser.add_argument("--forbid", default="", help="Comma separated packages that must not be imported")
+    parser.add_argument("--top", type=int, default=15, help="Number of the slowest packages to show")
+    args = parser.parse_args()
+
+    forbidden = {name for name in args.forbid.split(",") if name}
+    failed = False
+    for module in args.modules:
+        timings = measure(module)
+        print(format_report(module, timings, args.top))
+        total_ms = sum(timing.self_us for timing in timings) / 1000
+        if total_ms > args.budget_ms:
+            print(f"FAIL: {module} imports in {total_ms:.1f} ms, budget {args.budget_ms:.0f} ms")
+            failed = True
+        loaded = forbidden & {timing.package for timing in timings}
+        if loaded:
+            print(f"FAIL: {module} imports {', '.join(sorted(loaded))}")
+            failed = True
+        print()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
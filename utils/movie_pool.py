@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from types import MappingProxyType
+
+from constants import MOVIE_POOL_CONCURRENCY
+from data_generator import DataGenerator
+
+
+class MoviePool:
+    """
+    Session-level pool of movies created in bulk.
+    Shared movies are leased read-only to any number of tests,
+    exclusive movies are handed out to one test which may modify or delete them.
+    Everything the pool created is deleted at the end of the session.
+    """
+
+    def __init__(self, api_manager, admin_token, movie_data_factory=DataGenerator.generate_movie_data,
+                 concurrency=MOVIE_POOL_CONCURRENCY):
+        """
+        :param api_manager: ApiManager; the pool sends requests to the same services through its async copy.
+        :param admin_token: SUPER_ADMIN token used to create and delete movies.
+        :param movie_data_factory: Callable returning movie payload, accepts field overrides.
+        :param concurrency: Maximum number of simultaneous requests.
+        """
+        self.api_manager = api_manager
+        self.admin_token = admin_token
+        self.movie_data_factory = movie_data_factory
+        self.concurrency = concurrency
+        self._shared = []
+        self._exclusive = []
+        self._created_ids = []
+        self.logger = logging.getLogger(__name__)
+
+    def provision(self, combinations, count=1, exclusive=False):
+        """
+        Creates movies concurrently for every combination of fields.
+        If some of them fail, the created ones are still kept (and deleted at the end), then the first error is raised.
+        :param combinations: List of dictionaries with fixed fields, e.g. {"location": "MSK", "published": True}.
+        :param count: Number of movies per combination.
+        :param exclusive: Put the movies into the exclusive stock instead of the shared one.
+        """
+        payloads = [self.movie_data_factory(**combination) for combination in combinations for _ in range(count)]
+        results = asyncio.run(self._create_all(payloads))
+        # Созданные до ошибки фильмы тоже удаляются в конце сессии
+        movies = [result for result in results if not isinstance(result, BaseException)]
+        self._created_ids.extend(movie["id"] for movie in movies)
+        (self._exclusive if exclusive else self._shared).extend(movies)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def _create_all(self, payloads):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.api_manager.create_async() as api:
+            async def create(payload):
+                async with semaphore:
+                    response = await api.movies_api.create_movie(payload, self.admin_token)
+                    return response.json()
+
+            return await asyncio.gather(*(create(payload) for payload in payloads), return_exceptions=True)
+
+    @staticmethod
+    def _matches(movie, criteria):
+        return all(movie.get(field) == value for field, value in criteria.items() if value is not None)
+
+    def lease(self, genre_id=None, location=None, published=None):
+        """
+        Returns a read-only movie matching the criteria, creating one if needed.
+        The same instance can be leased to many tests, so it must not be modified.
+        :return: Read-only mapping with the movie fields.
+        """
+        criteria = {"genreId": genre_id, "location": location, "published": published}
+        for movie in self._shared:
+            if self._matches(movie, criteria):
+                return MappingProxyType(movie)
+        self.provision([{k: v for k, v in criteria.items() if v is not None}])
+        return MappingProxyType(self._shared[-1])
+
+    def acquire(self, genre_id=None, location=None, published=None):
+        """
+        Hands out a movie for exclusive use (it is never given to another test).
+        :return: Dictionary with the movie fields.
+        """
+        criteria = {"genreId": genre_id, "location": location, "published": published}
+        for index, movie in enumerate(self._exclusive):
+            if self._matches(movie, criteria):
+                return self._exclusive.pop(index)
+        self.provision([{k: v for k, v in criteria.items() if v is not None}], exclusive=True)
+        return self._exclusive.pop()
+
+    def delete_all(self):
+        """
+        Deletes all movies created by the pool concurrently (already deleted ones are skipped).
+        """
+        if not self._created_ids:
+            return
+        asyncio.run(self._delete_all())
+        self.logger.info(f"Movie pool: deleted {len(self._created_ids)} movie(s)")
+        self._created_ids.clear()
+        self._shared.clear()
+        self._exclusive.clear()
+
+    async def _delete_all(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.api_manager.create_async() as api:
+            async def delete(movie_id):
+                async with semaphore:
+                    await api.movies_api.delete_movie(movie_id, self.admin_token, expected_status=(200, 201, 404))
+
+            results = await asyncio.gather(*(delete(movie_id) for movie_id in self._created_ids),
+                                           return_exceptions=True)
+        for movie_id, result in zip(self._created_ids, results):
+            if isinstance(result, Exception):
+                self.logger.info(f"Movie pool: failed to delete movie {movie_id}: {result}")
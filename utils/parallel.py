@@ -0,0 +1,58 @@
+import itertools
+import os
+import uuid
+
+from utils.shared_store import SharedJsonStore
+
+_counter = itertools.count(1)
+
+
+def get_worker_id():
+    """
+    Returns the pytest-xdist worker id ("gw0", "gw1", ...) or "master" without xdist.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def is_xdist_worker():
+    """
+    Checks whether the current process is a pytest-xdist worker.
+    """
+    return "PYTEST_XDIST_WORKER" in os.environ
+
+
+def unique_name(prefix):
+    """
+    Builds a name that does not collide between workers and runs.
+    :param prefix: Human readable prefix (e.g. "Stan").
+    :return: String like "Stan_gw3_12_1a2b3c4d".
+    """
+    return f"{prefix}_{get_worker_id()}_{next(_counter)}_{uuid.uuid4().hex[:8]}"
+
+
+def get_shared_tmp_dir(tmp_path_factory):
+    """
+    Returns a temp directory shared by all workers of the run.
+    Under xdist every worker has its own basetemp, the shared one is its parent.
+    :param tmp_path_factory: pytest tmp_path_factory fixture.
+    :return: pathlib.Path object.
+    """
+    base_temp = tmp_path_factory.getbasetemp()
+    return base_temp.parent if is_xdist_worker() else base_temp
+
+
+def run_once(shared_dir, name, func):
+    """
+    Runs func once per test run, no matter how many workers call it.
+    The first caller executes func under a file lock and stores its result,
+    the other workers wait for the lock and get the stored result.
+    :param shared_dir: Directory shared by all workers (see get_shared_tmp_dir).
+    :param name: Unique name of the setup step.
+    :param func: Callable without arguments returning a JSON-serializable result.
+    :return: Result of func.
+    """
+    store = SharedJsonStore(shared_dir / "global_setup.json")
+    with store.transaction() as data:
+        if name not in data:
+            data[name] = func()
+        return data[name]
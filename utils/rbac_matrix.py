@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from http import HTTPStatus
+
+from constants import RBAC_MAX_WORKERS
+from requester.deadline import ContextThreadPoolExecutor
+
+# Любой статус считается ожидаемым для CustomRequester: сверка с матрицей делается в RbacMatrix
+ANY_STATUS = tuple(status.value for status in HTTPStatus)
+
+
+class MatrixEndpoint:
+    """
+    Row of the permission matrix: one request and the expected status for every role.
+    """
+
+    def __init__(self, name, send, expected, resource=None, exclusive=False):
+        """
+        :param name: Row name in the grid, e.g. "DELETE /movies/{id}".
+        :param send: Callable(api_manager, token, resource) sending the request with expected_status=ANY_STATUS.
+        :param expected: Dictionary role -> expected status code.
+        :param resource: Callable(matrix) preparing the resource the request works on (None - no resource).
+        :param exclusive: Prepare a separate resource for every role (for requests that change or delete it);
+                          otherwise one resource is shared by all cells of the row.
+        """
+        self.name = name
+        self.send = send
+        self.expected = expected
+        self.resource = resource
+        self.exclusive = exclusive
+
+
+class CellResult:
+    """
+    Outcome of one (endpoint, role) cell.
+    """
+
+    def __init__(self, endpoint, role, status=None, error=None, elapsed=0.0):
+        self.endpoint = endpoint
+        self.role = role
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def expected(self):
+        return self.endpoint.expected[self.role]
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == self.expected
+
+    def __str__(self):
+        if self.error is not None:
+            return f"error: {type(self.error).__name__}"
+        return f"{self.status}" if self.ok else f"{self.status} != {self.expected}"
+
+
+class RbacMatrix:
+    """
+    Runs the role x endpoint permission matrix concurrently.
+    Principals (role tokens) are built once by the caller; resources are prepared in parallel,
+    shared by the cells of a row unless the row is exclusive, then all cells are fired at once.
+    The whole matrix runs on the first request of any cell, the other cells take the stored result.
+    """
+
+    def __init__(self, api_manager, tokens, max_workers=RBAC_MAX_WORKERS):
+        """
+        :param api_manager: ApiManager object.
+        :param tokens: Dictionary role -> access token.
+        :param max_workers: Number of concurrent requests.
+        """
+        self.api_manager = api_manager
+        self.tokens = tokens
+        self.max_workers = max_workers
+        self.results = {}
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def result(self, endpoints, endpoint_name, role):
+        """
+        Returns the result of a cell, running the whole matrix on the first call.
+        :param endpoints: List of MatrixEndpoint objects.
+        :param endpoint_name: Name of the row.
+        :param role: Role of the column.
+        :return: CellResult object.
+        """
+        with self._lock:
+            if (endpoint_name, role) not in self.results:
+                self.run(endpoints)
+        return self.results[(endpoint_name, role)]
+
+    def run(self, endpoints):
+        """
+        Prepares resources and sends the requests of all cells concurrently.
+        :param endpoints: List of MatrixEndpoint objects.
+        :return: Dictionary (endpoint name, role) -> CellResult.
+        """
+        cells = [(endpoint, role) for endpoint in endpoints for role in endpoint.expected]
+        # Созданное ячейками (фильмы, пользователи) удаляется реестром после модуля, а не после первого теста
+        with self.api_manager.cleanup_registry.scope("module"), \
+                ContextThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Общий ресурс строки готовится один раз, монопольный - для каждой ячейки
+            prepared = {}
+            for endpoint, role in cells:
+                if endpoint.resource is None:
+                    continue
+                key = (endpoint.name, role) if endpoint.exclusive else endpoint.name
+                if key not in prepared:
+                    prepared[key] = (endpoint, executor.submit(endpoint.resource, self))
+            resources = {key: future.result() for key, (endpoint, future) in prepared.items()}
+
+            def fire(endpoint, role):
+                key = (endpoint.name, role) if endpoint.exclusive else endpoint.name
+                start = time.perf_counter()
+                try:
+                    response = endpoint.send(self.api_manager, self.tokens[role], resources.get(key))
+                    return CellResult(endpoint, role, response.status_code, elapsed=time.perf_counter() - start)
+                except Exception as error:
+                    return CellResult(endpoint, role, error=error, elapsed=time.perf_counter() - start)
+
+            futures = [executor.submit(fire, endpoint, role) for endpoint, role in cells]
+            for future in futures:
+                result = future.result()
+                self.results[(result.endpoint.name, result.role)] = result
+        return self.results
+
+    def format_grid(self):
+        """
+        Builds the results as a text grid: rows - endpoints, columns - roles.
+        """
+        if not self.results:
+            return ""
+        roles = list(dict.fromkeys(role for _, role in self.results))
+        endpoints = list(dict.fromkeys(name for name, _ in self.results))
+        width = max(len(name) for name in endpoints)
+        lines = [f"{'':<{width}}  " + "  ".join(f"{role:<14}" for role in roles)]
+        for name in endpoints:
+            cells = []
+            for role in roles:
+                result = self.results.get((name, role))
+                cells.append(f"{'-' if result is None else ('ok ' if result.ok else 'FAIL ') + str(result):<14}")
+            lines.append(f"{name:<{width}}  " + "  ".join(cells))
+        return "\n".join(lines)
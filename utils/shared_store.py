@@ -0,0 +1,63 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from filelock import FileLock
+
+
+class SharedJsonStore:
+    """
+    JSON file shared between processes (e.g. pytest-xdist workers).
+    Every access is guarded by a file lock, writes are atomic (temp file + rename).
+    """
+
+    def __init__(self, path, private=False):
+        """
+        :param path: Path to the JSON file; a "<path>.lock" file is created next to it.
+        :param private: Create the file readable and writable by the owner only (0600), e.g. for tokens.
+        """
+        self.path = Path(path)
+        self.private = private
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = FileLock(f"{self.path}.lock")
+
+    def read(self):
+        """
+        Reads the whole store.
+        :return: Dictionary with the stored data.
+        """
+        with self._lock:
+            return self._load()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Locks the store for a read-modify-write cycle.
+        The yielded dictionary is saved back on exit if no exception occurred.
+        """
+        with self._lock:
+            data = self._load()
+            yield data
+            self._dump(data)
+
+    def _load(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # Повреждённый файл не должен ронять прогон - начинаем с пустого хранилища
+            return {}
+
+    def _dump(self, data):
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        mode = 0o600 if self.private else 0o666
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        if self.private and hasattr(os, "fchmod"):
+            # Файл мог остаться от прерванного прогона с другими правами
+            os.fchmod(fd, mode)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
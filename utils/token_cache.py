@@ -0,0 +1,108 @@
+import base64
+import hashlib
+import json
+import time
+
+from constants import TOKEN_REFRESH_MARGIN, TOKEN_DEFAULT_TTL
+from utils.shared_store import SharedJsonStore
+
+
+class TokenCache:
+    """
+    Cache of access tokens keyed by credentials and role.
+    Expiry is taken from the JWT "exp" claim (decoded locally, without signature check);
+    a token is refreshed TOKEN_REFRESH_MARGIN seconds before it expires.
+    With store_path the cache is shared between processes through a file-locked JSON store,
+    so only one worker logs in while the others wait for its token.
+    """
+
+    def __init__(self, store_path=None, refresh_margin=TOKEN_REFRESH_MARGIN):
+        """
+        :param store_path: Path to the shared on-disk store (None - in-memory only); it holds plain tokens,
+            so the file is created with 0600 permissions.
+        :param refresh_margin: Seconds before expiry when a token is considered stale.
+        """
+        self.refresh_margin = refresh_margin
+        self.store = SharedJsonStore(store_path, private=True) if store_path else None
+        self._tokens = {}
+        self.logins = 0
+
+    @staticmethod
+    def make_key(email, password, role=None):
+        """
+        Builds a cache key; the password is hashed so it never reaches the disk.
+        :return: Hex digest string.
+        """
+        return hashlib.sha256(f"{email}:{password}:{role}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def decode_claims(token):
+        """
+        Returns the payload of a JWT decoded locally, without signature check.
+        :param token: JWT string.
+        :return: Dictionary of claims or None if the token is not a JWT.
+        """
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+        except (IndexError, ValueError, AttributeError):
+            return None
+        return claims if isinstance(claims, dict) else None
+
+    @classmethod
+    def decode_exp(cls, token):
+        """
+        Returns the "exp" claim of a JWT.
+        :param token: JWT string.
+        :return: Expiration timestamp or None if the token is not a JWT or has no "exp".
+        """
+        return (cls.decode_claims(token) or {}).get("exp")
+
+    def _is_fresh(self, entry):
+        return entry is not None and entry["expires_at"] - self.refresh_margin > time.time()
+
+    def _make_entry(self, token):
+        exp = self.decode_exp(token)
+        return {"token": token, "expires_at": exp if exp else time.time() + TOKEN_DEFAULT_TTL}
+
+    def get_token(self, email, password, login, role=None):
+        """
+        Returns a cached token or obtains a new one.
+        :param email: User email.
+        :param password: User password.
+        :param login: Callable without arguments returning a new access token.
+        :param role: Role of the user (part of the key).
+        :return: Access token.
+        """
+        key = self.make_key(email, password, role)
+        entry = self._tokens.get(key)
+        if self._is_fresh(entry):
+            return entry["token"]
+
+        if self.store is None:
+            entry = self._make_entry(login())
+            self.logins += 1
+        else:
+            with self.store.transaction() as data:
+                entry = data.get(key)
+                if not self._is_fresh(entry):
+                    entry = self._make_entry(login())
+                    self.logins += 1
+                    data[key] = entry
+                    # Заодно выбрасываем протухшие токены
+                    for stale_key in [k for k, v in data.items() if not self._is_fresh(v)]:
+                        del data[stale_key]
+
+        self._tokens[key] = entry
+        return entry["token"]
+
+    def invalidate(self, email, password, role=None):
+        """
+        Removes a token from the cache (e.g. after a 401 response).
+        """
+        key = self.make_key(email, password, role)
+        self._tokens.pop(key, None)
+        if self.store is not None:
+            with self.store.transaction() as data:
+                data.pop(key, None)
@@ -0,0 +1,301 @@
+"""
+Стресс-тест конкурентных переводов между счетами AccountTransactionTemplate:
+
+    python -m utils.transfer_stress --strategy all --transfers 5000 --workers 32 --accounts 10
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.parallel import unique_name
+
+# Коды PostgreSQL, после которых транзакцию нужно повторить
+DEADLOCK_CODES = {"40P01"}
+RETRYABLE_CODES = {"40P01", "40001", "55P03"}
+
+
+class TransferRejected(Exception):
+    """
+    Raised inside a transfer when the source account has not enough money.
+    """
+
+
+class _Conflict(Exception):
+    """
+    Raised by the optimistic strategy when a balance was changed by a concurrent transfer.
+    """
+
+
+def _table():
+    from models.db_models import AccountTransactionTemplate
+
+    return AccountTransactionTemplate.__table__
+
+
+def transfer_pessimistic(connection, from_account, to_account, amount):
+    """
+    SELECT ... FOR UPDATE of both rows (in a fixed order, so two transfers never wait for each other in a cycle),
+    then the balances are changed in Python.
+    """
+    from sqlalchemy import select
+
+    table = _table()
+    rows = connection.execute(
+        select(table.c.user, table.c.balance)
+        .where(table.c.user.in_([from_account, to_account]))
+        .order_by(table.c.user)
+        .with_for_update()
+    ).all()
+    balances = dict(rows)
+    if balances[from_account] < amount:
+        raise TransferRejected()
+    for user, balance in ((from_account, balances[from_account] - amount),
+                          (to_account, balances[to_account] + amount)):
+        connection.execute(table.update().where(table.c.user == user).values(balance=balance))
+
+
+def transfer_optimistic(connection, from_account, to_account, amount):
+    """
+    Reads without locks and writes with a version check: the row is updated only if its balance
+    is still the one that was read (compare-and-set), otherwise the transfer is retried.
+    """
+    from sqlalchemy import select
+
+    table = _table()
+    balances = dict(connection.execute(
+        select(table.c.user, table.c.balance).where(table.c.user.in_([from_account, to_account]))
+    ).all())
+    if balances[from_account] < amount:
+        raise TransferRejected()
+    for user, delta in sorted(((from_account, -amount), (to_account, amount))):
+        result = connection.execute(
+            table.update()
+            .where(table.c.user == user, table.c.balance == balances[user])
+            .values(balance=balances[user] + delta)
+        )
+        if result.rowcount != 1:
+            raise _Conflict()
+
+
+def transfer_atomic(connection, from_account, to_account, amount):
+    """
+    Every balance is changed by one UPDATE computed in the database, the debit is guarded
+    by `balance >= amount`; rows are updated in a fixed order.
+    """
+    table = _table()
+    for user in sorted((from_account, to_account)):
+        if user == from_account:
+            result = connection.execute(
+                table.update()
+                .where(table.c.user == user, table.c.balance >= amount)
+                .values(balance=table.c.balance - amount)
+            )
+            if result.rowcount != 1:
+                raise TransferRejected()
+        else:
+            connection.execute(table.update().where(table.c.user == user).values(balance=table.c.balance + amount))
+
+
+STRATEGIES = {
+    "pessimistic": transfer_pessimistic,
+    "optimistic": transfer_optimistic,
+    "atomic": transfer_atomic,
+}
+
+
+class TransferStressResult:
+    """
+    Counters of one stress run.
+    """
+
+    def __init__(self, strategy, transfers):
+        self.strategy = strategy
+        self.transfers = transfers
+        self.committed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.retries = 0
+        self.deadlocks = 0
+        self.elapsed = 0.0
+        self.initial_total = 0
+        self.final_total = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def throughput(self):
+        return (self.committed + self.rejected) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def conserved(self):
+        return self.initial_total == self.final_total
+
+    def to_dict(self):
+        return {
+            "strategy": self.strategy,
+            "transfers": self.transfers,
+            "committed": self.committed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "retries": self.retries,
+            "deadlocks": self.deadlocks,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 1),
+            "initial_total": self.initial_total,
+            "final_total": self.final_total,
+            "conserved": self.conserved,
+        }
+
+    def __str__(self):
+        return (f"{self.strategy:<12} {self.throughput:>9.1f} tx/s  committed={self.committed} "
+                f"rejected={self.rejected} failed={self.failed} retries={self.retries} "
+                f"deadlocks={self.deadlocks} conserved={self.conserved}")
+
+
+class TransferStress:
+    """
+    Runs many concurrent transfers between a set of AccountTransactionTemplate rows.
+    The accounts get worker-unique names, so runs can go in parallel with the tests.
+    """
+
+    def __init__(self, engine, accounts=10, initial_balance=1000, workers=16, max_retries=50, seed=None):
+        """
+        :param engine: SQLAlchemy engine (its pool should allow `workers` connections).
+        :param accounts: Number of accounts; fewer accounts - more contention.
+        :param initial_balance: Starting balance of every account.
+        :param workers: Number of threads doing transfers.
+        :param max_retries: Attempts of one transfer after deadlocks/conflicts before it is counted as failed.
+        :param seed: Seed of the transfer generator.
+        """
+        self.engine = engine
+        self.accounts = [unique_name("stress") for _ in range(accounts)]
+        self.initial_balance = initial_balance
+        self.workers = workers
+        self.max_retries = max_retries
+        self.random = random.Random(seed)
+        self.logger = logging.getLogger(__name__)
+
+    def setup(self):
+        """
+        Creates the accounts with the initial balance.
+        """
+        with self.engine.begin() as connection:
+            connection.execute(_table().insert(), [{"user": user, "balance": self.initial_balance}
+                                                   for user in self.accounts])
+
+    def teardown(self):
+        """
+        Deletes the accounts.
+        """
+        table = _table()
+        with self.engine.begin() as connection:
+            connection.execute(table.delete().where(table.c.user.in_(self.accounts)))
+
+    def total_balance(self):
+        from sqlalchemy import func, select
+
+        table = _table()
+        with self.engine.connect() as connection:
+            return connection.execute(
+                select(func.coalesce(func.sum(table.c.balance), 0)).where(table.c.user.in_(self.accounts))
+            ).scalar_one()
+
+    def run(self, strategy, transfers, max_amount=None):
+        """
+        Runs `transfers` random transfers with the strategy in the thread pool.
+        :param strategy: Key of STRATEGIES.
+        :param transfers: Number of transfers.
+        :param max_amount: Maximum amount of one transfer (default - a quarter of the initial balance).
+        :return: TransferStressResult object.
+        """
+        transfer = STRATEGIES[strategy]
+        max_amount = max_amount or max(self.initial_balance // 4, 1)
+        plan = []
+        for _ in range(transfers):
+            from_account, to_account = self.random.sample(self.accounts, 2)
+            plan.append((from_account, to_account, self.random.randint(1, max_amount)))
+
+        result = TransferStressResult(strategy, transfers)
+        result.initial_total = self.total_balance()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for future in [executor.submit(self._transfer, transfer, result, *item) for item in plan]:
+                future.result()
+        result.elapsed = time.perf_counter() - start
+        result.final_total = self.total_balance()
+        return result
+
+    def _transfer(self, transfer, result, from_account, to_account, amount):
+        from sqlalchemy.exc import DBAPIError
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.engine.begin() as connection:
+                    transfer(connection, from_account, to_account, amount)
+                result.add(committed=1)
+                return
+            except TransferRejected:
+                result.add(rejected=1)
+                return
+            except _Conflict:
+                pass
+            except DBAPIError as error:
+                code = getattr(error.orig, "pgcode", None)
+                if code in DEADLOCK_CODES:
+                    result.add(deadlocks=1)
+                elif code not in RETRYABLE_CODES and "locked" not in str(error.orig):
+                    # SQLite сообщает о конфликте блокировок как "database is locked"
+                    self.logger.info(f"Transfer failed: {error.orig}")
+                    result.add(failed=1)
+                    return
+            if attempt < self.max_retries:
+                result.add(retries=1)
+                time.sleep(self.random.uniform(0, 0.001 * (attempt + 1)))
+        result.add(failed=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent transfers stress test")
+    parser.add_argument("--strategy", choices=(*STRATEGIES, "all"), default="all")
+    parser.add_argument("--transfers", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--balance", type=int, default=1000, help="Initial balance of every account")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--report", help="Path to the JSON report")
+    args = parser.parse_args()
+
+    from utils.db import create_db_engine, dispose_db_engine
+
+    engine = create_db_engine(pool_size=args.workers, max_overflow=0)
+    strategies = list(STRATEGIES) if args.strategy == "all" else [args.strategy]
+    results = []
+    try:
+        for strategy in strategies:
+            stress = TransferStress(engine, accounts=args.accounts, initial_balance=args.balance,
+                                    workers=args.workers, seed=args.seed)
+            stress.setup()
+            try:
+                result = stress.run(strategy, args.transfers)
+            finally:
+                stress.teardown()
+            print(result)
+            results.append(result.to_dict())
+    finally:
+        dispose_db_engine(engine)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict, deque
+
+from constants import USER_POOL_BATCH_SIZE, USER_POOL_CONCURRENCY
+from data_generator import DataGenerator
+from entities.user import User
+from enums.roles import Roles
+from utils.token_cache import TokenCache
+
+
+class UserPool:
+    """
+    Session-level pool of pre-registered users with tokens, grouped by role.
+    Users are registered concurrently in batches, checked out by tests and returned after them.
+    Tokens are resolved through a TokenCache on checkout, so a long session never hands out an expired one.
+    checkout/checkin may be called from several threads. All registered users are deleted at the end of the session.
+    """
+
+    def __init__(self, api_manager, admin_token, user_data_factory=DataGenerator.generate_user_data,
+                 batch_size=USER_POOL_BATCH_SIZE, concurrency=USER_POOL_CONCURRENCY, token_cache=None):
+        """
+        :param api_manager: ApiManager stored in the created User entities; its async copy sends the requests.
+        :param admin_token: SUPER_ADMIN token used to change roles and delete users.
+        :param user_data_factory: Callable returning register payload.
+        :param batch_size: Number of users registered when the pool of a role is empty.
+        :param concurrency: Maximum number of simultaneous requests while provisioning.
+        :param token_cache: TokenCache refreshing the tokens of pooled users (default - an in-memory one).
+        """
+        self.api_manager = api_manager
+        self.admin_token = admin_token
+        self.user_data_factory = user_data_factory
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.token_cache = token_cache or TokenCache()
+        self._available = defaultdict(deque)
+        self._created = []
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def provision(self, role=Roles.USER.value, count=None):
+        """
+        Registers and logs in a batch of users concurrently and adds them to the pool.
+        If some of them fail, the rest are still kept (and deleted at the end), then the first error is raised.
+        :param role: Role of the users (USER or ADMIN).
+        :param count: Number of users (default - batch_size).
+        """
+        if role == Roles.SUPER_ADMIN.value:
+            raise ValueError("SUPER_ADMIN users can not be registered, use the token cache instead")
+        registered, results = asyncio.run(self._provision(role, count or self.batch_size))
+        with self._lock:
+            # Зарегистрированные пользователи удаляются в конце сессии, даже если смена роли или вход не удались
+            self._created.extend(registered)
+            self._available[role].extend(result for result in results if isinstance(result, User))
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def _provision(self, role, count):
+        """
+        :return: Tuple (all registered users, list of User or exception per requested user).
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        registered = []
+        async with self.api_manager.create_async() as api:
+            async def register(user_data):
+                async with semaphore:
+                    response = await api.auth_api.register_user(user_data)
+                    user = User(user_data["email"], user_data["password"], [role], self.api_manager,
+                                user_id=response.json()["id"])
+                    registered.append(user)
+                    if role != Roles.USER.value:
+                        await api.auth_api.change_user_role(user.id, [role], self.admin_token)
+                    login_payload = {"email": user_data["email"], "password": user_data["password"]}
+                    login_response = await api.auth_api.login_user(login_payload, typed=True)
+                    # Токен сразу попадает в кэш: при выдаче из пула он берётся оттуда и обновляется при истечении
+                    user.token = self.token_cache.get_token(user.email, user.password,
+                                                            login=lambda: login_response.data.accessToken, role=role)
+                    return user
+
+            results = await asyncio.gather(*(register(self.user_data_factory()) for _ in range(count)),
+                                           return_exceptions=True)
+        return registered, results
+
+    def checkout(self, role=Roles.USER.value):
+        """
+        Takes a user from the pool, growing the pool if it is empty.
+        The token of the user is refreshed if it expires within TOKEN_REFRESH_MARGIN.
+        :param role: Role of the user.
+        :return: User entity with id and token.
+        """
+        while True:
+            with self._lock:
+                if self._available[role]:
+                    user = self._available[role].popleft()
+                    break
+            self.provision(role)
+        user.token = self.token_cache.get_token(user.email, user.password, login=lambda: self._login(user),
+                                                role=user.role)
+        return user
+
+    def checkin(self, user):
+        """
+        Returns a user to the pool.
+        :param user: User entity taken by checkout.
+        """
+        with self._lock:
+            self._available[user.role].append(user)
+
+    def _login(self, user):
+        response = self.api_manager.auth_api.login_user({"email": user.email, "password": user.password}, typed=True)
+        return response.data.accessToken
+
+    def delete_all(self):
+        """
+        Deletes all users registered by the pool concurrently.
+        """
+        with self._lock:
+            if not self._created:
+                return
+            created, self._created = self._created, []
+            self._available.clear()
+        asyncio.run(self._delete_all(created))
+        self.logger.info(f"User pool: deleted {len(created)} user(s)")
+
+    async def _delete_all(self, users):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.api_manager.create_async() as api:
+            async def delete(user):
+                async with semaphore:
+                    await api.auth_api.delete_user(user.id, self.admin_token)
+
+            results = await asyncio.gather(*(delete(user) for user in users), return_exceptions=True)
+        for user, result in zip(users, results):
+            if isinstance(result, Exception):
+                self.logger.info(f"User pool: failed to delete user {user.id}: {result}")